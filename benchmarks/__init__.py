@@ -0,0 +1,7 @@
+"""
+Microbenchmarks of the control hot path, runnable without a running Home Assistant.
+
+Run ``python -m benchmarks`` from the repository root to compare against the stored baseline, and
+``python -m benchmarks --save`` to store the current results as the new baseline. Timings depend on the
+machine, so compare against a baseline that was recorded on the same machine.
+"""
@@ -0,0 +1,43 @@
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+from . import cases  # noqa: F401, registers the benchmarks
+from .runner import BASELINE_PATH, BenchmarkResult, async_run, load_baseline, save_baseline
+
+
+def _format(result: BenchmarkResult) -> str:
+    baseline = "-" if result.baseline is None else f"{result.baseline:.3f} µs"
+    ratio = "-" if result.ratio is None else f"{result.ratio:5.2f}x"
+    status = "REGRESSED" if result.regressed else "ok"
+
+    return f"{result.name:45} {result.microseconds:10.3f} µs {baseline:>13} {ratio:>7} (<= {result.threshold:.2f}x) {status}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Measure the control hot path against a stored baseline.")
+    parser.add_argument("names", nargs="*", help="Only run the benchmarks whose name contains one of these.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="The baseline to compare against.")
+    parser.add_argument("--repeat", type=int, default=5, help="The amount of measurements of which the fastest is kept.")
+    parser.add_argument("--save", action="store_true", help="Store the results as the new baseline.")
+    arguments = parser.parse_args()
+
+    # The controllers log every command they send
+    logging.disable(logging.INFO)
+
+    results = asyncio.run(async_run(arguments.names, load_baseline(arguments.baseline), arguments.repeat))
+
+    for result in results:
+        print(_format(result))
+
+    if arguments.save:
+        save_baseline(results, arguments.baseline)
+        return 0
+
+    return 1 if any(result.regressed for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
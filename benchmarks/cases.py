@@ -0,0 +1,223 @@
+"""The benchmarks of the control hot path, driven by virtual time so every run measures the same work."""
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from tempfile import TemporaryDirectory
+from types import MappingProxyType
+from typing import AsyncIterator
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.sat.area import Areas
+from custom_components.sat.boiler import BoilerState
+from custom_components.sat.climate import SatClimate
+from custom_components.sat.clock import VirtualClock, use_clock
+from custom_components.sat.const import *
+from custom_components.sat.errors import Error
+from custom_components.sat.flame import Flame
+from custom_components.sat.simulator.engine import BoilerModel, SatSimulationCoordinator, SeasonSimulator, SimulatedBoiler, daily_weather
+from custom_components.sat.util import create_pid_controller
+
+from .runner import benchmark
+
+# The longest window of the flame statistics, the benchmarks run with completely filled windows
+WARMUP_SECONDS = 4 * 60 * 60
+
+# The interval in seconds between two updates of the boiler state
+UPDATE_INTERVAL = 5
+
+CONFIG_DATA = {
+    CONF_NAME: "Benchmark",
+    CONF_MODE: MODE_SIMULATOR,
+    CONF_MINIMUM_SETPOINT: 40,
+    CONF_OVERSHOOT_PROTECTION: True,
+    CONF_HEATING_SYSTEM: HEATING_SYSTEM_RADIATORS,
+}
+
+
+def _room_entity_ids(count: int) -> list[str]:
+    return [f"climate.room_{index}" for index in range(count)]
+
+
+def _set_room_states(hass: HomeAssistant, entity_ids: list[str]) -> None:
+    for index, entity_id in enumerate(entity_ids):
+        hass.states.async_set(entity_id, "heat", {"temperature": 20.0, "current_temperature": 18.5 + (index % 20) / 10})
+
+
+@asynccontextmanager
+async def _async_home_assistant() -> AsyncIterator[HomeAssistant]:
+    """Create a Home Assistant instance that is never started, it only provides the state machine."""
+    with TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+
+        try:
+            yield hass
+        finally:
+            await hass.async_stop(force=True)
+
+
+async def _async_warm_simulator() -> SeasonSimulator:
+    """Run the season simulator long enough to fill the flame and boiler temperature windows, with the pulse width modulation in use."""
+    simulator = SeasonSimulator(config_data=CONFIG_DATA, config_options={CONF_FORCE_PULSE_WIDTH_MODULATION: True}, weather=daily_weather(mean=2.0, amplitude=3.0))
+    await simulator.async_run(WARMUP_SECONDS)
+
+    return simulator
+
+
+def _cycle_flame(clock: VirtualClock, flame: Flame, boiler: BoilerState, period: int = 900, on_time: int = 300) -> None:
+    """Advance the clock by a single update, switching the flame on for a part of every period."""
+    flame.update(replace(boiler, flame_active=clock.monotonic() % period < on_time))
+    clock.advance(UPDATE_INTERVAL)
+
+
+@benchmark("pid.update")
+async def pid_update():
+    clock = VirtualClock()
+
+    with use_clock(clock):
+        pid = create_pid_controller(OPTIONS_DEFAULTS)
+        errors = [Error("climate.room", value) for value in (-0.3, -0.1, 0.1, 0.3)]
+
+        def update():
+            clock.advance(60)
+            pid.update(errors[int(clock.monotonic() / 60) % len(errors)], 45.0, 50.0)
+
+        yield update
+
+
+@benchmark("pid.output", threshold=2.0)
+async def pid_output():
+    pid = create_pid_controller(OPTIONS_DEFAULTS)
+    pid.update(Error("climate.room", 0.4), 45.0, 50.0)
+
+    yield lambda: pid.output
+
+
+@benchmark("pwm.update")
+async def pwm_update():
+    simulator = await _async_warm_simulator()
+
+    with use_clock(simulator.clock):
+        coordinator = simulator.coordinator
+
+        async def update():
+            simulator.clock.advance(UPDATE_INTERVAL)
+            await simulator.pwm.update(coordinator.boiler, coordinator.flame, simulator.requested_setpoint)
+
+        yield update
+
+
+@benchmark("pwm.calculate_duty_cycle", threshold=2.0)
+async def pwm_calculate_duty_cycle():
+    simulator = await _async_warm_simulator()
+
+    with use_clock(simulator.clock):
+        boiler = simulator.coordinator.boiler
+        yield lambda: simulator.pwm._calculate_duty_cycle(45.0, boiler)
+
+
+@benchmark("flame.update")
+async def flame_update():
+    clock = VirtualClock()
+
+    with use_clock(clock):
+        flame = Flame()
+        boiler = BoilerState(
+            is_active=True,
+            is_inactive=False,
+            status=BoilerStatus.HEATING_UP,
+            flame_active=False,
+            hot_water_active=False,
+            setpoint=50.0,
+            flow_temperature=45.0,
+            return_temperature=35.0,
+            relative_modulation_level=40.0,
+        )
+
+        while clock.monotonic() < WARMUP_SECONDS:
+            _cycle_flame(clock, flame, boiler)
+
+        yield lambda: _cycle_flame(clock, flame, boiler)
+
+
+@benchmark("coordinator.async_control_heating_loop")
+async def coordinator_control_heating_loop():
+    simulator = await _async_warm_simulator()
+
+    with use_clock(simulator.clock):
+        coordinator = simulator.coordinator
+
+        async def control_heating_loop():
+            simulator.clock.advance(UPDATE_INTERVAL)
+            await coordinator.async_control_heating_loop(pwm_state=simulator.pwm.state)
+
+        yield control_heating_loop
+
+
+@benchmark("coordinator.device_status", threshold=2.0)
+async def coordinator_device_status():
+    simulator = await _async_warm_simulator()
+
+    with use_clock(simulator.clock):
+        coordinator = simulator.coordinator
+
+        def device_status():
+            coordinator.async_invalidate_snapshots()
+            return coordinator.device_status
+
+        yield device_status
+
+
+@benchmark("climate.extra_state_attributes")
+async def climate_extra_state_attributes():
+    async with _async_home_assistant() as hass:
+        rooms = _room_entity_ids(8)
+        config_data = {**CONFIG_DATA, CONF_ROOMS: rooms, CONF_INSIDE_SENSOR_ENTITY_ID: "sensor.inside", CONF_OUTSIDE_SENSOR_ENTITY_ID: ["sensor.outside"]}
+        config_entry = ConfigEntry(
+            version=1,
+            minor_version=0,
+            domain=DOMAIN,
+            title="Benchmark",
+            data=config_data,
+            options={},
+            source="user",
+            unique_id=None,
+            discovery_keys=MappingProxyType({}),
+            subentries_data=None,
+        )
+
+        coordinator = SatSimulationCoordinator(SimulatedBoiler(BoilerModel()), config_data)
+        climate = SatClimate(coordinator, config_entry, "°C")
+        climate.hass = hass
+
+        _set_room_states(hass, rooms)
+        hass.states.async_set("sensor.inside", "19.5")
+        hass.states.async_set("sensor.outside", "4.0")
+        await climate.areas.async_added_to_hass(hass)
+
+        yield lambda: climate.extra_state_attributes
+
+
+def _areas_errors(count: int):
+    async def factory():
+        async with _async_home_assistant() as hass:
+            rooms = _room_entity_ids(count)
+            areas = Areas(MappingProxyType({**CONFIG_DATA, CONF_ROOMS: rooms}), MappingProxyType(OPTIONS_DEFAULTS))
+
+            _set_room_states(hass, rooms)
+            await areas.async_added_to_hass(hass)
+
+            # A zone changes, after which the errors of all zones are read
+            def errors():
+                areas.async_update(rooms[0])
+                return areas.errors
+
+            yield errors
+
+    return factory
+
+
+for _count in (8, 64):
+    benchmark(f"areas.errors[{_count}]")(_areas_errors(_count))
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import inspect
+import json
+import platform
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Optional
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+# A benchmark regresses when it is this many times slower than its baseline, unless it defines its own threshold
+DEFAULT_THRESHOLD = 1.5
+
+# The minimum time in seconds of a single measurement, the amount of calls is doubled until it is reached
+MINIMUM_MEASUREMENT_TIME = 0.05
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class Benchmark:
+    """A path of the integration that is measured, the factory prepares the state and yields the call to measure."""
+    name: str
+    factory: Callable[[], AsyncContextManager[Callable[[], Any]]]
+    threshold: float = DEFAULT_THRESHOLD
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkResult:
+    name: str
+    microseconds: float
+    threshold: float
+    baseline: Optional[float] = None
+
+    @property
+    def ratio(self) -> Optional[float]:
+        """Return the time relative to the baseline, if there is one."""
+        if not self.baseline:
+            return None
+
+        return self.microseconds / self.baseline
+
+    @property
+    def regressed(self) -> bool:
+        return self.ratio is not None and self.ratio > self.threshold
+
+
+def benchmark(name: str, threshold: float = DEFAULT_THRESHOLD) -> Callable:
+    """Register an async generator that prepares a benchmark and yields the call to measure."""
+
+    def decorator(factory: Callable[[], AsyncIterator[Callable[[], Any]]]) -> Callable[[], AsyncIterator[Callable[[], Any]]]:
+        BENCHMARKS[name] = Benchmark(name, asynccontextmanager(factory), threshold)
+        return factory
+
+    return decorator
+
+
+async def async_measure(subject: Callable[[], Any], repeat: int = 5, minimum_time: float = MINIMUM_MEASUREMENT_TIME) -> float:
+    """Return the fastest time of a single call in microseconds, awaiting the call when it returns an awaitable."""
+    is_async = inspect.isawaitable(result := subject())
+    if is_async:
+        await result
+
+    async def run(number: int) -> float:
+        start = perf_counter()
+
+        if is_async:
+            for _ in range(number):
+                await subject()
+        else:
+            for _ in range(number):
+                subject()
+
+        return perf_counter() - start
+
+    number = 1
+    while await run(number) < minimum_time:
+        number *= 2
+
+    timings = [await run(number) / number for _ in range(repeat)]
+
+    return min(timings) * 1e6
+
+
+async def async_run(names: Optional[list[str]] = None, baseline: Optional[dict[str, float]] = None, repeat: int = 5) -> list[BenchmarkResult]:
+    """Run the selected benchmarks, or all of them, and compare them against the baseline."""
+    baseline = baseline or {}
+    results = []
+
+    for name, case in BENCHMARKS.items():
+        if names and not any(selected in name for selected in names):
+            continue
+
+        async with case.factory() as subject:
+            microseconds = await async_measure(subject, repeat)
+
+        results.append(BenchmarkResult(name, microseconds, case.threshold, baseline.get(name)))
+
+    return results
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict[str, float]:
+    if not path.exists():
+        return {}
+
+    with path.open() as file:
+        return {name: values["microseconds"] for name, values in json.load(file).get("benchmarks", {}).items()}
+
+
+def save_baseline(results: list[BenchmarkResult], path: Path = BASELINE_PATH) -> None:
+    """Store the results as the new baseline, keeping the baselines of the benchmarks that did not run."""
+    stored = {}
+    if path.exists():
+        with path.open() as file:
+            stored = json.load(file).get("benchmarks", {})
+
+    stored.update({result.name: {"microseconds": round(result.microseconds, 3)} for result in results})
+
+    with path.open("w") as file:
+        json.dump({"python": platform.python_version(), "benchmarks": dict(sorted(stored.items()))}, file, indent=2)
+        file.write("\n")
@@ -23,6 +23,7 @@ from .const import (
 )
 from .coordinator import SatDataUpdateCoordinatorFactory
 from .services import async_register_services
+from .snapshot import RuntimeStore
 from .util import get_climate_entities
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
@@ -100,6 +101,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unloaded
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """
+    Handle the deletion of an entry.
+
+    This function is called by Home Assistant after the entry has been unloaded and deleted.
+    """
+    # The runtime snapshot is of no use without the entry
+    await RuntimeStore(hass, entry.entry_id).async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """
     Reload config entry.
@@ -1,9 +1,11 @@
+import math
+from array import array
 from types import MappingProxyType
-from typing import Any
+from typing import Any, Optional
 
 from homeassistant.components.climate import HVACMode
 from homeassistant.const import STATE_UNKNOWN, STATE_UNAVAILABLE
-from homeassistant.core import HomeAssistant, State
+from homeassistant.core import HomeAssistant, State, callback
 
 from .const import CONF_ROOMS
 from .errors import Errors, Error
@@ -18,11 +20,51 @@ from .util import (
 SENSOR_TEMPERATURE_ID = "sensor_temperature_id"
 
 
+def _to_optional(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+class ZoneTable:
+    """Keeps the temperatures, errors and weights of all zones in contiguous arrays, unknown values are NaN."""
+
+    def __init__(self, size: int) -> None:
+        self.targets: array = array("d", [math.nan]) * size
+        self.currents: array = array("d", [math.nan]) * size
+        self.errors: array = array("d", [math.nan]) * size
+        self.weights: array = array("d", [math.nan]) * size
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def set(self, index: int, target_temperature: Optional[float], current_temperature: Optional[float]) -> None:
+        """Store the temperatures of a zone, and derive its error and weight."""
+        target = math.nan if target_temperature is None else target_temperature
+        current = math.nan if current_temperature is None else current_temperature
+
+        self.targets[index] = target
+        self.currents[index] = current
+
+        if math.isnan(target) or math.isnan(current):
+            self.errors[index] = self.weights[index] = math.nan
+            return
+
+        delta = target - current
+        self.errors[index] = round(delta, 2)
+
+        # Room heating demand weight (0-2 range), based on the difference between target and current temperature
+        self.weights[index] = round(max(0.0, min(max(delta - 0.2, 0.0), 2.0)), 3)
+
+
 class Area:
-    def __init__(self, config_data: MappingProxyType[str, Any], config_options: MappingProxyType[str, Any], entity_id: str):
+    def __init__(self, config_data: MappingProxyType[str, Any], config_options: MappingProxyType[str, Any], entity_id: str, table: Optional[ZoneTable] = None, index: int = 0):
         self._entity_id: str = entity_id
         self._hass: HomeAssistant | None = None
 
+        # The zone of this area, its values are refreshed from the state changes
+        self._table: ZoneTable = table if table is not None else ZoneTable(1)
+        self._index: int = index
+        self._sensor_temperature_id: Optional[str] = None
+
         # Create controllers with the given configuration options
         self.pid: PID = create_pid_controller(config_options)
         self.heating_curve: HeatingCurve = create_heating_curve_controller(config_data, config_options)
@@ -31,6 +73,11 @@ class Area:
     def id(self) -> str:
         return self._entity_id
 
+    @property
+    def sensor_temperature_id(self) -> Optional[str]:
+        """Return the sensor that overrides the current temperature, if any."""
+        return self._sensor_temperature_id
+
     @property
     def state(self) -> State | None:
         """Retrieve the current state of the climate entity."""
@@ -41,120 +88,176 @@ class Area:
 
     @property
     def target_temperature(self) -> float | None:
-        """Retrieve the target temperature from the climate entity."""
-        if (self._hass is None) or (state := self.state) is None:
-            return None
-
-        return float_value(state.attributes.get("temperature"))
+        """Return the target temperature of the climate entity."""
+        return _to_optional(self._table.targets[self._index])
 
     @property
     def current_temperature(self) -> float | None:
-        """Retrieve the current temperature, overridden by a sensor if set."""
-        if (self._hass is None) or (state := self.state) is None:
-            return None
-
-        # Check if there is an overridden sensor temperature
-        if sensor_temperature_id := state.attributes.get(SENSOR_TEMPERATURE_ID):
-            sensor_state = self._hass.states.get(sensor_temperature_id)
-            if sensor_state and sensor_state.state not in [STATE_UNKNOWN, STATE_UNAVAILABLE, HVACMode.OFF]:
-                return float_value(sensor_state.state)
-
-        return float_value(state.attributes.get("current_temperature") or self.target_temperature)
+        """Return the current temperature, overridden by a sensor if set."""
+        return _to_optional(self._table.currents[self._index])
 
     @property
     def error(self) -> Error | None:
-        """Calculate the temperature error."""
-        target_temperature = self.target_temperature
-        current_temperature = self.current_temperature
-
-        if target_temperature is None or current_temperature is None:
+        """Return the temperature error."""
+        if (value := _to_optional(self._table.errors[self._index])) is None:
             return None
 
-        return Error(self._entity_id, round(target_temperature - current_temperature, 2))
+        return Error(self._entity_id, value)
 
     @property
     def weight(self) -> float | None:
-        """
-        Room heating demand weight (0-2 range).
-        Based on the difference between target and current temperature.
-        """
-        target_temperature = self.target_temperature
-        current_temperature = self.current_temperature
-
-        if target_temperature is None or current_temperature is None:
-            return None
+        """Return the room heating demand weight (0-2 range)."""
+        return _to_optional(self._table.weights[self._index])
+
+    @callback
+    def async_refresh(self) -> None:
+        """Read the climate entity and its sensor from the state machine into the zone table."""
+        if (state := self.state) is None:
+            self._sensor_temperature_id = None
+            self._table.set(self._index, None, None)
+            return
 
-        delta = target_temperature - current_temperature
-        effective_delta = max(delta - 0.2, 0.0)
-        raw_weight = effective_delta * 1.0
+        target_temperature = float_value(state.attributes.get("temperature"))
+        current_temperature = float_value(state.attributes.get("current_temperature") or target_temperature)
 
-        return round(max(0.0, min(raw_weight, 2.0)), 3)
+        # Check if there is an overridden sensor temperature
+        self._sensor_temperature_id = state.attributes.get(SENSOR_TEMPERATURE_ID)
+        if self._sensor_temperature_id:
+            sensor_state = self._hass.states.get(self._sensor_temperature_id)
+            if sensor_state and sensor_state.state not in [STATE_UNKNOWN, STATE_UNAVAILABLE, HVACMode.OFF]:
+                current_temperature = float_value(sensor_state.state)
+
+        self._table.set(self._index, target_temperature, current_temperature)
 
     async def async_added_to_hass(self, hass: HomeAssistant):
         self._hass = hass
+        self.async_refresh()
 
     async def async_control_heating_loop(self, _time=None) -> None:
         """Asynchronously control the heating loop."""
-        if self.error is None or self.heating_curve.value is None:
+        if (error := self.error) is None or self.heating_curve.value is None:
             return
 
         # Control the integral (if exceeded the time limit)
-        self.pid.update_integral(self.error, self.heating_curve.value)
+        self.pid.update_integral(error, self.heating_curve.value)
 
 
 class Areas:
     def __init__(self, config_data: MappingProxyType[str, Any], config_options: MappingProxyType[str, Any]):
         """Initialize Areas with multiple Area instances using shared config data and options."""
         self._entity_ids: list[str] = config_data.get(CONF_ROOMS) or []
-        self._areas: list[Area] = [Area(config_data, config_options, entity_id) for entity_id in self._entity_ids]
+        self._table: ZoneTable = ZoneTable(len(self._entity_ids))
+        self._areas: list[Area] = [Area(config_data, config_options, entity_id, self._table, index) for index, entity_id in enumerate(self._entity_ids)]
+
+        # The zones to refresh when an entity changes, an area can depend on its own state and the state of a sensor
+        self._zones_by_entity: dict[str, list[int]] = {}
+        self._errors: Optional[Errors] = None
 
     @property
     def errors(self) -> Errors:
         """Return a list of all the error values for all areas."""
-        return Errors([area.error for area in self._areas if area.error is not None])
+        if self._errors is None:
+            self._errors = Errors([
+                Error(self._entity_ids[index], value)
+                for index, value in enumerate(self._table.errors)
+                if not math.isnan(value)
+            ])
+
+        return self._errors
+
+    @property
+    def demand(self) -> Optional[float]:
+        """Return the average heating demand weight (0-2 range) of the areas with known temperatures."""
+        weights = [weight for weight in self._table.weights if not math.isnan(weight)]
+        if not weights:
+            return None
+
+        return round(sum(weights) / len(weights), 3)
 
     @property
     def heating_curves(self):
         """Return an interface to update heating curves for all areas."""
-        return Areas._HeatingCurves(self._areas)
+        return Areas._HeatingCurves(self._areas, self._table)
 
     @property
     def pids(self):
         """Return an interface to reset PID controllers for all areas."""
-        return Areas._PIDs(self._areas)
+        return Areas._PIDs(self._areas, self._table)
 
     def items(self) -> list[str]:
         return self._entity_ids
 
+    @callback
+    def async_update(self, entity_id: str) -> None:
+        """Refresh the zones that depend on the changed entity."""
+        reindex = False
+
+        for index in self._zones_by_entity.get(entity_id, ()):
+            area = self._areas[index]
+            sensor_temperature_id = area.sensor_temperature_id
+
+            area.async_refresh()
+
+            # Only a zone that switched its sensor changes which entities it depends on
+            reindex |= area.sensor_temperature_id != sensor_temperature_id
+
+        self._errors = None
+
+        if reindex:
+            self._async_index_entities()
+
+    @callback
+    def async_refresh(self) -> None:
+        """Refresh all zones, e.g. once the states of the rooms settled after starting Home Assistant."""
+        for area in self._areas:
+            area.async_refresh()
+
+        self._async_index_entities()
+
     async def async_added_to_hass(self, hass: HomeAssistant):
         for area in self._areas:
             await area.async_added_to_hass(hass)
 
+        self._async_index_entities()
+
     async def async_control_heating_loops(self, _time=None) -> None:
         """Asynchronously control heating loop for all areas."""
         for area in self._areas:
             await area.async_control_heating_loop(_time)
 
+    @callback
+    def _async_index_entities(self) -> None:
+        self._errors = None
+        self._zones_by_entity = {}
+
+        for index, area in enumerate(self._areas):
+            self._zones_by_entity.setdefault(area.id, []).append(index)
+
+            if area.sensor_temperature_id:
+                self._zones_by_entity.setdefault(area.sensor_temperature_id, []).append(index)
+
     class _HeatingCurves:
-        def __init__(self, areas: list[Area]):
+        def __init__(self, areas: list[Area], table: ZoneTable):
             self.areas = areas
+            self.table = table
 
         def update(self, current_outside_temperature: float) -> None:
             """Update the heating curve for all areas based on the current outside temperature."""
-            for area in self.areas:
-                if area.target_temperature is None:
+            for area, target_temperature in zip(self.areas, self.table.targets):
+                if math.isnan(target_temperature):
                     continue
 
-                area.heating_curve.update(area.target_temperature, current_outside_temperature)
+                area.heating_curve.update(target_temperature, current_outside_temperature)
 
     class _PIDs:
-        def __init__(self, areas: list[Area]):
+        def __init__(self, areas: list[Area], table: ZoneTable):
             self.areas = areas
+            self.table = table
 
         def update(self, boiler_temperature: float) -> None:
-            for area in self.areas:
-                if area.error is not None:
-                    area.pid.update(area.error, area.heating_curve.value, boiler_temperature)
+            for area, error in zip(self.areas, self.table.errors):
+                if not math.isnan(error):
+                    area.pid.update(Error(area.id, error), area.heating_curve.value, boiler_temperature)
 
         def reset(self) -> None:
             """Reset PID controllers for all areas."""
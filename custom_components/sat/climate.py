@@ -3,9 +3,9 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import timedelta, datetime
-from time import monotonic, time
-from typing import Optional, Callable
+from datetime import datetime
+from time import perf_counter
+from typing import Any, Optional, Callable
 
 from homeassistant.components import notify, sensor, weather
 from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
@@ -28,23 +28,26 @@ from homeassistant.components.climate import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, STATE_UNAVAILABLE, STATE_UNKNOWN, ATTR_ENTITY_ID, STATE_ON, STATE_OFF, EVENT_HOMEASSISTANT_STARTED
-from homeassistant.core import HomeAssistant, ServiceCall, Event, CoreState, EventStateChangedData, HassJob
+from homeassistant.core import HomeAssistant, ServiceCall, Event, CoreState, EventStateChangedData, State, callback
 from homeassistant.helpers import entity_registry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_state_change_event, async_track_time_interval, async_call_later
+from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.restore_state import RestoreEntity
 
 from .area import Areas, SENSOR_TEMPERATURE_ID
+from .clock import monotonic, utcnow
 from .const import *
-from .const import PWMStatus
+from .control import HeatingControl
 from .coordinator import SatDataUpdateCoordinator, DeviceState
 from .entity import SatEntity
 from .errors import Errors, Error
+from .flight_recorder import ControlDecision, FlightRecorder
 from .helpers import convert_time_str_to_seconds, is_state_stale, state_age_seconds
-from .manufacturers.geminox import Geminox
-from .pwm import PWMState
 from .relative_modulation import RelativeModulation, RelativeModulationState
+from .scheduler import ControlLoopScheduler, SchedulePriority
+from .snapshot import RuntimeStore
 from .summer_simmer import SummerSimmer
+from .timing import LoopTimings, STAGE_PID
 from .util import create_pid_controller, create_heating_curve_controller, create_pwm_controller, create_minimum_setpoint_controller
 
 ATTR_ROOMS = "rooms"
@@ -70,16 +73,51 @@ class SatWarmingUp:
     def __init__(self, error: float, boiler_temperature: Optional[float] = None, started: Optional[int] = None):
         self.error = error
         self.boiler_temperature = boiler_temperature
-        self.started = started if started is not None else int(time())
+        self.started = started if started is not None else int(monotonic())
 
     @property
     def elapsed(self):
-        return int(time()) - self.started
+        return int(monotonic()) - self.started
 
 
 class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
     _enable_turn_on_off_backwards_compatibility = False
 
+    # Telemetry that changes on almost every loop, it stays available on the state but is not stored in the recorder
+    _unrecorded_attributes = frozenset({
+        "error",
+        "error_pid",
+        "integral",
+        "derivative",
+        "proportional",
+        "integral_enabled",
+        "boiler_flame_timing",
+        "boiler_temperature_cold",
+        "boiler_temperature_tracking",
+        "boiler_temperature_derivative",
+        "derivative_enabled",
+        "derivative_raw",
+        "current_kp",
+        "current_ki",
+        "current_kd",
+        "setpoint",
+        "current_humidity",
+        "summer_simmer_index",
+        "summer_simmer_perception",
+        "heating_curve",
+        "requested_setpoint",
+        "minimum_setpoint",
+        "outside_temperature",
+        "optimal_coefficient",
+        "coefficient_derivative",
+        "relative_modulation_value",
+        "relative_modulation_enabled",
+        "relative_modulation_state",
+        "pulse_width_modulation_enabled",
+        "pulse_width_modulation_state",
+        "pulse_width_modulation_duty_cycle",
+    })
+
     def __init__(self, coordinator: SatDataUpdateCoordinator, config_entry: ConfigEntry, unit: str):
         super().__init__(coordinator, config_entry)
 
@@ -107,11 +145,9 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
         # Create a dictionary mapping preset keys to temperature values
         self._presets = {key: config_options[value] for key, value in conf_presets.items() if key in conf_presets}
 
-        self._alpha = 0.2
         self._sensors = []
         self._rooms = None
-        self._setpoint = None
-        self._calculated_setpoint = None
+        self._last_flame_active = None
         self._last_boiler_temperature = None
 
         self._hvac_mode = None
@@ -137,7 +173,16 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
         if hasattr(ClimateEntityFeature, 'TURN_OFF'):
             self._attr_supported_features |= ClimateEntityFeature.TURN_OFF
 
-        self._control_heating_loop_unsub: Optional[Callable[[], None]] = None
+        self._scheduler: Optional[ControlLoopScheduler] = None
+        self._runtime_store: Optional[RuntimeStore] = None
+
+        # Durations of the control loop and its stages, and the decisions it made
+        self._timings: LoopTimings = LoopTimings()
+        self._flight_recorder: FlightRecorder = FlightRecorder()
+
+        # Coalesced state writes and memoized attribute values
+        self._write_ha_state_handle: Optional[asyncio.Handle] = None
+        self._memoized_values: dict[str, tuple[Any, Any]] = {}
 
         # System Configuration
         self._attr_name = str(config_entry.data.get(CONF_NAME))
@@ -148,7 +193,6 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
 
         self._simulation = bool(config_entry.data.get(CONF_SIMULATION))
         self._heating_system = str(config_entry.data.get(CONF_HEATING_SYSTEM))
-        self._overshoot_protection = bool(config_entry.data.get(CONF_OVERSHOOT_PROTECTION))
         self._push_setpoint_to_thermostat = bool(config_entry.data.get(CONF_PUSH_SETPOINT_TO_THERMOSTAT))
 
         # User Configuration
@@ -156,12 +200,8 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
         self._thermal_comfort = bool(config_options.get(CONF_THERMAL_COMFORT))
         self._climate_valve_offset = float(config_options.get(CONF_CLIMATE_VALVE_OFFSET))
         self._target_temperature_step = float(config_options.get(CONF_TARGET_TEMPERATURE_STEP))
-        self._dynamic_minimum_setpoint = bool(config_options.get(CONF_DYNAMIC_MINIMUM_SETPOINT))
         self._sync_climates_with_mode = bool(config_options.get(CONF_SYNC_CLIMATES_WITH_MODE))
         self._sync_climates_with_preset = bool(config_options.get(CONF_SYNC_CLIMATES_WITH_PRESET))
-        self._maximum_relative_modulation = int(config_options.get(CONF_MAXIMUM_RELATIVE_MODULATION))
-        self._minimum_setpoint_version = int(config_options.get(CONF_DYNAMIC_MINIMUM_SETPOINT_VERSION))
-        self._force_pulse_width_modulation = bool(config_options.get(CONF_FORCE_PULSE_WIDTH_MODULATION))
         self._sensor_max_value_age = convert_time_str_to_seconds(config_options.get(CONF_SENSOR_MAX_VALUE_AGE))
         self._window_minimum_open_time = convert_time_str_to_seconds(config_options.get(CONF_WINDOW_MINIMUM_OPEN_TIME))
 
@@ -183,24 +223,45 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
         # Create a PWM controller with given configuration options
         self.pwm = create_pwm_controller(self.heating_curve, coordinator.supports_relative_modulation_management, config_entry.data, config_options)
 
+        # Create the decisions of the control loop, shared with the season simulator
+        self._control = HeatingControl(coordinator, self.pid, self.heating_curve, self.pwm, self.minimum_setpoint, self.relative_modulation, config_entry.data, config_options)
+
         if self._simulation:
             _LOGGER.warning("Simulation mode!")
 
     def async_track_coordinator_data(self):
-        """Track changes in the coordinator's boiler temperature and trigger the heating loop."""
-        if self._coordinator.boiler_temperature is not None and self._last_boiler_temperature == self._coordinator.boiler_temperature:
-            return
+        """Track changes in the coordinator's flame and boiler temperature and trigger the heating loop."""
+        flame_active = self._coordinator.flame_active
+        boiler_temperature = self._coordinator.boiler_temperature
+
+        # Flame transitions are handled with priority, so the PWM and the setpoint react quickly
+        if self._last_flame_active is not None and flame_active != self._last_flame_active:
+            self.schedule_control_heating_loop(priority=SchedulePriority.HIGH)
+        elif boiler_temperature is None or self._last_boiler_temperature != boiler_temperature:
+            self.schedule_control_heating_loop()
 
-        self.schedule_control_heating_loop()
-        self._last_boiler_temperature = self._coordinator.boiler_temperature
+        self._last_flame_active = flame_active
+        self._last_boiler_temperature = boiler_temperature
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added."""
         await super().async_added_to_hass()
 
+        # Make sure no pending state write or control loop outlives the entity
+        self._scheduler = ControlLoopScheduler(self.hass, self.async_control_heating_loop)
+        self.async_on_remove(self._scheduler.async_cancel)
+        self.async_on_remove(self._async_cancel_scheduled_write_ha_state)
+
         # Restore the previous state if available, or set default values
         await self._restore_previous_state_or_set_defaults()
 
+        # Resume the controllers and the flame history from before the restart
+        self._runtime_store = RuntimeStore(self.hass, self._config_entry.entry_id)
+        await self._async_restore_runtime_snapshot()
+
+        # Initialize the area system
+        await self.areas.async_added_to_hass(self.hass)
+
         # Update a heating curve if outside temperature is available
         if self.current_outside_temperature is not None:
             self.areas.heating_curves.update(self.current_outside_temperature)
@@ -216,22 +277,16 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
         # Register services
         await self._register_services()
 
-        # Initialize the area system
-        await self.areas.async_added_to_hass(self.hass)
-
         # Let the coordinator know we are ready
         await self._coordinator.async_added_to_hass()
 
     async def _register_event_listeners(self, _time: Optional[datetime] = None):
         """Register event listeners."""
-        self.async_on_remove(
-            async_track_time_interval(
-                self.hass, self.schedule_control_heating_loop, timedelta(seconds=30)
-            )
-        )
+        # The rooms may have changed while Home Assistant was starting, before we listened to them
+        self.areas.async_refresh()
 
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_track_coordinator_data)
+            self.coordinator.async_add_selective_listener(self.async_track_coordinator_data, properties=("flame_active", "boiler_temperature"))
         )
 
         self.async_on_remove(
@@ -308,7 +363,7 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
                 self._hvac_mode = old_state.state
 
             if old_state.attributes.get(ATTR_SETPOINT):
-                self._setpoint = old_state.attributes.get(ATTR_SETPOINT)
+                self._control.restore_setpoint(old_state.attributes.get(ATTR_SETPOINT))
 
             if old_state.attributes.get(ATTR_PRESET_MODE):
                 self._attr_preset_mode = old_state.attributes.get(ATTR_PRESET_MODE)
@@ -343,6 +398,34 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
 
         self.async_write_ha_state()
 
+    async def async_will_remove_from_hass(self) -> None:
+        """Save the runtime state right away, so a reload resumes from it."""
+        if self._runtime_store is not None:
+            await self._runtime_store.async_save(self._runtime_snapshot)
+
+        await super().async_will_remove_from_hass()
+
+    async def _async_restore_runtime_snapshot(self) -> None:
+        """Restore the runtime state of the controllers and the coordinator, if a recent snapshot is available."""
+        if (snapshot := await self._runtime_store.async_load()) is None:
+            return
+
+        if (data := snapshot.get("pid")) is not None:
+            self.pid.restore_snapshot(snapshot, data)
+
+        if (data := snapshot.get("pwm")) is not None:
+            self.pwm.restore_snapshot(snapshot, data)
+
+        if (data := snapshot.get("coordinator")) is not None:
+            self._coordinator.restore_snapshot(snapshot, data)
+
+    def _runtime_snapshot(self) -> dict[str, Any]:
+        return {
+            "pid": self.pid.to_snapshot(),
+            "pwm": self.pwm.to_snapshot(),
+            "coordinator": self._coordinator.to_snapshot(),
+        }
+
     async def _register_services(self):
         async def reset_integral(_call: ServiceCall):
             """Service to reset the integral part of the PID controller."""
@@ -364,10 +447,21 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
     @property
     def extra_state_attributes(self):
         """Return device state attributes."""
+        max_error = self.max_error
+        current_humidity = self.current_humidity
+        current_temperature = self.current_temperature
+
+        summer_simmer_index, summer_simmer_perception = self._memoize(
+            "summer_simmer", (current_temperature, current_humidity), lambda: (
+                SummerSimmer.index(current_temperature, current_humidity),
+                SummerSimmer.perception(current_temperature, current_humidity),
+            )
+        )
+
         return {
-            "error": self.max_error.value,
+            "error": max_error.value,
             "error_pid": self.pid.last_error,
-            "error_source": self.max_error.entity_id,
+            "error_source": max_error.entity_id,
 
             "integral": self.pid.integral,
             "derivative": self.pid.derivative,
@@ -390,11 +484,11 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
             "current_kd": self.pid.kd,
 
             "rooms": self._rooms,
-            "setpoint": self._setpoint,
-            "current_humidity": self.current_humidity,
+            "setpoint": self._control.setpoint,
+            "current_humidity": current_humidity,
 
-            "summer_simmer_index": SummerSimmer.index(self.current_temperature, self.current_humidity),
-            "summer_simmer_perception": SummerSimmer.perception(self.current_temperature, self.current_humidity),
+            "summer_simmer_index": summer_simmer_index,
+            "summer_simmer_perception": summer_simmer_perception,
 
             "valves_open": self.valves_open,
             "heating_curve": self.heating_curve.value,
@@ -500,31 +594,38 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
 
     @property
     def setpoint(self) -> float | None:
-        return self._setpoint
+        return self._control.setpoint
+
+    @property
+    def timings(self) -> LoopTimings:
+        """Return the durations of the control loop and its stages."""
+        return self._timings
+
+    @property
+    def flight_recorder(self) -> FlightRecorder:
+        """Return the latest decisions of the control loop."""
+        return self._flight_recorder
 
     @property
     def requested_setpoint(self) -> float:
         """Get the requested setpoint based on the heating curve and PID output."""
-        if self.heating_curve.value is None:
-            return MINIMUM_SETPOINT
-
-        return round(max(self.heating_curve.value + self.pid.output, MINIMUM_SETPOINT), 1)
+        return self._control.requested_setpoint
 
     @property
     def valves_open(self) -> bool:
         """Determine if any of the controlled climates have open valves."""
-        # Get the list of all controlled climates
-        climates = self._radiators + self.areas.items()
-
         # If there are no radiators, we can safely assume the valves are open
         if len(self._radiators) == 0:
             return True
 
-        # Iterate through each controlled thermostat
-        for climate in climates:
-            # Get the current state of the thermostat
-            state = self.hass.states.get(climate)
+        # Get the current state of all controlled climates, only re-evaluate them when one of them changed
+        states = tuple(self.hass.states.get(climate) for climate in self._radiators + self.areas.items())
+        return self._memoize("valves_open", states, lambda: self._valves_open(states))
 
+    def _valves_open(self, states: tuple[Optional[State], ...]) -> bool:
+        """Determine if any of the given climate states has open valves."""
+        # Iterate through each controlled thermostat
+        for state in states:
             # If the thermostat is unavailable or has an unknown state, skip it
             if state is None or state.state in [STATE_UNKNOWN, STATE_UNAVAILABLE]:
                 continue
@@ -553,26 +654,11 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
     @property
     def pulse_width_modulation_enabled(self) -> bool:
         """Return True if pulse width modulation is enabled, False otherwise."""
-        if not self._coordinator.supports_setpoint_management or self._force_pulse_width_modulation:
-            return True
-
-        if not self._overshoot_protection or self._calculated_setpoint is None:
-            return False
-
-        if not self._dynamic_minimum_setpoint:
-            return self._coordinator.minimum_setpoint > self._calculated_setpoint
-
-        if self._minimum_setpoint_version == 1:
-            return self.minimum_setpoint.current > self._calculated_setpoint
-
-        return self.pwm.enabled
+        return self._control.pulse_width_modulation_enabled
 
     @property
     def relative_modulation_value(self) -> int:
-        if not self.relative_modulation.enabled and self._coordinator.supports_relative_modulation_management:
-            return MINIMUM_RELATIVE_MODULATION
-
-        return self._maximum_relative_modulation
+        return self._control.relative_modulation_value
 
     @property
     def relative_modulation_state(self) -> RelativeModulationState:
@@ -581,24 +667,40 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
     @property
     def minimum_setpoint_value(self) -> float:
         """Get the minimum allowable setpoint temperature."""
-        if self._dynamic_minimum_setpoint:
-            # Version 1: Use MinimumSetpoint controller
-            if self._minimum_setpoint_version == 1:
-                return max(self.minimum_setpoint.current, self._coordinator.minimum_setpoint)
+        return self._control.minimum_setpoint_value
+
+    def _memoize(self, name: str, key: Any, factory: Callable[[], Any]) -> Any:
+        """Return the cached value for the given name, and only recompute it when the key changed."""
+        if (cached := self._memoized_values.get(name)) is not None and cached[0] == key:
+            return cached[1]
+
+        value = factory()
+        self._memoized_values[name] = (key, value)
 
-            # Version 2: Use Pulse Width Modulation controller
-            if self._minimum_setpoint_version == 2:
-                return max(self.pwm.setpoint, self._coordinator.minimum_setpoint)
+        return value
 
-        # Default to coordinator's minimum setpoint
-        return self._coordinator.minimum_setpoint
+    @callback
+    def async_schedule_write_ha_state(self) -> None:
+        """Schedule a state write, multiple requests within the same loop iteration result in a single write."""
+        if self._write_ha_state_handle is None:
+            self._write_ha_state_handle = self.hass.loop.call_soon(self.async_write_ha_state)
 
-    def _calculate_control_setpoint(self) -> float:
-        """Calculate the control setpoint based on the heating curve and PID output."""
-        if self.heating_curve.value is None:
-            return MINIMUM_SETPOINT
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state immediately, which also takes care of any scheduled write."""
+        self._async_cancel_scheduled_write_ha_state()
+        super().async_write_ha_state()
 
-        return self.requested_setpoint
+    @callback
+    def _async_cancel_scheduled_write_ha_state(self) -> None:
+        if self._write_ha_state_handle is not None:
+            self._write_ha_state_handle.cancel()
+            self._write_ha_state_handle = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Coalesce the state writes caused by coordinator updates."""
+        self.async_schedule_write_ha_state()
 
     async def _async_thermostat_changed(self, event: Event[EventStateChangedData]) -> None:
         """Handle changes to the connected thermostat."""
@@ -624,7 +726,7 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
             return
 
         _LOGGER.debug("Inside Sensor Changed.")
-        self.async_write_ha_state()
+        self.async_schedule_write_ha_state()
 
         self._async_control_pid()
         self.schedule_control_heating_loop()
@@ -635,7 +737,7 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
             return
 
         _LOGGER.debug("Outside Sensor Changed.")
-        self.async_write_ha_state()
+        self.async_schedule_write_ha_state()
 
         self._async_control_pid()
         self.schedule_control_heating_loop()
@@ -647,7 +749,7 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
             return
 
         _LOGGER.debug("Humidity Sensor Changed.")
-        self.async_write_ha_state()
+        self.async_schedule_write_ha_state()
 
         self._async_control_pid()
         self.schedule_control_heating_loop()
@@ -660,7 +762,7 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
             return
 
         if old_state is None or new_state.state != old_state.state:
-            _LOGGER.debug(f"Main Climate State Changed ({new_state.entity_id}).")
+            _LOGGER.debug("Main Climate State Changed (%s).", new_state.entity_id)
             self.schedule_control_heating_loop()
 
     async def _async_climate_changed(self, event: Event[EventStateChangedData]) -> None:
@@ -668,6 +770,9 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
         If the state, target temperature, or current temperature of the climate
         entity has changed, update the PID controller and heating control.
         """
+        # Refresh the zone of the area before anything reads its error
+        self.areas.async_update(event.data["entity_id"])
+
         # Get the new state of the climate entity
         new_state = event.data.get("new_state")
 
@@ -684,7 +789,7 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
         # Get the attributes of the old state, if available
         old_attrs = old_state.attributes if old_state else {}
 
-        _LOGGER.debug(f"Climate State Changed ({new_state.entity_id}).")
+        _LOGGER.debug("Climate State Changed (%s).", new_state.entity_id)
 
         # Check if the last state is None, so we can track the attached sensor if needed
         if old_state is None and (sensor_temperature_id := new_attrs.get(SENSOR_TEMPERATURE_ID)):
@@ -711,11 +816,13 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
 
     async def _async_temperature_change(self, event: Event[EventStateChangedData]) -> None:
         """Handle changes to the climate sensor entity."""
+        self.areas.async_update(event.data["entity_id"])
+
         new_state = event.data.get("new_state")
         if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
             return
 
-        _LOGGER.debug(f"Climate Sensor Changed ({new_state.entity_id}).")
+        _LOGGER.debug("Climate Sensor Changed (%s).", new_state.entity_id)
         self._async_control_pid()
         self.schedule_control_heating_loop()
 
@@ -725,7 +832,7 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
         if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
             return
 
-        _LOGGER.debug(f"Window Sensor Changed to {new_state.state}.")
+        _LOGGER.debug("Window Sensor Changed to %s.", new_state.state)
 
         if new_state.state == STATE_ON:
             if self.preset_mode == PRESET_ACTIVITY:
@@ -748,7 +855,7 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
                 self._window_sensor_handle = None
 
             if self.preset_mode == PRESET_ACTIVITY:
-                _LOGGER.debug(f"Restoring original target temperature.")
+                _LOGGER.debug("Restoring original target temperature.")
                 await self.async_set_temperature(temperature=self._pre_activity_temperature)
 
             return
@@ -772,91 +879,14 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
             self.areas.heating_curves.update(self.current_outside_temperature)
             self.heating_curve.update(self.target_temperature, self.current_outside_temperature)
 
-        # Update the PID controller with the maximum error
-        if not reset:
-            _LOGGER.info(f"Updating error to {max_error.value} from {max_error.entity_id} (Reset: False)")
-
-            # Calculate an optimal heating curve when we are in the deadband
-            if self.target_temperature is not None and -DEADBAND <= max_error.value <= DEADBAND:
-                self.heating_curve.autotune(
-                    setpoint=self.requested_setpoint,
-                    target_temperature=self.target_temperature,
-                    outside_temperature=self.current_outside_temperature
-                )
-
-            # Update our PID controllers if we have valid values
-            if self._coordinator.boiler_temperature_filtered is not None:
-                self.areas.pids.update(self._coordinator.boiler_temperature_filtered)
-
-                if self.heating_curve.value is not None:
-                    self.pid.update(max_error, self.heating_curve.value, self._coordinator.boiler_temperature_filtered)
-
-        elif max_error.value != self.pid.last_error:
-            _LOGGER.info(f"Updating error to {max_error.value} from {max_error.entity_id} (Reset: True)")
-
-            self.pid.update_reset(error=max_error, heating_curve_value=self.heating_curve.value)
-            self._calculated_setpoint = None
-            self.pwm.reset()
-
-        self.async_write_ha_state()
-
-    async def _async_control_setpoint(self, pwm_state: PWMState) -> None:
-        """Control the setpoint of the heating system based on the current mode and PWM state."""
-
-        # Check if the system is in HEAT mode
-        if self.hvac_mode != HVACMode.HEAT:
-            # If not in HEAT mode, set to the minimum setpoint
-            self._calculated_setpoint = None
-            self._setpoint = MINIMUM_SETPOINT
-            _LOGGER.info("HVAC mode is not HEAT. Setting setpoint to minimum: %.1f°C", MINIMUM_SETPOINT)
-
-        elif not self.pulse_width_modulation_enabled or pwm_state.status == PWMStatus.IDLE:
-            # Normal cycle without PWM
-            self._setpoint = self._calculated_setpoint
-            _LOGGER.info("Pulse Width Modulation is disabled or in IDLE state. Running normal heating cycle.")
-            _LOGGER.debug("Calculated setpoint for normal cycle: %.1f°C", self._calculated_setpoint)
-
-            # Some final checks to see if it's even warm
-            if self._setpoint < COLD_SETPOINT:
-                self._setpoint = MINIMUM_SETPOINT
-                _LOGGER.debug("Calculated setpoint is too cold. Setting setpoint to minimum: %.1f°C", MINIMUM_SETPOINT)
-        else:
-            # PWM is enabled and actively controlling the cycle
-            _LOGGER.info("Running PWM cycle with state: %s", pwm_state.status)
-
-            if pwm_state.status == PWMStatus.ON:
-                self._setpoint = self.minimum_setpoint_value
-                _LOGGER.debug("Setting setpoint to minimum: %.1f°C", self._setpoint)
-            else:
-                self._setpoint = MINIMUM_SETPOINT
-                _LOGGER.debug("Setting setpoint to absolute minimum: %.1f°C", MINIMUM_SETPOINT)
-
-        # Apply the setpoint using the coordinator
-        await self._coordinator.async_set_control_setpoint(min(self._setpoint, self._coordinator.maximum_setpoint))
-        _LOGGER.info("Control setpoint has been updated to: %.1f°C", self._setpoint)
-
-    async def _async_control_relative_modulation(self) -> None:
-        """Control the relative modulation value based on the conditions."""
-        if not self._coordinator.supports_relative_modulation_management:
-            _LOGGER.debug("Relative modulation management is not supported. Skipping control.")
-            return
+        # Update our area PID controllers if we have valid values
+        if not reset and self._coordinator.boiler_temperature_filtered is not None:
+            self.areas.pids.update(self._coordinator.boiler_temperature_filtered)
 
-        # Update relative modulation state
-        await self.relative_modulation.update(self.pulse_width_modulation_enabled)
-
-        # Retrieve the relative modulation
-        relative_modulation_value = self.relative_modulation_value
-
-        # Apply some filters based on the manufacturer
-        if isinstance(self._coordinator.manufacturer, Geminox):
-            relative_modulation_value = max(10, relative_modulation_value)
-
-        # Determine if the value needs to be updated
-        if self._coordinator.maximum_relative_modulation_value == relative_modulation_value:
-            _LOGGER.debug("Relative modulation value unchanged (%d%%). No update necessary.", relative_modulation_value)
-            return
+        # Update the PID controller with the maximum error
+        self._control.update_pid(max_error, self.target_temperature, self.current_outside_temperature, reset)
 
-        await self._coordinator.async_set_control_max_relative_modulation(relative_modulation_value)
+        self.async_schedule_write_ha_state()
 
     async def _async_update_rooms_from_climates(self) -> None:
         """Update the temperature setpoint for each room based on their associated climate entity."""
@@ -879,8 +909,7 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
 
     def reset_control_state(self):
         """Reset control state when major changes occur."""
-        self.pwm.disable()
-        self._calculated_setpoint = None
+        self._control.reset()
 
     def async_track_sensor_temperature(self, entity_id):
         """
@@ -903,85 +932,102 @@ class SatClimate(SatEntity, ClimateEntity, RestoreEntity):
 
         self._sensors.append(entity_id)
 
-    def schedule_control_heating_loop(self, _time: Optional[datetime] = None, force: bool = False, ) -> None:
-        """Schedule a debounced execution of the heating control loop."""
-        # Force immediate execution
-        if force:
-            # Cancel previous scheduled run, if any
-            if self._control_heating_loop_unsub is not None:
-                self._control_heating_loop_unsub()
-                self._control_heating_loop_unsub = None
-
-                self.hass.async_create_task(self.async_control_heating_loop())
-                return
+    def schedule_control_heating_loop(self, _time: Optional[datetime] = None, force: bool = False, priority: SchedulePriority = SchedulePriority.NORMAL) -> None:
+        """Request a run of the heating control loop, coalesced with any pending run."""
+        self._scheduler.async_request(SchedulePriority.IMMEDIATE if force else priority)
 
-        # If a run is already scheduled, do nothing.
-        if self._control_heating_loop_unsub is not None:
-            return
+    def _plan_control_heating_loop(self, controlled: bool) -> None:
+        """Plan the next run of the heating control loop based on the needs of the controllers."""
+        deadlines = [self._sensor_stale_deadline()]
 
-        self._control_heating_loop_unsub = async_call_later(self.hass, 10, HassJob(self.async_control_heating_loop))
+        if controlled:
+            deadlines += [self.pid.next_sample, self.pid.next_integral_update]
 
-    async def async_control_heating_loop(self, _time: Optional[datetime] = None) -> None:
-        """Control the heating based on current temperature, target temperature, and outside temperature."""
-        # Let the sub know we have run
-        self._control_heating_loop_unsub = None
+            if self.pulse_width_modulation_enabled:
+                deadlines.append(self.pwm.next_transition)
 
-        # If the current, target or outside temperature is not available, do nothing
-        if self.current_temperature is None or self.target_temperature is None or self.current_outside_temperature is None:
-            return
+        self._scheduler.async_plan(deadlines)
 
-        # No need to do anything if we are not on
-        if self.hvac_mode != HVACMode.HEAT:
-            return
-
-        # Control the heating through the coordinator
-        await self._coordinator.async_control_heating_loop(climate=self, pwm_state=self.pwm.state)
-
-        if self._calculated_setpoint is None:
-            # Default to the calculated setpoint
-            self._calculated_setpoint = self._calculate_control_setpoint()
-        else:
-            # Apply low filter on the requested setpoint
-            self._calculated_setpoint = round(self._alpha * self._calculate_control_setpoint() + (1 - self._alpha) * self._calculated_setpoint, 1)
+    def _sensor_stale_deadline(self) -> Optional[float]:
+        """Return the monotonic time at which the inside sensor becomes stale."""
+        if self._sensor_max_value_age <= 0 or (state := self.hass.states.get(self.inside_sensor_entity_id)) is None:
+            return None
 
-        # Check for overshoot
-        if self._coordinator.device_status == BoilerStatus.OVERSHOOT_HANDLING:
-            _LOGGER.info("Overshoot Handling detected, enabling Pulse Width Modulation.")
-            self.pwm.enable()
+        if (remaining := self._sensor_max_value_age - state_age_seconds(state)) <= 0:
+            return None
 
-        # Pulse Width Modulation
-        if not self.pulse_width_modulation_enabled:
-            self.pwm.reset()
-        else:
-            await self.pwm.update(flame=self._coordinator.flame, boiler=self._coordinator.boiler, requested_setpoint=self._calculated_setpoint)
+        return monotonic() + remaining
 
-        # Set the control setpoint to make sure we always stay in control
-        await self._async_control_setpoint(self.pwm.state)
+    async def async_control_heating_loop(self, _time: Optional[datetime] = None) -> None:
+        """Control the heating based on current temperature, target temperature, and outside temperature."""
+        controlled = False
+        start = perf_counter()
 
-        # Set the relative modulation value, if supported
-        await self._async_control_relative_modulation()
+        try:
+            controlled = await self._async_control_heating_loop()
+        finally:
+            if self._scheduler is not None:
+                self._plan_control_heating_loop(controlled)
 
-        # Control the integral (if exceeded the time limit)
-        if self.heating_curve.value is not None:
-            self.pid.update_integral(self.max_error, self.heating_curve.value)
+        # Only the iterations that ran the controllers count towards the loop latency
+        if controlled:
+            self._timings.loop.add(perf_counter() - start)
 
-        # Control our areas
-        await self.areas.async_control_heating_loops()
+        if controlled and self._runtime_store is not None:
+            self._runtime_store.async_schedule_save(self._runtime_snapshot)
 
-        # Control our dynamic minimum setpoint (version 1)
-        if not self._coordinator.hot_water_active and self._coordinator.flame_active:
-            # Calculate the base return temperature
-            if self._coordinator.device_status == BoilerStatus.HEATING_UP:
-                self.minimum_setpoint.warming_up(self._coordinator.boiler)
+    async def _async_control_heating_loop(self) -> bool:
+        """Run a single iteration of the heating control, returns whether the controllers were updated."""
+        # If the current, target or outside temperature is not available, do nothing
+        if self.current_temperature is None or self.target_temperature is None or self.current_outside_temperature is None:
+            return False
 
-            # Calculate the dynamic minimum setpoint
-            self.minimum_setpoint.calculate(self._coordinator.boiler, self.pwm.status)
+        # No need to do anything if we are not on
+        if self.hvac_mode != HVACMode.HEAT:
+            return False
 
-        # If the setpoint is high, turn on the heater
-        await self.async_set_heater_state(DeviceState.ON if self._setpoint is not None and self._setpoint > COLD_SETPOINT else DeviceState.OFF)
+        # Apply a sensor update that was held back by the sample time limit of the PID controller
+        if (next_sample := self.pid.next_sample) is not None and monotonic() >= next_sample:
+            with self._timings.stage(STAGE_PID):
+                self._async_control_pid()
+
+        # Run the stages of the control loop
+        await self._control.async_control_heating_loop(
+            error=self.max_error,
+            timings=self._timings,
+            set_heater_state=self.async_set_heater_state,
+            control_areas=self.areas.async_control_heating_loops,
+            climate=self,
+        )
 
+        self._record_control_decision()
         self.async_write_ha_state()
 
+        return True
+
+    def _record_control_decision(self) -> None:
+        """Keep the inputs and outputs of this iteration, so the decisions can be inspected afterward."""
+        pwm_state = self.pwm.state
+        duty_cycle_on, duty_cycle_off = pwm_state.duty_cycle or (None, None)
+
+        self._flight_recorder.record(ControlDecision(
+            timestamp=utcnow().timestamp(),
+
+            error=self.max_error.value,
+            outside_temperature=self.current_outside_temperature,
+            flow_temperature=self._coordinator.boiler_temperature,
+            flame_active=self._coordinator.flame_active,
+
+            requested_setpoint=self.requested_setpoint,
+            calculated_setpoint=self._control.calculated_setpoint,
+            setpoint=self._control.setpoint,
+            pwm_status=pwm_state.status,
+            duty_cycle_on=duty_cycle_on,
+            duty_cycle_off=duty_cycle_off,
+            relative_modulation=self.relative_modulation_value,
+            heater_on=self._control.heater_state == DeviceState.ON,
+        ))
+
     async def async_set_heater_state(self, state: DeviceState):
         """Set the heater state, ensuring proper conditions are met."""
         _LOGGER.debug("Attempting to set heater state to: %s", state)
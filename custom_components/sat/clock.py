@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+from homeassistant.util import dt
+
+
+class Clock:
+    """Reads the monotonic and wall-clock time of the operating system."""
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def utcnow(self) -> datetime:
+        return dt.utcnow()
+
+
+class VirtualClock(Clock):
+    """A clock that only moves when it is advanced, used to replay control scenarios faster than real time."""
+
+    def __init__(self, start: float = 0.0, start_utc: Optional[datetime] = None) -> None:
+        self._now: float = float(start)
+        self._start: float = float(start)
+        self._start_utc: datetime = start_utc or dt.utcnow()
+
+    def monotonic(self) -> float:
+        return self._now
+
+    def utcnow(self) -> datetime:
+        return self._start_utc + timedelta(seconds=self._now - self._start)
+
+    def advance(self, seconds: float) -> float:
+        """Move the clock forward by the given amount of seconds and return the new time."""
+        if seconds < 0:
+            raise ValueError("A virtual clock can not move backwards.")
+
+        self._now += seconds
+        return self._now
+
+
+_clock: Clock = Clock()
+
+
+def get_clock() -> Clock:
+    """Return the active clock."""
+    return _clock
+
+
+def set_clock(clock: Clock) -> None:
+    """Replace the active clock for all timing code."""
+    global _clock
+    _clock = clock
+
+
+def monotonic() -> float:
+    """Return the monotonic time of the active clock."""
+    return _clock.monotonic()
+
+
+def utcnow() -> datetime:
+    """Return the timezone-aware UTC time of the active clock."""
+    return _clock.utcnow()
+
+
+def to_monotonic(timestamp: datetime) -> float:
+    """Convert a timezone-aware UTC time in the past to the monotonic time of the active clock."""
+    return _clock.monotonic() - max(0.0, (_clock.utcnow() - timestamp).total_seconds())
+
+
+@contextmanager
+def use_clock(clock: Clock) -> Iterator[Clock]:
+    """Temporarily replace the active clock, restoring the previous one afterwards."""
+    previous = get_clock()
+    set_clock(clock)
+
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
@@ -21,7 +21,7 @@ from .const import *
 from .coordinator import SatDataUpdateCoordinator
 from .helpers import calculate_default_maximum_setpoint, snake_case
 from .manufacturer import ManufacturerFactory, MANUFACTURERS
-from .overshoot_protection import OvershootProtection
+from .overshoot_protection import OvershootProtection, CalibrationPhase
 from .validators import valid_serial_device
 
 DEFAULT_NAME = "Living Room"
@@ -35,6 +35,7 @@ class SatFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     MINOR_VERSION = 0
 
     calibration = None
+    calibration_phase = CalibrationPhase.IDLE
     previous_hvac_mode = None
     overshoot_protection_value = None
 
@@ -372,12 +373,20 @@ class SatFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         entities = entity_registry.async_get(self.hass)
         climate_id = entities.async_get_entity_id(climate.DOMAIN, DOMAIN, device_name.lower())
 
+        @callback
+        def on_progress(phase: CalibrationPhase):
+            self.calibration_phase = phase
+
+            # Show the new phase, the progress step is shown again as long as the calibration is running
+            if self.calibration is not None and not self.calibration.done():
+                self.hass.async_create_task(self.hass.config_entries.flow.async_configure(self.flow_id))
+
         async def start_calibration():
             try:
                 coordinator = await self.async_create_coordinator()
                 await coordinator.async_setup()
 
-                overshoot_protection = OvershootProtection(coordinator, self.data.get(CONF_HEATING_SYSTEM))
+                overshoot_protection = OvershootProtection(coordinator, self.data.get(CONF_HEATING_SYSTEM), on_progress)
                 self.overshoot_protection_value = await overshoot_protection.calculate()
 
                 await coordinator.async_will_remove_from_hass()
@@ -402,10 +411,12 @@ class SatFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 data = {ATTR_ENTITY_ID: entity_id, climate.ATTR_HVAC_MODE: climate.HVACMode.HEAT}
                 await self.hass.services.async_call(climate.DOMAIN, climate.SERVICE_SET_HVAC_MODE, data, blocking=True)
 
+        if not self.calibration.done():
             return self.async_show_progress(
                 step_id="calibrate",
                 progress_task=self.calibration,
                 progress_action="calibration",
+                description_placeholders={"phase": self.calibration_phase.replace("_", " ").capitalize()},
             )
 
         if self.overshoot_protection_value is None:
@@ -416,6 +427,7 @@ class SatFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
         self.calibration = None
+        self.calibration_phase = CalibrationPhase.IDLE
         self.overshoot_protection_value = None
 
         # Make sure to restore the mode after we are done
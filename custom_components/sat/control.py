@@ -0,0 +1,280 @@
+"""The decisions of the heating control loop, shared by the climate entity and the season simulator."""
+from __future__ import annotations
+
+import logging
+from typing import Any, Awaitable, Callable, Mapping, Optional, TYPE_CHECKING
+
+from .const import *
+from .coordinator import DeviceState, SatDataUpdateCoordinator
+from .errors import Error
+from .heating_curve import HeatingCurve
+from .log import SatLogger
+from .manufacturers.geminox import Geminox
+from .minimum_setpoint import MinimumSetpoint
+from .pid import PID
+from .pwm import PWM, PWMState
+from .relative_modulation import RelativeModulation
+from .timing import (
+    LoopTimings,
+    STAGE_AREAS,
+    STAGE_CONTROL_SETPOINT,
+    STAGE_COORDINATOR,
+    STAGE_HEATER_STATE,
+    STAGE_INTEGRAL,
+    STAGE_MINIMUM_SETPOINT,
+    STAGE_PWM,
+    STAGE_RELATIVE_MODULATION,
+    STAGE_SETPOINT_FILTER,
+)
+
+if TYPE_CHECKING:
+    from .climate import SatClimate
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HeatingControl:
+    """
+    Turns the output of the heating curve and the PID controller into a control setpoint, a PWM cycle, a relative
+    modulation and a heater state. The climate entity and the season simulator both run their control loop through it.
+    """
+
+    def __init__(
+            self,
+            coordinator: SatDataUpdateCoordinator,
+            pid: PID,
+            heating_curve: HeatingCurve,
+            pwm: PWM,
+            minimum_setpoint: MinimumSetpoint,
+            relative_modulation: RelativeModulation,
+            config_data: Mapping[str, Any],
+            config_options: Mapping[str, Any],
+    ) -> None:
+        self._pid: PID = pid
+        self._pwm: PWM = pwm
+        self._heating_curve: HeatingCurve = heating_curve
+        self._minimum_setpoint: MinimumSetpoint = minimum_setpoint
+        self._coordinator: SatDataUpdateCoordinator = coordinator
+        self._relative_modulation: RelativeModulation = relative_modulation
+
+        self._alpha: float = 0.2
+        self._setpoint: Optional[float] = None
+        self._calculated_setpoint: Optional[float] = None
+
+        self._log: SatLogger = SatLogger(_LOGGER)
+
+        self._overshoot_protection: bool = bool(config_data.get(CONF_OVERSHOOT_PROTECTION))
+        self._dynamic_minimum_setpoint: bool = bool(config_options.get(CONF_DYNAMIC_MINIMUM_SETPOINT))
+        self._minimum_setpoint_version: int = int(config_options.get(CONF_DYNAMIC_MINIMUM_SETPOINT_VERSION))
+        self._maximum_relative_modulation: int = int(config_options.get(CONF_MAXIMUM_RELATIVE_MODULATION))
+        self._force_pulse_width_modulation: bool = bool(config_options.get(CONF_FORCE_PULSE_WIDTH_MODULATION))
+
+    @property
+    def setpoint(self) -> Optional[float]:
+        """Return the control setpoint that was decided by the latest iteration."""
+        return self._setpoint
+
+    @property
+    def calculated_setpoint(self) -> Optional[float]:
+        """Return the low-pass filtered requested setpoint."""
+        return self._calculated_setpoint
+
+    @property
+    def requested_setpoint(self) -> float:
+        """Get the requested setpoint based on the heating curve and PID output."""
+        if self._heating_curve.value is None:
+            return MINIMUM_SETPOINT
+
+        return round(max(self._heating_curve.value + self._pid.output, MINIMUM_SETPOINT), 1)
+
+    @property
+    def pulse_width_modulation_enabled(self) -> bool:
+        """Return True if pulse width modulation is enabled, False otherwise."""
+        if not self._coordinator.supports_setpoint_management or self._force_pulse_width_modulation:
+            return True
+
+        if not self._overshoot_protection or self._calculated_setpoint is None:
+            return False
+
+        if not self._dynamic_minimum_setpoint:
+            return self._coordinator.minimum_setpoint > self._calculated_setpoint
+
+        if self._minimum_setpoint_version == 1:
+            return self._minimum_setpoint.current > self._calculated_setpoint
+
+        return self._pwm.enabled
+
+    @property
+    def minimum_setpoint_value(self) -> float:
+        """Get the minimum allowable setpoint temperature."""
+        if self._dynamic_minimum_setpoint:
+            # Version 1: Use MinimumSetpoint controller
+            if self._minimum_setpoint_version == 1:
+                return max(self._minimum_setpoint.current, self._coordinator.minimum_setpoint)
+
+            # Version 2: Use Pulse Width Modulation controller
+            if self._minimum_setpoint_version == 2:
+                return max(self._pwm.setpoint, self._coordinator.minimum_setpoint)
+
+        # Default to coordinator's minimum setpoint
+        return self._coordinator.minimum_setpoint
+
+    @property
+    def relative_modulation_value(self) -> int:
+        if not self._relative_modulation.enabled and self._coordinator.supports_relative_modulation_management:
+            return MINIMUM_RELATIVE_MODULATION
+
+        return self._maximum_relative_modulation
+
+    @property
+    def heater_state(self) -> DeviceState:
+        """Return the heater state that follows from the control setpoint, only a warm setpoint turns the heater on."""
+        return DeviceState.ON if self._setpoint is not None and self._setpoint > COLD_SETPOINT else DeviceState.OFF
+
+    def restore_setpoint(self, setpoint: Optional[float]) -> None:
+        """Restore the control setpoint from before a restart."""
+        self._setpoint = setpoint
+
+    def reset(self) -> None:
+        """Reset the control state when major changes occur."""
+        self._pwm.disable()
+        self._calculated_setpoint = None
+
+    def update_pid(self, error: Error, target_temperature: Optional[float], outside_temperature: float, reset: bool = False) -> None:
+        """Feed a new error to the PID controller, a reset starts over from the current error."""
+        if not reset:
+            self._log.changed("error", (error.value, error.entity_id), logging.INFO, "Updating error to %s from %s (Reset: False)", error.value, error.entity_id)
+
+            # Calculate an optimal heating curve when we are in the deadband
+            if target_temperature is not None and -DEADBAND <= error.value <= DEADBAND:
+                self._heating_curve.autotune(
+                    setpoint=self.requested_setpoint,
+                    target_temperature=target_temperature,
+                    outside_temperature=outside_temperature
+                )
+
+            # Update our PID controller if we have valid values
+            if self._coordinator.boiler_temperature_filtered is not None and self._heating_curve.value is not None:
+                self._pid.update(error, self._heating_curve.value, self._coordinator.boiler_temperature_filtered)
+
+        elif error.value != self._pid.last_error:
+            _LOGGER.info("Updating error to %s from %s (Reset: True)", error.value, error.entity_id)
+
+            self._pid.update_reset(error=error, heating_curve_value=self._heating_curve.value)
+            self._calculated_setpoint = None
+            self._pwm.reset()
+
+    async def async_control_heating_loop(
+            self,
+            error: Error,
+            timings: LoopTimings,
+            set_heater_state: Callable[[DeviceState], Awaitable[None]],
+            control_areas: Optional[Callable[[], Awaitable[None]]] = None,
+            climate: Optional[SatClimate] = None,
+    ) -> None:
+        """Run the stages of a single iteration of the heating control, in order."""
+        # Control the heating through the coordinator
+        with timings.stage(STAGE_COORDINATOR):
+            await self._coordinator.async_control_heating_loop(climate=climate, pwm_state=self._pwm.state)
+
+        with timings.stage(STAGE_SETPOINT_FILTER):
+            if self._calculated_setpoint is None:
+                # Default to the requested setpoint
+                self._calculated_setpoint = self.requested_setpoint
+            else:
+                # Apply low filter on the requested setpoint
+                self._calculated_setpoint = round(self._alpha * self.requested_setpoint + (1 - self._alpha) * self._calculated_setpoint, 1)
+
+        # Check for overshoot
+        if self._coordinator.device_status == BoilerStatus.OVERSHOOT_HANDLING:
+            self._log.throttled("overshoot_handling", 900, logging.INFO, "Overshoot Handling detected, enabling Pulse Width Modulation.")
+            self._pwm.enable()
+
+        # Pulse Width Modulation
+        with timings.stage(STAGE_PWM):
+            if not self.pulse_width_modulation_enabled:
+                self._pwm.reset()
+            else:
+                await self._pwm.update(flame=self._coordinator.flame, boiler=self._coordinator.boiler, requested_setpoint=self._calculated_setpoint)
+
+        # Set the control setpoint to make sure we always stay in control
+        with timings.stage(STAGE_CONTROL_SETPOINT):
+            await self._async_control_setpoint(self._pwm.state)
+
+        # Set the relative modulation value, if supported
+        with timings.stage(STAGE_RELATIVE_MODULATION):
+            await self._async_control_relative_modulation()
+
+        # Control the integral (if exceeded the time limit)
+        with timings.stage(STAGE_INTEGRAL):
+            if self._heating_curve.value is not None:
+                self._pid.update_integral(error, self._heating_curve.value)
+
+        # Control our areas
+        if control_areas is not None:
+            with timings.stage(STAGE_AREAS):
+                await control_areas()
+
+        # Control our dynamic minimum setpoint (version 1)
+        with timings.stage(STAGE_MINIMUM_SETPOINT):
+            if not self._coordinator.hot_water_active and self._coordinator.flame_active:
+                # Calculate the base return temperature
+                if self._coordinator.device_status == BoilerStatus.HEATING_UP:
+                    self._minimum_setpoint.warming_up(self._coordinator.boiler)
+
+                # Calculate the dynamic minimum setpoint
+                self._minimum_setpoint.calculate(self._coordinator.boiler, self._pwm.status)
+
+        # If the setpoint is high, turn on the heater
+        with timings.stage(STAGE_HEATER_STATE):
+            await set_heater_state(self.heater_state)
+
+    async def _async_control_setpoint(self, pwm_state: PWMState) -> None:
+        """Control the setpoint of the heating system based on the PWM state."""
+        if not self.pulse_width_modulation_enabled or pwm_state.status == PWMStatus.IDLE:
+            # Normal cycle without PWM
+            self._setpoint = self._calculated_setpoint
+            self._log.changed("setpoint_mode", PWMStatus.IDLE, logging.INFO, "Pulse Width Modulation is disabled or in IDLE state. Running normal heating cycle.")
+            _LOGGER.debug("Calculated setpoint for normal cycle: %.1f°C", self._calculated_setpoint)
+
+            # Some final checks to see if it's even warm
+            if self._setpoint < COLD_SETPOINT:
+                self._setpoint = MINIMUM_SETPOINT
+                _LOGGER.debug("Calculated setpoint is too cold. Setting setpoint to minimum: %.1f°C", MINIMUM_SETPOINT)
+        else:
+            # PWM is enabled and actively controlling the cycle
+            self._log.changed("setpoint_mode", pwm_state.status, logging.INFO, "Running PWM cycle with state: %s", pwm_state.status)
+
+            if pwm_state.status == PWMStatus.ON:
+                self._setpoint = self.minimum_setpoint_value
+                _LOGGER.debug("Setting setpoint to minimum: %.1f°C", self._setpoint)
+            else:
+                self._setpoint = MINIMUM_SETPOINT
+                _LOGGER.debug("Setting setpoint to absolute minimum: %.1f°C", MINIMUM_SETPOINT)
+
+        # Apply the setpoint using the coordinator
+        await self._coordinator.async_set_control_setpoint(min(self._setpoint, self._coordinator.maximum_setpoint))
+        self._log.changed("setpoint", self._setpoint, logging.INFO, "Control setpoint has been updated to: %.1f°C", self._setpoint)
+
+    async def _async_control_relative_modulation(self) -> None:
+        """Control the relative modulation value based on the conditions."""
+        if not self._coordinator.supports_relative_modulation_management:
+            _LOGGER.debug("Relative modulation management is not supported. Skipping control.")
+            return
+
+        # Update relative modulation state
+        await self._relative_modulation.update(self.pulse_width_modulation_enabled)
+
+        # Retrieve the relative modulation
+        relative_modulation_value = self.relative_modulation_value
+
+        # Apply some filters based on the manufacturer
+        if isinstance(self._coordinator.manufacturer, Geminox):
+            relative_modulation_value = max(10, relative_modulation_value)
+
+        # Determine if the value needs to be updated
+        if self._coordinator.maximum_relative_modulation_value == relative_modulation_value:
+            _LOGGER.debug("Relative modulation value unchanged (%d%%). No update necessary.", relative_modulation_value)
+            return
+
+        await self._coordinator.async_set_control_max_relative_modulation(relative_modulation_value)
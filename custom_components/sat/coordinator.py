@@ -1,19 +1,26 @@
 from __future__ import annotations
 
 import logging
+import math
 from abc import abstractmethod
-from time import monotonic
-from typing import TYPE_CHECKING, Mapping, Any, Optional, Callable
+from functools import wraps
+from typing import TYPE_CHECKING, Mapping, Any, Optional, Callable, Awaitable, Iterable
 
 from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
-from homeassistant.core import HomeAssistant, callback, HassJob
+from homeassistant.core import HomeAssistant, callback, HassJob, Event, EventStateChangedData, State
 from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .boiler import BoilerTemperatureTracker, BoilerState, STABILIZATION_MARGIN
+from .clock import monotonic, to_monotonic
 from .const import *
 from .flame import Flame, FlameState
-from .helpers import calculate_default_maximum_setpoint, seconds_since
+from .helpers import calculate_default_maximum_setpoint, float_value
+from .history import TimeSeries
+from .ingestion import IngestionBuffer
+from .log import SatLogger
+from .schema import FieldSchema
+from .snapshot import RuntimeSnapshot, snapshot_age
 from .manufacturer import Manufacturer, ManufacturerFactory
 from .manufacturers.geminox import Geminox
 from .manufacturers.ideal import Ideal
@@ -26,32 +33,104 @@ if TYPE_CHECKING:
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
+# Commands are resent after this many seconds, even when nothing changed, so the gateway does not time out
+COMMAND_REFRESH_INTERVAL = 60
+
+# The commands that are deduplicated, mapped to the property with the value reported back by the device
+DEDUPLICATED_COMMANDS: dict[str, Optional[str]] = {
+    "async_set_heater_state": "device_active",
+    "async_set_control_setpoint": "setpoint",
+    "async_set_control_max_setpoint": "maximum_setpoint_value",
+    "async_set_control_hot_water_setpoint": "hot_water_setpoint",
+    "async_set_control_thermostat_setpoint": None,
+    "async_set_control_max_relative_modulation": "maximum_relative_modulation_value",
+}
+
 
 class DeviceState(str, Enum):
     ON = "on"
     OFF = "off"
 
 
+def _deduplicate_command(name: str, method: Callable[[Any, Any], Awaitable[None]]) -> Callable[[Any, Any], Awaitable[None]]:
+    """Wrap a command of a coordinator, so it is skipped when it would not change anything on the device."""
+
+    @wraps(method)
+    async def wrapper(self: SatDataUpdateCoordinator, value: Any) -> None:
+        if self.is_redundant_command(name, value):
+            _LOGGER.debug("Skipping %s(%s), the device already has this value.", name, value)
+            return
+
+        await method(self, value)
+        self._sent_commands[name] = (value, monotonic())
+
+    return wrapper
+
+
+def _reported_value_matches(value: Any, reported: Any) -> bool:
+    if isinstance(value, DeviceState):
+        return (value == DeviceState.ON) == bool(reported)
+
+    try:
+        return math.isclose(float(value), float(reported), abs_tol=0.01)
+    except (TypeError, ValueError):
+        return value == reported
+
+
 class SatData(dict):
     _is_dirty: bool = False
+    _version: int = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._changed_keys: set[str] = set()
+        self._changed_at: dict[str, float] = {}
 
     def __setitem__(self, key, value):
         if self.get(key) != value:
             self._is_dirty = True
+            self._version += 1
+            self._changed_keys.add(key)
+            self._changed_at[key] = monotonic()
 
         super().__setitem__(key, value)
 
-    def update(self, other: dict, **kwargs):
+    def update(self, other: dict, timestamps: Optional[Mapping[str, float]] = None, **kwargs):
+        """Update the values, the timestamps are the monotonic times at which the values were received."""
+        now = monotonic()
+
         for key, value in other.items():
             if self.get(key) != value:
                 self._is_dirty = True
+                self._version += 1
+                self._changed_keys.add(key)
+                self._changed_at[key] = timestamps.get(key, now) if timestamps is not None else now
 
             super().__setitem__(key, value)
 
     def __delitem__(self, key):
         self._is_dirty = True
+        self._version += 1
+        self._changed_keys.add(key)
+        self._changed_at.pop(key, None)
         super().__delitem__(key)
 
+    def changed_at(self, key: str) -> Optional[float]:
+        """Return the monotonic time at which the value of the key was received, if it was received since the start."""
+        return self._changed_at.get(key)
+
+    @property
+    def version(self) -> int:
+        """Return a counter that increases on every change of the data."""
+        return self._version
+
+    def pop_changed_keys(self) -> frozenset[str]:
+        """Return the keys that changed since the previous call."""
+        changed_keys = frozenset(self._changed_keys)
+        self._changed_keys.clear()
+
+        return changed_keys
+
     def reset_dirty(self):
         self._is_dirty = False
 
@@ -94,19 +173,47 @@ class SatDataUpdateCoordinatorFactory:
 
 
 class SatDataUpdateCoordinator(DataUpdateCoordinator):
+    # Maps the properties whose timing matters to the data key they are read from, so the time of their change is known
+    timestamp_keys: Mapping[str, str] = {}
+
+    # The data keys of burner and demand transitions, a change notifies the listeners right away instead of after the coalescing delay
+    priority_keys: frozenset[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Deduplicate the commands every device implements."""
+        super().__init_subclass__(**kwargs)
+
+        for name in DEDUPLICATED_COMMANDS:
+            if name in cls.__dict__:
+                setattr(cls, name, _deduplicate_command(name, cls.__dict__[name]))
+
     def __init__(self, hass: HomeAssistant, config_data: Mapping[str, Any], options: Mapping[str, Any] | None = None) -> None:
         """Initialize."""
         super().__init__(hass, _LOGGER, name=DOMAIN)
         self.data: SatData = SatData()
 
+        # The setters are called on every control loop, so only log the values that changed
+        self._log: SatLogger = SatLogger(_LOGGER)
+
         self._boiler_temperature_cold: Optional[float] = None
-        self._boiler_temperatures: list[tuple[float, float]] = []
+        self._boiler_temperatures: TimeSeries = TimeSeries(MAX_BOILER_TEMPERATURE_AGE)
         self._boiler_temperature_tracker: BoilerTemperatureTracker = BoilerTemperatureTracker()
 
         self._flame: Flame = Flame()
+        self._snapshot_revision: int = 0
+        self._boiler_snapshot: Optional[tuple[tuple[int, int], BoilerState]] = None
+        self._flame_snapshot: Optional[tuple[int, FlameState]] = None
+
         self._device_on_since: Optional[float] = None
+        self._sent_commands: dict[str, tuple[Any, float]] = {}
         self._listeners_unsub: Optional[Callable[[], None]] = None
 
+        # Updates pushed by the device are applied in batches
+        self._ingestion: IngestionBuffer = IngestionBuffer(hass, self.async_set_updated_data, self.ingestion_window)
+
+        # The data keys that changed since the previous notification, None when the listeners are notified for another reason
+        self._notified_keys: Optional[frozenset[str]] = None
+
         self._options: Mapping[str, Any] = options or {}
         self._config_data: Mapping[str, Any] = config_data
 
@@ -117,7 +224,7 @@ class SatDataUpdateCoordinator(DataUpdateCoordinator):
         if config_data.get(CONF_MANUFACTURER) is not None:
             self._manufacturer = ManufacturerFactory.resolve_by_name(config_data.get(CONF_MANUFACTURER))
 
-        self.async_add_listener(lambda: self._flame.update(boiler_state=self.boiler))
+        self.async_add_selective_listener(lambda: self._flame.update(boiler_state=self.boiler, timestamp=self.observed_at("flame_active")), properties=("device_active", "flame_active", "hot_water_active"))
 
     @property
     @abstractmethod
@@ -187,6 +294,22 @@ class SatDataUpdateCoordinator(DataUpdateCoordinator):
 
     @property
     def boiler(self) -> BoilerState:
+        """Return the boiler snapshot, shared by all consumers until the data or the device changes."""
+        version = (self.data.version, self._snapshot_revision)
+        if self._boiler_snapshot is None or self._boiler_snapshot[0] != version:
+            self._boiler_snapshot = (version, self._build_boiler_state())
+
+        return self._boiler_snapshot[1]
+
+    @property
+    def flame(self) -> FlameState:
+        """Return the flame snapshot, shared by all consumers until the flame is updated again."""
+        if self._flame_snapshot is None or self._flame_snapshot[0] != self._flame.revision:
+            self._flame_snapshot = (self._flame.revision, self._build_flame_state())
+
+        return self._flame_snapshot[1]
+
+    def _build_boiler_state(self) -> BoilerState:
         return BoilerState(
             flame_active=self.flame_active,
             hot_water_active=self.hot_water_active,
@@ -201,8 +324,9 @@ class SatDataUpdateCoordinator(DataUpdateCoordinator):
             relative_modulation_level=self.relative_modulation_value,
         )
 
-    @property
-    def flame(self) -> FlameState:
+    def _build_flame_state(self) -> FlameState:
+        statistics = self._flame.statistics
+
         return FlameState(
             is_active=self._flame.is_active,
             is_inactive=self._flame.is_inactive,
@@ -212,10 +336,10 @@ class SatDataUpdateCoordinator(DataUpdateCoordinator):
             average_on_time_seconds=self._flame.average_on_time_seconds,
             last_cycle_duration_seconds=self._flame.last_cycle_duration_seconds,
 
-            sample_count_4h=self._flame.sample_count_4h,
-            cycles_last_hour=self._flame.cycles_last_hour,
-            duty_ratio_last_15m=self._flame.duty_ratio_last_15m,
-            median_on_duration_seconds_4h=self._flame.median_on_duration_seconds_4h,
+            sample_count_4h=statistics.sample_count_4h,
+            cycles_last_hour=statistics.cycles_last_hour,
+            duty_ratio_last_15m=statistics.duty_ratio_last_15m,
+            median_on_duration_seconds_4h=statistics.median_on_duration_seconds_4h,
         )
 
     @property
@@ -264,24 +388,19 @@ class SatDataUpdateCoordinator(DataUpdateCoordinator):
     @property
     def boiler_temperature_filtered(self) -> Optional[float]:
         # Not able to use if we do not have at least two values
-        if len(self._boiler_temperatures) < 2:
+        if (mean_absolute_difference := self._boiler_temperatures.mean_absolute_difference) is None:
             return self.boiler_temperature
 
         # Some noise filtering on the boiler temperature
-        difference_boiler_temperature_sum = sum(
-            abs(j[1] - i[1]) for i, j in zip(self._boiler_temperatures, self._boiler_temperatures[1:])
-        )
-
-        # Average it and return it
-        return round(difference_boiler_temperature_sum / (len(self._boiler_temperatures) - 1), 2)
+        return round(mean_absolute_difference, 2)
 
     @property
     def boiler_temperature_derivative(self) -> Optional[float]:
-        if len(self._boiler_temperatures) <= 1:
+        if (previous := self._boiler_temperatures.previous) is None:
             return None
 
-        first_time, first_temperature = self._boiler_temperatures[-2]
-        last_time, last_temperature = self._boiler_temperatures[-1]
+        first_time, first_temperature = previous
+        last_time, last_temperature = self._boiler_temperatures.latest
 
         time_delta = last_time - first_time
         if time_delta <= 0:
@@ -423,12 +542,36 @@ class SatDataUpdateCoordinator(DataUpdateCoordinator):
 
     async def async_will_remove_from_hass(self) -> None:
         """Run when an entity is removed from hass."""
-        pass
+        self._ingestion.async_cancel()
+
+        if self._listeners_unsub is not None:
+            self._listeners_unsub()
+            self._listeners_unsub = None
+
+    def to_snapshot(self) -> dict[str, Any]:
+        """Return the runtime state that is worth keeping across a restart."""
+        now = monotonic()
+
+        return {
+            "flame": self._flame.to_snapshot(),
+            "boiler_temperatures": [[snapshot_age(timestamp, now), value] for timestamp, value in self._boiler_temperatures],
+        }
+
+    def restore_snapshot(self, snapshot: RuntimeSnapshot, data: Mapping[str, Any]) -> None:
+        """Restore the runtime state from a snapshot."""
+        if (flame := data.get("flame")) is not None:
+            self._flame.restore_snapshot(snapshot, flame)
+
+        for age, value in data.get("boiler_temperatures", []):
+            self._boiler_temperatures.append(snapshot.restore_timestamp(age), value)
+
+        self._boiler_temperatures.evict(monotonic())
+        self.async_invalidate_snapshots()
 
     async def async_control_heating_loop(self, climate: Optional[SatClimate] = None, pwm_state: Optional[PWMState] = None, _time=None) -> None:
         """Control the heating loop for the device."""
         # Update Flame State
-        self._flame.update(boiler_state=self.boiler, pwm_state=pwm_state)
+        self._flame.update(boiler_state=self.boiler, pwm_state=pwm_state, timestamp=self.observed_at("flame_active"))
 
         # Update Device State
         if not self.device_active:
@@ -454,18 +597,10 @@ class SatDataUpdateCoordinator(DataUpdateCoordinator):
                 boiler_temperature_derivative=self.boiler_temperature_derivative
             )
 
-        # Append current boiler temperature if valid and unique
-        if self.boiler_temperature is not None:
-            current_time = monotonic()
-            if not self._boiler_temperatures or self._boiler_temperatures[-1][0] != current_time:
-                self._boiler_temperatures.append((current_time, self.boiler_temperature))
-
-        # Remove old temperature records beyond the allowed age
-        self._boiler_temperatures = [
-            (timestamp, temperature)
-            for timestamp, temperature in self._boiler_temperatures
-            if seconds_since(timestamp) <= MAX_BOILER_TEMPERATURE_AGE
-        ]
+        # Append current boiler temperature and remove old temperature records beyond the allowed age
+        current_time = monotonic()
+        self._boiler_temperatures.append(self._sample_time("boiler_temperature", self.boiler_temperature, current_time), self.boiler_temperature)
+        self._boiler_temperatures.evict(current_time)
 
         # Update the cold temperature of the boiler
         if boiler_temperature_cold := self._get_latest_boiler_cold_temperature():
@@ -473,29 +608,42 @@ class SatDataUpdateCoordinator(DataUpdateCoordinator):
         elif self._boiler_temperature_cold is not None:
             self._boiler_temperature_cold = min(self.boiler_temperature, self._boiler_temperature_cold)
 
+        # The history and the tracker feed into the device status
+        self.async_invalidate_snapshots()
+
     async def async_set_heater_state(self, state: DeviceState) -> None:
         """Set the state of the device heater."""
-        _LOGGER.info("Set central heater state %s", state)
+        self.async_invalidate_snapshots()
+
+        self._log.changed("heater_state", state, logging.INFO, "Set central heater state %s", state)
 
     async def async_set_control_setpoint(self, value: float) -> None:
         """Control the boiler setpoint temperature for the device."""
+        self.async_invalidate_snapshots()
+
         if self.supports_setpoint_management:
-            _LOGGER.info("Set control boiler setpoint to %d°C", value)
+            self._log.changed("control_setpoint", value, logging.INFO, "Set control boiler setpoint to %d°C", value)
 
     async def async_set_control_hot_water_setpoint(self, value: float) -> None:
         """Control the DHW setpoint temperature for the device."""
+        self.async_invalidate_snapshots()
+
         if self.supports_hot_water_setpoint_management:
-            _LOGGER.info("Set control hot water setpoint to %d°C", value)
+            self._log.changed("hot_water_setpoint", value, logging.INFO, "Set control hot water setpoint to %d°C", value)
 
     async def async_set_control_max_setpoint(self, value: float) -> None:
         """Control the maximum setpoint temperature for the device."""
+        self.async_invalidate_snapshots()
+
         if self.supports_maximum_setpoint_management:
-            _LOGGER.info("Set maximum setpoint to %d°C", value)
+            self._log.changed("maximum_setpoint", value, logging.INFO, "Set maximum setpoint to %d°C", value)
 
     async def async_set_control_max_relative_modulation(self, value: int) -> None:
         """Control the maximum relative modulation for the device."""
+        self.async_invalidate_snapshots()
+
         if self.supports_relative_modulation_management:
-            _LOGGER.info("Set maximum relative modulation to %d%%", value)
+            self._log.changed("maximum_relative_modulation", value, logging.INFO, "Set maximum relative modulation to %d%%", value)
 
     async def async_set_control_thermostat_setpoint(self, value: float) -> None:
         """Control the setpoint temperature for the thermostat."""
@@ -503,18 +651,111 @@ class SatDataUpdateCoordinator(DataUpdateCoordinator):
 
     async def async_notify_listeners(self, _time=None) -> None:
         """Notify listeners of an update asynchronously."""
+        self._async_notify_listeners_now()
+
+    @callback
+    def _async_notify_listeners_now(self) -> None:
         # Make sure we do not spam
         self._async_unsub_refresh()
         self._debounced_refresh.async_cancel()
 
+        if self._listeners_unsub is not None:
+            self._listeners_unsub()
+            self._listeners_unsub = None
+
         # Inform the listeners that we are updated
         self.async_update_listeners()
 
+    def is_redundant_command(self, name: str, value: Any) -> bool:
+        """Return whether the value was sent recently and, when the device reports it, has been applied."""
+        if (sent := self._sent_commands.get(name)) is None:
+            return False
+
+        sent_value, sent_at = sent
+        if sent_value != value or monotonic() - sent_at >= COMMAND_REFRESH_INTERVAL:
+            return False
+
+        if (reported_property := DEDUPLICATED_COMMANDS[name]) is None:
+            return True
+
+        reported = getattr(self, reported_property)
+        return reported is None or _reported_value_matches(value, reported)
+
+    @callback
+    def async_invalidate_snapshots(self) -> None:
+        """Mark the boiler snapshot as outdated, for devices that keep state outside the data."""
+        self._snapshot_revision += 1
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Invalidate the snapshots before the listeners are updated."""
+        self.async_invalidate_snapshots()
+        self._notified_keys = self.data.pop_changed_keys() or None
+
+        try:
+            super().async_update_listeners()
+        finally:
+            self._notified_keys = None
+
+    @callback
+    def async_add_selective_listener(self, update_callback: Callable[[], None], keys: Iterable[str] = (), properties: Iterable[str] = ()) -> Callable[[], None]:
+        """
+        Listen for updates that change one of the given data keys or properties.
+
+        :param update_callback: The callback to call when one of them changed.
+        :param keys: The data keys of interest, the callback is also called when the changed keys are not known.
+        :param properties: The properties of interest, compared to their values at the previous call.
+        :return: A function to remove the listener.
+        """
+        keys = frozenset(keys)
+        properties = tuple(properties)
+        last_values: Optional[tuple] = None
+
+        @callback
+        def listener() -> None:
+            nonlocal last_values
+            changed = bool(keys) and (self._notified_keys is None or not keys.isdisjoint(self._notified_keys))
+
+            if properties:
+                values = tuple(getattr(self, name) for name in properties)
+                changed = changed or values != last_values
+                last_values = values
+
+            if changed:
+                update_callback()
+
+        return self.async_add_listener(listener)
+
+    @property
+    def ingestion_window(self) -> float:
+        """Return the time in seconds pushed updates are accumulated before they are applied, zero waits for a single loop iteration."""
+        return 0
+
+    @callback
+    def async_ingest(self, data: Mapping[str, Any]) -> None:
+        """Add an update pushed by the device to the current batch, a batch with a priority key is applied right away."""
+        self._ingestion.async_add(data)
+
+        if not self.priority_keys.isdisjoint(data):
+            self._ingestion.async_flush()
+
     @callback
-    def async_set_updated_data(self, data: dict) -> None:
+    def async_flush_ingestion(self) -> None:
+        """Apply the pushed updates that are still waiting."""
+        self._ingestion.async_flush()
+
+    @callback
+    def async_set_updated_data(self, data: dict, timestamps: Optional[Mapping[str, float]] = None) -> None:
         """Update the stored data and notify listeners if changes are detected."""
+        priority = self._is_priority_update(data)
+
         # Update the internal data store with new values
-        self.data.update(data)
+        self.data.update(data, timestamps)
+
+        if priority:
+            self.data.reset_dirty()
+            self._async_notify_listeners_now()
+            return
 
         if self.data.is_dirty():
             # Cancel previous scheduled run, if any
@@ -528,21 +769,56 @@ class SatDataUpdateCoordinator(DataUpdateCoordinator):
             # Notify listeners to ensure the entities are updated
             self._listeners_unsub = async_call_later(self.hass, 5, HassJob(self.async_notify_listeners))
 
+    def observed_at(self, name: str) -> Optional[float]:
+        """Return the monotonic time at which the device reported the current value of the property, if it is known."""
+        if (key := self.timestamp_keys.get(name)) is None:
+            return None
+
+        return self.data.changed_at(key)
+
+    def _sample_time(self, name: str, value: float, now: float) -> float:
+        """Return the time of a new sample of the property, a changed value is dated at the time it was reported."""
+        latest = self._boiler_temperatures.latest
+
+        # An unchanged value is still a sample, taken now
+        if latest is not None and latest[1] == value:
+            return now
+
+        timestamp = self.observed_at(name)
+        if timestamp is None or timestamp > now:
+            return now
+
+        # Never date a new sample at or before the latest sample in the boiler history
+        if latest is not None and timestamp <= latest[0]:
+            return now
+
+        return timestamp
+
+    def _is_priority_update(self, data: Mapping[str, Any]) -> bool:
+        """Return whether the update changes one of the priority keys."""
+        return any(key in data and self.data.get(key) != data[key] for key in self.priority_keys)
+
     def _get_latest_boiler_cold_temperature(self) -> Optional[float]:
         """Get the latest boiler cold temperature based on recent boiler temperatures."""
-        max_temperature = None
+        cutoffs = [timestamp for timestamp in (self._device_on_since, self._flame.on_since) if timestamp is not None]
 
-        for timestamp, temperature in self._boiler_temperatures:
-            is_before_device_on = self._device_on_since is None or timestamp < self._device_on_since
-            is_before_flame_on = self._flame.on_since is None or timestamp < self._flame.on_since
+        # Highest temperature measured before the device or the flame turned on
+        return self._boiler_temperatures.maximum_before(min(cutoffs) if cutoffs else None)
 
-            if is_before_device_on and is_before_flame_on:
-                max_temperature = max(max_temperature, temperature) if max_temperature is not None else temperature
 
-        return max_temperature
+class SatEntityCoordinator(DataUpdateCoordinator):
+    # Decodes and validates the entity states that are read as numbers
+    schema: FieldSchema = FieldSchema([])
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        # Caches of the entity states and their parsed values, only used while the state changes are tracked
+        self._entity_states: dict[str, Optional[str]] = {}
+        self._entity_values: dict[str, Optional[float]] = {}
+        self._entity_changed_at: dict[str, Optional[float]] = {}
+        self._entity_cache_enabled: bool = False
 
-class SatEntityCoordinator(DataUpdateCoordinator):
     def get(self, domain: str, key: str) -> Optional[Any]:
         """Get the value for the given `key` from the boiler data.
 
@@ -554,12 +830,80 @@ class SatEntityCoordinator(DataUpdateCoordinator):
         if entity_id is None:
             return None
 
-        state = self.hass.states.get(self._get_entity_id(domain, key))
+        if not self._entity_cache_enabled:
+            return self._get_state_value(self.hass.states.get(entity_id))
+
+        if entity_id not in self._entity_states:
+            self._entity_states[entity_id] = self._get_state_value(self.hass.states.get(entity_id))
+
+        return self._entity_states[entity_id]
+
+    def get_float(self, domain: str, key: str) -> Optional[float]:
+        """Get the value for the given `key` from the boiler data as a float, parsed once per state change."""
+        entity_id = self._get_entity_id(domain, key)
+        if entity_id is None:
+            return None
+
+        if not self._entity_cache_enabled:
+            return self._decode_float(key, self.get(domain, key))
+
+        if entity_id not in self._entity_values:
+            self._entity_values[entity_id] = self._decode_float(key, self.get(domain, key))
+
+        return self._entity_values[entity_id]
+
+    def get_changed_at(self, domain: str, key: str) -> Optional[float]:
+        """Return the monotonic time at which the state of the entity for the given `key` last changed, converted once per state change."""
+        entity_id = self._get_entity_id(domain, key)
+        if entity_id is None:
+            return None
+
+        if not self._entity_cache_enabled:
+            return self._get_state_changed_at(self.hass.states.get(entity_id))
+
+        if entity_id not in self._entity_changed_at:
+            self._entity_changed_at[entity_id] = self._get_state_changed_at(self.hass.states.get(entity_id))
+
+        return self._entity_changed_at[entity_id]
+
+    @callback
+    def async_enable_entity_cache(self) -> None:
+        """Start caching the entity states, the state changes of all entities must be passed to `async_cache_state_change`."""
+        self.async_clear_entity_cache()
+        self._entity_cache_enabled = True
+
+    @callback
+    def async_clear_entity_cache(self) -> None:
+        self._entity_states.clear()
+        self._entity_values.clear()
+        self._entity_changed_at.clear()
+
+    @callback
+    def async_cache_state_change(self, event: Event[EventStateChangedData]) -> None:
+        """Update the cached state of the entity that changed."""
+        entity_id = event.data["entity_id"]
+
+        self._entity_values.pop(entity_id, None)
+        self._entity_states[entity_id] = self._get_state_value(event.data["new_state"])
+        self._entity_changed_at[entity_id] = self._get_state_changed_at(event.data["new_state"])
+
+    def _decode_float(self, key: str, value: Optional[str]) -> Optional[float]:
+        if key in self.schema:
+            return self.schema.decode_value(key, value)
+
+        return float_value(value)
+
+    @staticmethod
+    def _get_state_value(state: Optional[State]) -> Optional[str]:
         if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
             return None
 
         return state.state
 
+    @staticmethod
+    def _get_state_changed_at(state: Optional[State]) -> Optional[float]:
+        return to_monotonic(state.last_changed) if state is not None else None
+
     @abstractmethod
     def _get_entity_id(self, domain: str, key: str):
         pass
@@ -0,0 +1,29 @@
+"""Diagnostics support for SAT."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CLIMATE, COORDINATOR, DOMAIN
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return the diagnostics of a config entry."""
+    data = hass.data[DOMAIN].get(entry.entry_id, {})
+    climate = data.get(CLIMATE)
+    coordinator = data.get(COORDINATOR)
+
+    return {
+        "config_entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "coordinator": None if coordinator is None else {
+            "device_type": coordinator.device_type,
+            "device_status": coordinator.device_status.name,
+        },
+        "timings": None if climate is None else climate.timings.summary(),
+        "decisions": None if climate is None else climate.flight_recorder.as_dicts(),
+    }
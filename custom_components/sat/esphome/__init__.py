@@ -1,17 +1,19 @@
 from __future__ import annotations, annotations
 
 import logging
-from typing import Mapping, Any
+from typing import Mapping, Any, Callable, Optional
 
 from homeassistant.components import mqtt, binary_sensor, esphome, number, sensor, switch
-from homeassistant.core import HomeAssistant, Event, EventStateChangedData
+from homeassistant.core import HomeAssistant, Event, EventStateChangedData, callback
 from homeassistant.helpers import device_registry, entity_registry
 from homeassistant.helpers.device_registry import DeviceEntry
 from homeassistant.helpers.entity_registry import EntityRegistry, RegistryEntry
 from homeassistant.helpers.event import async_track_state_change_event
 
 from ..coordinator import DeviceState, SatDataUpdateCoordinator, SatEntityCoordinator
-from ..helpers import float_value, int_value
+from ..helpers import int_value
+from ..ingestion import IngestionBuffer
+from ..schema import Field, FieldSchema, percentage, temperature
 
 # Sensors
 DATA_FLAME_ACTIVE = "flame_on"
@@ -36,12 +38,57 @@ DATA_CONTROL_SETPOINT = "t_set"
 DATA_MAX_CH_SETPOINT = "max_t_set"
 DATA_MAX_REL_MOD_LEVEL_SETTING = "max_rel_mod_level"
 
+# All the entities we read from or send commands to
+ENTITY_KEYS: list[tuple[str, str]] = [
+    (binary_sensor.DOMAIN, DATA_FLAME_ACTIVE),
+    (binary_sensor.DOMAIN, DATA_DHW_ACTIVE),
+    (sensor.DOMAIN, DATA_REL_MOD_LEVEL),
+    (sensor.DOMAIN, DATA_SLAVE_MEMBERID),
+    (sensor.DOMAIN, DATA_BOILER_TEMPERATURE),
+    (sensor.DOMAIN, DATA_RETURN_TEMPERATURE),
+    (sensor.DOMAIN, DATA_BOILER_CAPACITY),
+    (sensor.DOMAIN, DATA_REL_MIN_MOD_LEVEL),
+
+    (sensor.DOMAIN, DATA_DHW_SETPOINT_MINIMUM),
+    (sensor.DOMAIN, DATA_DHW_SETPOINT_MAXIMUM),
+
+    (switch.DOMAIN, DATA_DHW_ENABLE),
+    (switch.DOMAIN, DATA_CENTRAL_HEATING),
+
+    (number.DOMAIN, DATA_DHW_SETPOINT),
+    (number.DOMAIN, DATA_CONTROL_SETPOINT),
+    (number.DOMAIN, DATA_MAX_CH_SETPOINT),
+    (number.DOMAIN, DATA_MAX_REL_MOD_LEVEL_SETTING),
+]
+
+# The entities of the properties whose timing matters
+TIMESTAMP_ENTITIES: dict[str, tuple[str, str]] = {
+    "flame_active": (binary_sensor.DOMAIN, DATA_FLAME_ACTIVE),
+    "boiler_temperature": (sensor.DOMAIN, DATA_BOILER_TEMPERATURE),
+}
+
+SCHEMA = FieldSchema([
+    temperature(DATA_BOILER_TEMPERATURE),
+    temperature(DATA_RETURN_TEMPERATURE),
+    temperature(DATA_DHW_SETPOINT_MINIMUM),
+    temperature(DATA_DHW_SETPOINT_MAXIMUM),
+    temperature(DATA_DHW_SETPOINT),
+    temperature(DATA_CONTROL_SETPOINT),
+    temperature(DATA_MAX_CH_SETPOINT),
+    percentage(DATA_REL_MOD_LEVEL),
+    percentage(DATA_REL_MIN_MOD_LEVEL),
+    percentage(DATA_MAX_REL_MOD_LEVEL_SETTING),
+    Field(DATA_BOILER_CAPACITY, float, minimum=0, maximum=255),
+])
+
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
 
 class SatEspHomeCoordinator(SatDataUpdateCoordinator, SatEntityCoordinator):
     """Class to manage to fetch data from the OTGW Gateway using esphome."""
 
+    schema = SCHEMA
+
     def __init__(self, hass: HomeAssistant, device_id: str, config_data: Mapping[str, Any], options: Mapping[str, Any] | None = None) -> None:
         super().__init__(hass, config_data, options)
 
@@ -51,6 +98,15 @@ class SatEspHomeCoordinator(SatDataUpdateCoordinator, SatEntityCoordinator):
         self._entity_registry: EntityRegistry = entity_registry.async_get(hass)
         self._entities: list[RegistryEntry] = entity_registry.async_entries_for_device(self._entity_registry, self._device.id)
 
+        # Resolve the entity ids once, they only change when the entity registry does
+        self._entity_ids: dict[tuple[str, str], str] = self._resolve_entity_ids()
+
+        self._unsub_state_changes: Optional[Callable[[], None]] = None
+
+        # Entities often change together, so their state changes are applied in batches with a single notification
+        self._state_changes: IngestionBuffer = IngestionBuffer(hass, self._async_apply_state_changes)
+        self._unsub_registry_updates: Optional[Callable[[], None]] = None
+
     @property
     def device_id(self) -> str:
         return self._mac_address
@@ -89,47 +145,47 @@ class SatEspHomeCoordinator(SatDataUpdateCoordinator, SatEntityCoordinator):
 
     @property
     def setpoint(self) -> float | None:
-        return float_value(self.get(number.DOMAIN, DATA_CONTROL_SETPOINT))
+        return self.get_float(number.DOMAIN, DATA_CONTROL_SETPOINT)
 
     @property
     def maximum_setpoint_value(self) -> float | None:
-        return float_value(self.get(number.DOMAIN, DATA_MAX_CH_SETPOINT))
+        return self.get_float(number.DOMAIN, DATA_MAX_CH_SETPOINT)
 
     @property
     def hot_water_setpoint(self) -> float | None:
-        return float_value(self.get(number.DOMAIN, DATA_DHW_SETPOINT))
+        return self.get_float(number.DOMAIN, DATA_DHW_SETPOINT)
 
     @property
     def minimum_hot_water_setpoint(self) -> float:
-        return float_value(self.get(sensor.DOMAIN, DATA_DHW_SETPOINT_MINIMUM)) or super().minimum_hot_water_setpoint
+        return self.get_float(sensor.DOMAIN, DATA_DHW_SETPOINT_MINIMUM) or super().minimum_hot_water_setpoint
 
     @property
     def maximum_hot_water_setpoint(self) -> float:
-        return float_value(self.get(sensor.DOMAIN, DATA_DHW_SETPOINT_MAXIMUM)) or super().maximum_hot_water_setpoint
+        return self.get_float(sensor.DOMAIN, DATA_DHW_SETPOINT_MAXIMUM) or super().maximum_hot_water_setpoint
 
     @property
     def boiler_temperature(self) -> float | None:
-        return float_value(self.get(sensor.DOMAIN, DATA_BOILER_TEMPERATURE))
+        return self.get_float(sensor.DOMAIN, DATA_BOILER_TEMPERATURE)
 
     @property
     def return_temperature(self) -> float | None:
-        return float_value(self.get(sensor.DOMAIN, DATA_RETURN_TEMPERATURE))
+        return self.get_float(sensor.DOMAIN, DATA_RETURN_TEMPERATURE)
 
     @property
     def relative_modulation_value(self) -> float | None:
-        return float_value(self.get(sensor.DOMAIN, DATA_REL_MOD_LEVEL))
+        return self.get_float(sensor.DOMAIN, DATA_REL_MOD_LEVEL)
 
     @property
     def boiler_capacity(self) -> float | None:
-        return float_value(self.get(sensor.DOMAIN, DATA_BOILER_CAPACITY))
+        return self.get_float(sensor.DOMAIN, DATA_BOILER_CAPACITY)
 
     @property
     def minimum_relative_modulation_value(self) -> float | None:
-        return float_value(self.get(sensor.DOMAIN, DATA_REL_MIN_MOD_LEVEL))
+        return self.get_float(sensor.DOMAIN, DATA_REL_MIN_MOD_LEVEL)
 
     @property
     def maximum_relative_modulation_value(self) -> float | None:
-        return float_value(self.get(number.DOMAIN, DATA_MAX_REL_MOD_LEVEL_SETTING))
+        return self.get_float(number.DOMAIN, DATA_MAX_REL_MOD_LEVEL_SETTING)
 
     @property
     def member_id(self) -> int | None:
@@ -138,33 +194,37 @@ class SatEspHomeCoordinator(SatDataUpdateCoordinator, SatEntityCoordinator):
     async def async_added_to_hass(self) -> None:
         await mqtt.async_wait_for_mqtt_client(self.hass)
 
-        # Create a list of entities that we track
-        entities = list(filter(lambda entity: entity is not None, [
-            self._get_entity_id(binary_sensor.DOMAIN, DATA_FLAME_ACTIVE),
-            self._get_entity_id(binary_sensor.DOMAIN, DATA_DHW_ACTIVE),
-            self._get_entity_id(sensor.DOMAIN, DATA_REL_MOD_LEVEL),
-            self._get_entity_id(sensor.DOMAIN, DATA_SLAVE_MEMBERID),
-            self._get_entity_id(sensor.DOMAIN, DATA_BOILER_TEMPERATURE),
-            self._get_entity_id(sensor.DOMAIN, DATA_RETURN_TEMPERATURE),
+        # Track those entities so the coordinator can be updated when something changes
+        self._async_track_entities()
 
-            self._get_entity_id(sensor.DOMAIN, DATA_DHW_SETPOINT_MINIMUM),
-            self._get_entity_id(sensor.DOMAIN, DATA_DHW_SETPOINT_MAXIMUM),
+        # Resolve the entity ids again when an entity gets added, removed or renamed
+        self._unsub_registry_updates = self.hass.bus.async_listen(entity_registry.EVENT_ENTITY_REGISTRY_UPDATED, self._async_entity_registry_updated)
 
-            self._get_entity_id(switch.DOMAIN, DATA_DHW_ENABLE),
-            self._get_entity_id(switch.DOMAIN, DATA_CENTRAL_HEATING),
+        await super().async_added_to_hass()
 
-            self._get_entity_id(number.DOMAIN, DATA_DHW_SETPOINT),
-            self._get_entity_id(number.DOMAIN, DATA_CONTROL_SETPOINT),
-            self._get_entity_id(number.DOMAIN, DATA_MAX_REL_MOD_LEVEL_SETTING),
-        ]))
+    async def async_will_remove_from_hass(self) -> None:
+        self._state_changes.async_cancel()
 
-        # Track those entities so the coordinator can be updated when something changes
-        async_track_state_change_event(self.hass, entities, self.async_state_change_event)
+        if self._unsub_state_changes is not None:
+            self._unsub_state_changes()
+            self._unsub_state_changes = None
 
-        await super().async_added_to_hass()
+        if self._unsub_registry_updates is not None:
+            self._unsub_registry_updates()
+            self._unsub_registry_updates = None
+
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def async_state_change_event(self, event: Event[EventStateChangedData]) -> None:
+        self._state_changes.async_add({event.data["entity_id"]: event})
 
-    async def async_state_change_event(self, _event: Event[EventStateChangedData]):
-        await self.async_notify_listeners()
+    @callback
+    def _async_apply_state_changes(self, events: dict[str, Event[EventStateChangedData]], _timestamps: dict[str, float]) -> None:
+        for event in events.values():
+            self.async_cache_state_change(event)
+
+        self.hass.async_create_task(self.async_notify_listeners())
 
     async def async_set_control_setpoint(self, value: float) -> None:
         await self._send_command_value(DATA_CONTROL_SETPOINT, value)
@@ -191,17 +251,51 @@ class SatEspHomeCoordinator(SatDataUpdateCoordinator, SatEntityCoordinator):
 
         await super().async_set_control_max_setpoint(value)
 
-    def _get_entity_id(self, domain: str, key: str):
-        unique_id = f"{self._mac_address.upper()}-{domain}-{key}"
-        _LOGGER.debug(f"Attempting to find the unique_id of {unique_id}")
-        return self._entity_registry.async_get_entity_id(domain, esphome.DOMAIN, unique_id)
+    def observed_at(self, name: str) -> Optional[float]:
+        """Return the time at which the entity behind the property last changed, as reported by the state machine."""
+        if (entity := TIMESTAMP_ENTITIES.get(name)) is None:
+            return None
+
+        return self.get_changed_at(*entity)
+
+    def _get_entity_id(self, domain: str, key: str) -> Optional[str]:
+        return self._entity_ids.get((domain, key))
+
+    def _resolve_entity_ids(self) -> dict[tuple[str, str], str]:
+        """Look up the entity ids of all the entities we use in the entity registry."""
+        entity_ids = {}
+
+        for domain, key in ENTITY_KEYS:
+            unique_id = f"{self._mac_address.upper()}-{domain}-{key}"
+            if (entity_id := self._entity_registry.async_get_entity_id(domain, esphome.DOMAIN, unique_id)) is not None:
+                entity_ids[(domain, key)] = entity_id
+
+        _LOGGER.debug("Resolved %d of %d ESPHome entities.", len(entity_ids), len(ENTITY_KEYS))
+
+        return entity_ids
+
+    @callback
+    def _async_track_entities(self) -> None:
+        if self._unsub_state_changes is not None:
+            self._unsub_state_changes()
+
+        self._unsub_state_changes = async_track_state_change_event(self.hass, list(self._entity_ids.values()), self.async_state_change_event)
+        self.async_enable_entity_cache()
+
+    @callback
+    def _async_entity_registry_updated(self, _event: Event) -> None:
+        if (entity_ids := self._resolve_entity_ids()) == self._entity_ids:
+            return
+
+        self._entity_ids = entity_ids
+        self._async_track_entities()
 
     async def _send_command(self, domain: str, service: str, _key: str, payload: dict):
         """Helper method to send a command to a specified domain and service."""
         if not self._simulation:
             await self.hass.services.async_call(domain, service, payload, blocking=True)
 
-        _LOGGER.debug(f"Sending '{payload}' to {service} in {domain}.")
+        _LOGGER.debug("Sending '%s' to %s in %s.", payload, service, domain)
 
     async def _send_command_state(self, key: str, value: bool):
         """Send a command to turn a switch on or off."""
@@ -95,6 +95,7 @@ class SatFakeCoordinator(SatDataUpdateCoordinator):
 
     async def async_set_boiler_temperature(self, value: float) -> None:
         self._boiler_temperature = value
+        self.async_invalidate_snapshots()
 
     async def async_set_heater_state(self, state: DeviceState) -> None:
         self._device_state = state
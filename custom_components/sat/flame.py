@@ -1,17 +1,18 @@
 from __future__ import annotations
 
 import logging
-from collections import deque
 from dataclasses import dataclass
-from statistics import median
-from time import monotonic
-from typing import Deque, Optional, Tuple, Iterable, TYPE_CHECKING
+from typing import Any, Optional, Iterable, Mapping, TYPE_CHECKING
 
+from .clock import monotonic
 from .const import BoilerStatus, FlameStatus, PWMStatus
+from .rolling import RollingMedian, RollingSum
+from .snapshot import snapshot_age
 
 if TYPE_CHECKING:
     from .pwm import PWMState
     from .boiler import BoilerState
+    from .snapshot import RuntimeSnapshot
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,6 +33,16 @@ class FlameState:
     median_on_duration_seconds_4h: Optional[float]
 
 
+@dataclass(frozen=True, slots=True)
+class FlameStatistics:
+    timestamp: float
+
+    sample_count_4h: int
+    cycles_last_hour: float
+    duty_ratio_last_15m: float
+    median_on_duration_seconds_4h: Optional[float]
+
+
 class Flame:
     """Tracks boiler flame on/off, maintains rolling statistics, and classifies health."""
 
@@ -88,14 +99,20 @@ class Flame:
         self._last_pulse_width_modulation_state: Optional[PWMState] = None
 
         # Rolling windows
+        self._revision: int = 0
         self._last_update_monotonic: Optional[float] = None
-        self._cycle_end_times_window: Deque[float] = deque()
-        self._on_deltas_window: Deque[Tuple[float, float]] = deque()
-        self._on_durations_window: Deque[Tuple[float, float]] = deque()
+        self._statistics: Optional[FlameStatistics] = None
+        self._cycle_end_times_window: RollingSum = RollingSum(self.CYCLES_WINDOW_SECONDS)
+        self._on_deltas_window: RollingSum = RollingSum(self.DUTY_WINDOW_SECONDS)
+        self._on_durations_window: RollingMedian = RollingMedian(self.MEDIAN_WINDOW_SECONDS)
 
         # Health
         self._health_status: str = FlameStatus.INSUFFICIENT_DATA
 
+    @property
+    def revision(self) -> int:
+        return self._revision
+
     @property
     def health_status(self) -> str:
         return self._health_status
@@ -137,51 +154,67 @@ class Flame:
     def last_cycle_duration_seconds(self) -> Optional[float]:
         return self._last_cycle_duration_seconds
 
+    @property
+    def statistics(self) -> FlameStatistics:
+        return self._compute_statistics(monotonic())
+
     @property
     def cycles_last_hour(self) -> float:
-        return self._cycles_per_hour(monotonic())
+        return self.statistics.cycles_last_hour
 
     @property
     def duty_ratio_last_15m(self) -> float:
-        return self._duty_ratio_last_window(monotonic())
+        return self.statistics.duty_ratio_last_15m
 
     @property
     def median_on_duration_seconds_4h(self) -> Optional[float]:
-        median_value, _ = self._median_on_duration(monotonic())
-        return median_value
+        return self.statistics.median_on_duration_seconds_4h
 
     @property
     def sample_count_4h(self) -> int:
-        _, count = self._median_on_duration(monotonic())
-        return count
+        return self.statistics.sample_count_4h
 
-    def update(self, boiler_state: BoilerState, pwm_state: Optional[PWMState] = None) -> None:
+    def update(self, boiler_state: BoilerState, pwm_state: Optional[PWMState] = None, timestamp: Optional[float] = None) -> None:
+        """
+        Update the flame with the latest boiler state.
 
+        :param boiler_state: The latest state of the boiler.
+        :param pwm_state: The latest state of the PWM controller, if any.
+        :param timestamp: The monotonic time at which the device reported the current flame state, transitions are dated back to it.
+        """
         now = monotonic()
+        self._revision += 1
 
         # Initialize the last update time if this is the first update
         if self._last_update_monotonic is None:
             self._last_update_monotonic = now
 
-        # Accumulate duty time since the last tick when the previous flame state was ON
         currently_active = bool(boiler_state.flame_active)
         previously_active = self._is_flame_active_internal()
-        elapsed = max(0.0, now - self._last_update_monotonic)
+
+        # A transition happened when the device reported it, but never before the previous update
+        edge = now
+        if currently_active != previously_active and timestamp is not None:
+            edge = min(now, max(timestamp, self._last_update_monotonic))
+
+        # Accumulate duty time since the last tick when the previous flame state was ON
+        elapsed = max(0.0, edge - self._last_update_monotonic)
 
         # Update internal state tracking
         self._last_boiler_state = boiler_state
         self._last_pulse_width_modulation_state = pwm_state or self._last_pulse_width_modulation_state
 
         if previously_active and elapsed > 0.0:
-            self._on_deltas_window.append((now, elapsed))
+            self._on_deltas_window.add(edge, elapsed)
+            self._statistics = None
 
-        self._prune_duty_window(now)
+        self._on_deltas_window.prune(now)
 
-        # OFF -> ON
+        # OFF -> ON, the time since the edge is counted as ON time by the next update
         if currently_active and not previously_active:
-            self._flame_on_monotonic = now
+            self._flame_on_monotonic = edge
             self._flame_off_monotonic = None
-            self._last_update_monotonic = now
+            self._last_update_monotonic = edge
             self._recompute_health(now)
 
             _LOGGER.debug("Flame transition OFF->ON")
@@ -205,25 +238,27 @@ class Flame:
 
         # ON -> OFF
         if not currently_active and previously_active:
-            duration = (now - self._flame_on_monotonic) if self._flame_on_monotonic is not None else 0.0
+            duration = (edge - self._flame_on_monotonic) if self._flame_on_monotonic is not None else 0.0
 
             self._flame_on_monotonic = None
-            self._flame_off_monotonic = now
+            self._flame_off_monotonic = edge
             self._last_cycle_duration_seconds = duration
 
-            self._prune_cycles_window(now)
-            self._prune_median_window(now)
-            self._cycle_end_times_window.append(now)
-            self._on_durations_window.append((now, duration))
+            self._cycle_end_times_window.prune(now)
+            self._on_durations_window.prune(now)
+            self._cycle_end_times_window.add(edge)
+            self._on_durations_window.add(edge, duration)
+            self._statistics = None
 
             self._has_completed_first_cycle = True
             self._last_update_monotonic = now
 
+            statistics = self._compute_statistics(now)
             _LOGGER.debug(
                 "Flame transition ON->OFF: duration=%.1fs, cycles_last_hour=%.1f, samples_4h=%d",
                 duration,
-                self._cycles_per_hour(now),
-                self.sample_count_4h,
+                statistics.cycles_last_hour,
+                statistics.sample_count_4h,
             )
 
             self._recompute_health(now)
@@ -238,6 +273,39 @@ class Flame:
             self._recompute_health(now)
             return
 
+    def to_snapshot(self) -> dict[str, Any]:
+        """Return the completed cycles and rolling windows, the current flame state is not kept."""
+        now = monotonic()
+
+        return {
+            "average_on_time_seconds": self._average_on_time_seconds,
+            "last_cycle_duration_seconds": self._last_cycle_duration_seconds,
+            "has_completed_first_cycle": self._has_completed_first_cycle,
+            "cycle_ends": [snapshot_age(timestamp, now) for timestamp, _ in self._cycle_end_times_window],
+            "on_deltas": [[snapshot_age(timestamp, now), value] for timestamp, value in self._on_deltas_window],
+            "on_durations": [[snapshot_age(timestamp, now), value] for timestamp, value in self._on_durations_window],
+        }
+
+    def restore_snapshot(self, snapshot: RuntimeSnapshot, data: Mapping[str, Any]) -> None:
+        """Restore the completed cycles and rolling windows, samples that fell out of their window in the meantime are dropped."""
+        self._average_on_time_seconds = data.get("average_on_time_seconds")
+        self._last_cycle_duration_seconds = data.get("last_cycle_duration_seconds")
+        self._has_completed_first_cycle = bool(data.get("has_completed_first_cycle", False))
+
+        for age in data.get("cycle_ends", []):
+            self._cycle_end_times_window.add(snapshot.restore_timestamp(age))
+
+        for age, value in data.get("on_deltas", []):
+            self._on_deltas_window.add(snapshot.restore_timestamp(age), value)
+
+        for age, value in data.get("on_durations", []):
+            self._on_durations_window.add(snapshot.restore_timestamp(age), value)
+
+        self._revision += 1
+        self._statistics = None
+
+        _LOGGER.debug("Restored %d flame cycles from the runtime snapshot.", len(self._on_durations_window))
+
     def _recompute_health(self, now: float) -> None:
         state = self._last_boiler_state
         if state is None:
@@ -247,9 +315,11 @@ class Flame:
         last_on_seconds = self._latest_on_time_seconds if (state.flame_active and self._flame_on_monotonic) else 0.0
         last_off_seconds = (now - self._flame_off_monotonic) if (not state.flame_active and self._flame_off_monotonic) else 0.0
 
-        cycles_per_hour = self._cycles_per_hour(now)
-        duty_ratio = self._duty_ratio_last_window(now)
-        median_on_seconds, sample_count = self._median_on_duration(now)
+        statistics = self._compute_statistics(now)
+        cycles_per_hour = statistics.cycles_last_hour
+        duty_ratio = statistics.duty_ratio_last_15m
+        sample_count = statistics.sample_count_4h
+        median_on_seconds = statistics.median_on_duration_seconds_4h
 
         domestic_hot_water_active = bool(state.hot_water_active)
         heating_demand = bool(state.is_active) or (state.status in self._HEATING_STATUSES)
@@ -327,37 +397,26 @@ class Flame:
 
         self._health_status = FlameStatus.HEALTHY
 
-    def _prune_duty_window(self, now: float) -> None:
-        cutoff = now - self.DUTY_WINDOW_SECONDS
-        while self._on_deltas_window and self._on_deltas_window[0][0] < cutoff:
-            self._on_deltas_window.popleft()
-
-    def _prune_cycles_window(self, now: float) -> None:
-        cutoff = now - self.CYCLES_WINDOW_SECONDS
-        while self._cycle_end_times_window and self._cycle_end_times_window[0] < cutoff:
-            self._cycle_end_times_window.popleft()
-
-    def _prune_median_window(self, now: float) -> None:
-        cutoff = now - self.MEDIAN_WINDOW_SECONDS
-        while self._on_durations_window and self._on_durations_window[0][0] < cutoff:
-            self._on_durations_window.popleft()
-
-    def _duty_ratio_last_window(self, now: float) -> float:
-        self._prune_duty_window(now)
-        on_seconds = sum(delta for _, delta in self._on_deltas_window)
-        return min(1.0, max(0.0, on_seconds / float(self.DUTY_WINDOW_SECONDS)))
-
-    def _cycles_per_hour(self, now: float) -> float:
-        self._prune_cycles_window(now)
-        return float(len(self._cycle_end_times_window))
-
-    def _median_on_duration(self, now: float) -> Tuple[Optional[float], int]:
-        self._prune_median_window(now)
-        if not self._on_durations_window:
-            return None, 0
-
-        durations = [duration for _, duration in self._on_durations_window]
-        return float(median(durations)), len(durations)
+    def _compute_statistics(self, now: float) -> FlameStatistics:
+        """Return the rolling statistics, computed at most once per timestamp."""
+        if self._statistics is not None and self._statistics.timestamp == now:
+            return self._statistics
+
+        self._on_deltas_window.prune(now)
+        self._cycle_end_times_window.prune(now)
+        self._on_durations_window.prune(now)
+
+        median_on_duration = self._on_durations_window.median
+
+        self._statistics = FlameStatistics(
+            timestamp=now,
+            sample_count_4h=len(self._on_durations_window),
+            cycles_last_hour=float(len(self._cycle_end_times_window)),
+            duty_ratio_last_15m=min(1.0, max(0.0, self._on_deltas_window.sum / float(self.DUTY_WINDOW_SECONDS))),
+            median_on_duration_seconds_4h=float(median_on_duration) if median_on_duration is not None else None,
+        )
+
+        return self._statistics
 
     def _is_flame_active_internal(self) -> bool:
         return bool(self._last_boiler_state.flame_active) if self._last_boiler_state else False
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional
+
+from .const import PWMStatus
+
+# The amount of decisions that are kept, a day at the normal control interval of 10 seconds (less when events run
+# the loop more often), at roughly 46 bytes each this is about 400 kB
+DEFAULT_CAPACITY = 24 * 60 * 60 // 10
+
+PWM_STATUSES: tuple[PWMStatus, ...] = tuple(PWMStatus)
+
+# The order of the packed values of a decision
+FLOAT_FIELDS = (
+    "error",
+    "outside_temperature",
+    "flow_temperature",
+    "requested_setpoint",
+    "calculated_setpoint",
+    "setpoint",
+    "relative_modulation",
+    "duty_cycle_on",
+    "duty_cycle_off",
+)
+
+FLAG_FLAME_ACTIVE = 1
+FLAG_HEATER_ON = 2
+
+
+@dataclass(frozen=True, slots=True)
+class ControlDecision:
+    """The inputs and outputs of a single iteration of the control loop."""
+    timestamp: float
+
+    # Inputs
+    error: Optional[float]
+    outside_temperature: Optional[float]
+    flow_temperature: Optional[float]
+    flame_active: bool
+
+    # Outputs
+    requested_setpoint: Optional[float]
+    calculated_setpoint: Optional[float]
+    setpoint: Optional[float]
+    pwm_status: PWMStatus
+    duty_cycle_on: Optional[float]
+    duty_cycle_off: Optional[float]
+    relative_modulation: Optional[float]
+    heater_on: bool
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            **asdict(self),
+            "timestamp": datetime.fromtimestamp(self.timestamp, timezone.utc).isoformat(),
+            "pwm_status": self.pwm_status.value,
+        }
+
+
+class FlightRecorder:
+    """Keeps the latest control decisions in a ring buffer of packed arrays, unknown values are stored as NaN."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity <= 0:
+            raise ValueError("The capacity must be positive.")
+
+        self._capacity: int = capacity
+        self._next: int = 0
+        self._size: int = 0
+
+        self._timestamps: array = array("d", [0.0]) * capacity
+        self._values: array = array("f", [math.nan]) * (capacity * len(FLOAT_FIELDS))
+        self._flags: array = array("B", [0]) * capacity
+        self._pwm_statuses: array = array("B", [0]) * capacity
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[ControlDecision]:
+        """Iterate over the decisions from the oldest to the newest."""
+        start = (self._next - self._size) % self._capacity
+
+        for offset in range(self._size):
+            yield self._unpack((start + offset) % self._capacity)
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def size_in_bytes(self) -> int:
+        return sum(values.itemsize * len(values) for values in (self._timestamps, self._values, self._flags, self._pwm_statuses))
+
+    def record(self, decision: ControlDecision) -> None:
+        """Store a decision, replacing the oldest one when the recorder is full."""
+        index = self._next
+        offset = index * len(FLOAT_FIELDS)
+
+        self._timestamps[index] = decision.timestamp
+
+        for position, field in enumerate(FLOAT_FIELDS):
+            value = getattr(decision, field)
+            self._values[offset + position] = math.nan if value is None else value
+
+        self._flags[index] = (FLAG_FLAME_ACTIVE if decision.flame_active else 0) | (FLAG_HEATER_ON if decision.heater_on else 0)
+        self._pwm_statuses[index] = PWM_STATUSES.index(decision.pwm_status)
+
+        self._next = (index + 1) % self._capacity
+        self._size = min(self._size + 1, self._capacity)
+
+    def as_dicts(self) -> list[dict[str, Any]]:
+        return [decision.as_dict() for decision in self]
+
+    def _unpack(self, index: int) -> ControlDecision:
+        offset = index * len(FLOAT_FIELDS)
+        values = {field: _to_optional(self._values[offset + position]) for position, field in enumerate(FLOAT_FIELDS)}
+
+        return ControlDecision(
+            timestamp=self._timestamps[index],
+            flame_active=bool(self._flags[index] & FLAG_FLAME_ACTIVE),
+            heater_on=bool(self._flags[index] & FLAG_HEATER_ON),
+            pwm_status=PWM_STATUSES[self._pwm_statuses[index]],
+            **values,
+        )
+
+
+def _to_optional(value: float) -> Optional[float]:
+    return None if math.isnan(value) else round(value, 2)
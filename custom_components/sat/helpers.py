@@ -1,11 +1,11 @@
 import math
 from re import sub
-from time import monotonic
 from typing import Optional, Union
 
 from homeassistant.core import State
 from homeassistant.util import dt
 
+from .clock import monotonic, utcnow
 from .const import HEATING_SYSTEM_UNDERFLOOR
 
 
@@ -19,7 +19,7 @@ def seconds_since(start_time: float | None) -> float:
 
 def state_age_seconds(state: State) -> float:
     """Return the age of a HA state in seconds."""
-    return (dt.utcnow() - state.last_updated).total_seconds()
+    return (utcnow() - state.last_updated).total_seconds()
 
 
 def is_state_stale(state: Optional[State], max_age_seconds: float) -> bool:
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import math
+from array import array
+from collections import deque
+from typing import Iterator, Optional
+
+
+class TimeSeries:
+    """A fixed-capacity ring buffer of timestamped values with incrementally maintained window statistics."""
+
+    def __init__(self, max_age: float, capacity: int = 256) -> None:
+        """
+        Initialize the time series.
+
+        :param max_age: The maximum age in seconds of a sample before it is evicted.
+        :param capacity: The maximum amount of samples, the oldest sample is dropped when exceeded.
+        """
+        if capacity < 2:
+            raise ValueError("A time series needs a capacity of at least two samples.")
+
+        self._max_age: float = max_age
+        self._capacity: int = capacity
+
+        self._timestamps: array = array("d", [0.0]) * capacity
+        self._values: array = array("d", [0.0]) * capacity
+
+        # Absolute sequence numbers of the oldest sample and one past the newest sample
+        self._head: int = 0
+        self._tail: int = 0
+
+        # Running sum of the absolute differences between consecutive samples
+        self._difference_sum: float = 0.0
+
+        # Monotonic queues of sequence numbers, their front holds the current extreme
+        self._maximum: deque[int] = deque()
+        self._minimum: deque[int] = deque()
+
+        # Monotonic queue for the maximum of all samples taken before the cutoff
+        self._cutoff: float = math.inf
+        self._maximum_before_cutoff: deque[int] = deque()
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def __iter__(self) -> Iterator[tuple[float, float]]:
+        """Iterate over the samples, from the oldest to the newest."""
+        for sequence in range(self._head, self._tail):
+            yield self._timestamp(sequence), self._value(sequence)
+
+    def clear(self) -> None:
+        """Remove all samples."""
+        self._head = self._tail = 0
+        self._difference_sum = 0.0
+
+        self._maximum.clear()
+        self._minimum.clear()
+        self._maximum_before_cutoff.clear()
+
+    def append(self, timestamp: float, value: float) -> bool:
+        """Add a sample, samples sharing the timestamp of the newest sample are ignored."""
+        if self._tail > self._head and self._timestamp(self._tail - 1) == timestamp:
+            return False
+
+        if len(self) == self._capacity:
+            self._pop()
+
+        if self._tail > self._head:
+            self._difference_sum += abs(value - self._value(self._tail - 1))
+
+        sequence = self._tail
+        self._timestamps[sequence % self._capacity] = timestamp
+        self._values[sequence % self._capacity] = value
+        self._tail += 1
+
+        self._push(self._maximum, sequence, value, True)
+        self._push(self._minimum, sequence, value, False)
+
+        if timestamp < self._cutoff:
+            self._push(self._maximum_before_cutoff, sequence, value, True)
+
+        return True
+
+    def evict(self, now: float) -> None:
+        """Remove all samples that are older than the maximum age."""
+        while self._tail > self._head and now - self._timestamp(self._head) > self._max_age:
+            self._pop()
+
+    def maximum_before(self, cutoff: Optional[float]) -> Optional[float]:
+        """Return the highest value of the samples taken before the cutoff, or of all samples without a cutoff."""
+        cutoff = math.inf if cutoff is None else cutoff
+
+        # Only rebuild when the cutoff moved, while it stays the same the queue is kept up to date
+        if cutoff != self._cutoff:
+            self._cutoff = cutoff
+            self._maximum_before_cutoff.clear()
+
+            for sequence in range(self._head, self._tail):
+                if self._timestamp(sequence) >= cutoff:
+                    break
+
+                self._push(self._maximum_before_cutoff, sequence, self._value(sequence), True)
+
+        if not self._maximum_before_cutoff:
+            return None
+
+        return self._value(self._maximum_before_cutoff[0])
+
+    @property
+    def latest(self) -> Optional[tuple[float, float]]:
+        """Return the newest sample as a (timestamp, value) tuple."""
+        if self._tail == self._head:
+            return None
+
+        return self._timestamp(self._tail - 1), self._value(self._tail - 1)
+
+    @property
+    def previous(self) -> Optional[tuple[float, float]]:
+        """Return the sample before the newest sample as a (timestamp, value) tuple."""
+        if len(self) < 2:
+            return None
+
+        return self._timestamp(self._tail - 2), self._value(self._tail - 2)
+
+    @property
+    def mean_absolute_difference(self) -> Optional[float]:
+        """Return the average absolute difference between consecutive samples."""
+        if len(self) < 2:
+            return None
+
+        return self._difference_sum / (len(self) - 1)
+
+    @property
+    def maximum(self) -> Optional[float]:
+        """Return the highest value within the window."""
+        return self._value(self._maximum[0]) if self._maximum else None
+
+    @property
+    def minimum(self) -> Optional[float]:
+        """Return the lowest value within the window."""
+        return self._value(self._minimum[0]) if self._minimum else None
+
+    def _timestamp(self, sequence: int) -> float:
+        return self._timestamps[sequence % self._capacity]
+
+    def _value(self, sequence: int) -> float:
+        return self._values[sequence % self._capacity]
+
+    def _push(self, queue: deque[int], sequence: int, value: float, maximum: bool) -> None:
+        while queue and (self._value(queue[-1]) <= value if maximum else self._value(queue[-1]) >= value):
+            queue.pop()
+
+        queue.append(sequence)
+
+    def _pop(self) -> None:
+        sequence = self._head
+        self._head += 1
+
+        if len(self) < 2:
+            # Reset to avoid accumulating floating point drift
+            self._difference_sum = 0.0
+        else:
+            self._difference_sum -= abs(self._value(self._head) - self._value(sequence))
+
+        for queue in (self._maximum, self._minimum, self._maximum_before_cutoff):
+            if queue and queue[0] == sequence:
+                queue.popleft()
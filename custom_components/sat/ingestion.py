@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Mapping, Optional
+
+from homeassistant.core import HomeAssistant, HassJob, callback
+from homeassistant.helpers.event import async_call_later
+
+from .clock import monotonic
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IngestionBuffer:
+    """Accumulates the updates pushed by a device and applies them as a single batch, the newest value of a key wins."""
+
+    def __init__(self, hass: HomeAssistant, apply: Callable[[dict[str, Any], dict[str, float]], None], window: float = 0) -> None:
+        """
+        Initialize the ingestion buffer.
+
+        :param hass: The Home Assistant instance.
+        :param apply: Applies a batch of updates and the monotonic times at which they were received, called from the event loop.
+        :param window: The time in seconds updates are accumulated, zero applies them on the next iteration of the event loop.
+        """
+        self._hass: HomeAssistant = hass
+        self._apply: Callable[[dict[str, Any], dict[str, float]], None] = apply
+        self._window: float = window
+
+        self._pending: dict[str, Any] = {}
+        self._timestamps: dict[str, float] = {}
+        self._scheduled: bool = False
+        self._unsub: Optional[Callable[[], None]] = None
+
+        self._updates: int = 0
+        self._batches: int = 0
+
+    @property
+    def updates(self) -> int:
+        """Return the amount of updates that were added."""
+        return self._updates
+
+    @property
+    def batches(self) -> int:
+        """Return the amount of batches that were applied."""
+        return self._batches
+
+    @callback
+    def async_add(self, data: Mapping[str, Any]) -> None:
+        """Add an update to the current batch, scheduling the batch when it is the first one."""
+        now = monotonic()
+
+        self._updates += 1
+        self._pending.update(data)
+        self._timestamps.update(dict.fromkeys(data, now))
+
+        if self._scheduled:
+            return
+
+        self._scheduled = True
+
+        if self._window > 0:
+            self._unsub = async_call_later(self._hass, self._window, HassJob(self.async_flush))
+        else:
+            self._hass.loop.call_soon(self.async_flush)
+
+    def add_threadsafe(self, data: Mapping[str, Any]) -> None:
+        """Add an update from outside the event loop."""
+        self._hass.loop.call_soon_threadsafe(self.async_add, data)
+
+    @callback
+    def async_flush(self, _time=None) -> None:
+        """Apply the current batch right away."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+        if not self._scheduled:
+            return
+
+        self._scheduled = False
+        pending, self._pending = self._pending, {}
+        timestamps, self._timestamps = self._timestamps, {}
+
+        self._batches += 1
+        self._apply(pending, timestamps)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop the current batch."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+        self._pending.clear()
+        self._timestamps.clear()
+        self._scheduled = False
@@ -0,0 +1,72 @@
+"""
+Logging helpers for the control loop, which runs often enough to flood the log with repeated messages.
+
+Every module logs to its own child of the `custom_components.sat` logger, so the level of a subsystem can be set on its
+module logger, for example `custom_components.sat.pwm`, through the `logger` integration.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Optional
+
+from .clock import monotonic
+
+_MISSING = object()
+
+
+class SatLogger:
+    """
+    Wraps a module logger for a single controller, adding messages that are only emitted when a value changes or at
+    a limited rate. Messages are always formatted lazily, so a disabled level costs no formatting.
+    """
+
+    def __init__(self, logger: logging.Logger) -> None:
+        self._logger: logging.Logger = logger
+
+        self._values: dict[str, Any] = {}
+        self._emitted_at: dict[str, float] = {}
+        self._suppressed: dict[str, int] = {}
+
+    @property
+    def logger(self) -> logging.Logger:
+        return self._logger
+
+    def changed(self, key: str, value: Any, level: int, message: str, *args: Any) -> None:
+        """Emit the message when the value differs from the previous value of the key, the first value is always emitted."""
+        if self._values.get(key, _MISSING) == value:
+            return
+
+        self._values[key] = value
+
+        if self._logger.isEnabledFor(level):
+            self._logger.log(level, message, *args, stacklevel=2)
+
+    def throttled(self, key: str, interval: float, level: int, message: str, *args: Any) -> None:
+        """Emit the message at most once per interval in seconds, reporting how many were suppressed in between."""
+        if not self._logger.isEnabledFor(level):
+            return
+
+        now = monotonic()
+        if (emitted_at := self._emitted_at.get(key)) is not None and now - emitted_at < interval:
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            return
+
+        self._emitted_at[key] = now
+
+        if suppressed := self._suppressed.pop(key, 0):
+            message += " (%d similar messages suppressed)"
+            args = (*args, suppressed)
+
+        self._logger.log(level, message, *args, stacklevel=2)
+
+    def forget(self, key: Optional[str] = None) -> None:
+        """Forget the previous value and emission of a key, or of all keys, so the next message is emitted again."""
+        if key is None:
+            self._values.clear()
+            self._emitted_at.clear()
+            self._suppressed.clear()
+            return
+
+        self._values.pop(key, None)
+        self._emitted_at.pop(key, None)
+        self._suppressed.pop(key, None)
@@ -3,9 +3,9 @@ import math
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.storage import Store
-from homeassistant.util import utcnow
 
 from .boiler import BoilerState
+from .clock import utcnow
 from .const import PWMStatus
 from .helpers import clamp, to_int
 from .state import State, update_state
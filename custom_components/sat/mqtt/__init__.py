@@ -1,7 +1,6 @@
-import asyncio
 import logging
 from abc import abstractmethod
-from typing import Mapping, Any
+from typing import Mapping, Any, Optional
 
 from homeassistant.components import mqtt
 from homeassistant.core import HomeAssistant, callback
@@ -10,51 +9,75 @@ from homeassistant.helpers.storage import Store
 from ..const import CONF_MQTT_TOPIC
 from ..coordinator import SatDataUpdateCoordinator
 from ..helpers import snake_case
+from ..schema import FieldSchema
+from .commands import Acknowledgement, MqttCommandQueue
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
 STORAGE_VERSION = 1
 
+# Gateways publish their values in bursts, so the messages are collected for a short moment before they are applied
+INGESTION_WINDOW = 0.1
+
 
 class SatMqttCoordinator(SatDataUpdateCoordinator):
     """Base class to manage fetching data using MQTT."""
 
+    # Decodes the raw payloads into typed values, so the properties do not have to parse them on every read
+    schema: FieldSchema = FieldSchema([])
+
     def __init__(self, hass: HomeAssistant, device_id: str, config_data: Mapping[str, Any], options: Mapping[str, Any] | None = None) -> None:
         super().__init__(hass, config_data, options)
 
         self._device_id: str = device_id
         self._topic: str = config_data.get(CONF_MQTT_TOPIC)
         self._store: Store = Store(hass, STORAGE_VERSION, snake_case(f"{self.__class__.__name__}_{device_id}"))
+        self._commands: MqttCommandQueue = MqttCommandQueue(hass, self._async_publish, lambda: self.data)
+
+        # Maps the topics we receive messages on to the key of their value
+        self._topics: dict[str, str] = {self._get_topic_for_subscription(key): key for key in self.get_tracked_entities()}
 
     @property
     def device_id(self) -> str:
         return self._device_id
 
+    @property
+    def ingestion_window(self) -> float:
+        return INGESTION_WINDOW
+
+    @property
+    def failed_commands(self) -> Mapping[str, str]:
+        """Return the commands the device did not acknowledge after all retries, keyed by the setting they change."""
+        return self._commands.failed
+
     async def async_setup(self):
         await self._load_stored_data()
 
     async def async_added_to_hass(self) -> None:
         await mqtt.async_wait_for_mqtt_client(self.hass)
 
-        for key in self.get_tracked_entities():
-            await mqtt.async_subscribe(
-                self.hass,
-                self._get_topic_for_subscription(key),
-                self._create_message_handler(key)
-            )
+        # A few wildcard subscriptions cover all values of the device, untracked values are dropped by the dispatcher
+        for topic in self._get_wildcard_topics_for_subscription() or self._topics:
+            await mqtt.async_subscribe(self.hass, topic, self._async_message_received)
 
         await self.boot()
 
         await super().async_added_to_hass()
 
     async def async_will_remove_from_hass(self) -> None:
+        # Drop the commands that are still waiting, and apply the messages that are
+        self._commands.async_cancel()
+        self.async_flush_ingestion()
+
         # Save the updated data to persistent storage
         await self._save_data()
 
+        await super().async_will_remove_from_hass()
+
     async def _load_stored_data(self) -> None:
         """Load the data from persistent storage."""
         if stored_data := await self._store.async_load():
-            self.async_set_updated_data({key: value for key, value in stored_data.items() if value not in (None, "")})
+            self.async_set_updated_data(self.schema.decode({key: value for key, value in stored_data.items() if value not in (None, "")}))
 
     async def _save_data(self) -> None:
         """Save the data to persistent storage."""
@@ -70,6 +93,10 @@ class SatMqttCoordinator(SatDataUpdateCoordinator):
         """Method to be overridden in subclasses to provide a specific topic for subscribing."""
         pass
 
+    def _get_wildcard_topics_for_subscription(self) -> list[str]:
+        """Method to be overridden in subclasses to subscribe to all tracked topics with a few wildcard topics."""
+        return []
+
     @abstractmethod
     def _get_topic_for_publishing(self) -> str:
         """Method to be overridden in subclasses to provide a specific topic for publishing."""
@@ -80,26 +107,40 @@ class SatMqttCoordinator(SatDataUpdateCoordinator):
         """Method to be overridden in subclasses to provide specific boot functionality."""
         pass
 
-    def _create_message_handler(self, key: str):
-        """Create a message handler to process incoming MQTT messages."""
-
-        @callback
-        def message_handler(message):
-            """Handle an incoming MQTT message and schedule an update."""
-
-            try:
-                # Process the payload and update the data property
-                self._process_message_payload(key, message.payload)
-            except Exception as e:
-                _LOGGER.error("Failed to process message for key '%s': %s", key, str(e))
+    @callback
+    def _async_message_received(self, message) -> None:
+        """Handle an incoming MQTT message and schedule an update."""
+        if (key := self._topics.get(message.topic)) is None:
+            return
 
-        return message_handler
+        try:
+            # Process the payload and add it to the current batch
+            self._process_message_payload(key, message.payload)
+        except Exception as e:
+            _LOGGER.error("Failed to process message for key '%s': %s", key, str(e))
 
     def _process_message_payload(self, key: str, value):
         """Process and store the payload of a received MQTT message."""
-        self.async_set_updated_data({key: value})
+        self.async_ingest(self.schema.decode({key: value}))
+
+    @callback
+    def async_set_updated_data(self, data: dict, timestamps: Optional[Mapping[str, float]] = None) -> None:
+        super().async_set_updated_data(data, timestamps)
 
-    async def _publish_command(self, payload: str, wait_time: float = 1.0):
+        # Confirm the commands for which the device now reports the requested value
+        self._commands.async_acknowledge(self.data)
+
+    async def _publish_command(self, payload: str, key: Optional[str] = None, acknowledgement: Optional[Acknowledgement] = None):
+        """
+        Queue a command for the MQTT topic.
+
+        :param payload: The command to publish.
+        :param key: The setting the command changes, a queued command for the same setting is replaced.
+        :param acknowledgement: The value the device reports once the command has been applied.
+        """
+        self._commands.async_enqueue(payload, key, acknowledgement)
+
+    async def _async_publish(self, payload: str) -> None:
         """Publish a command to the MQTT topic."""
         topic = self._get_topic_for_publishing()
 
@@ -110,8 +151,5 @@ class SatMqttCoordinator(SatDataUpdateCoordinator):
 
         try:
             await mqtt.async_publish(hass=self.hass, topic=topic, payload=payload, qos=1)
-
-            # Add a small delay to allow processing of the message
-            await asyncio.sleep(wait_time)
         except Exception as error:
             _LOGGER.error("Failed to publish MQTT command. Error: %s", error)
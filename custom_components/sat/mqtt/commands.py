@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Mapping, Optional
+
+from homeassistant.core import HomeAssistant, HassJob, callback
+from homeassistant.helpers.event import async_call_later
+
+from ..clock import monotonic
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+ACKNOWLEDGE_RETRIES = 2
+ACKNOWLEDGE_TIMEOUT = 30
+ACKNOWLEDGE_TOLERANCE = 0.1
+
+
+@dataclass(frozen=True, slots=True)
+class Acknowledgement:
+    """The value a device reports on one of its value topics once a command has been applied."""
+    key: str
+    value: Any
+
+    def matches(self, value: Any) -> bool:
+        try:
+            return math.isclose(float(value), float(self.value), abs_tol=ACKNOWLEDGE_TOLERANCE)
+        except (TypeError, ValueError):
+            return str(value).lower() == str(self.value).lower()
+
+
+@dataclass(frozen=True, slots=True)
+class PendingCommand:
+    payload: str
+    published_at: float
+    acknowledgement: Acknowledgement
+    attempts: int = 1
+
+
+class MqttCommandQueue:
+    """Publishes commands without blocking the caller, coalescing superseded commands and confirming them through the value topics."""
+
+    def __init__(
+            self,
+            hass: HomeAssistant,
+            publish: Callable[[str], Awaitable[None]],
+            data: Callable[[], Mapping[str, Any]],
+            timeout: float = ACKNOWLEDGE_TIMEOUT,
+            retries: int = ACKNOWLEDGE_RETRIES,
+    ) -> None:
+        """
+        Initialize the command queue.
+
+        :param hass: The Home Assistant instance.
+        :param publish: Publishes a single command payload.
+        :param data: Returns the latest values reported by the device.
+        :param timeout: The time in seconds a device has to report the value requested by a command.
+        :param retries: The number of times an unacknowledged command is published again before it is given up.
+        """
+        self._hass: HomeAssistant = hass
+        self._data: Callable[[], Mapping[str, Any]] = data
+        self._publish: Callable[[str], Awaitable[None]] = publish
+        self._timeout: float = timeout
+        self._retries: int = retries
+
+        # Commands waiting to be published with their attempt, keyed so a newer command replaces an older one for the same setting
+        self._queued: dict[str, tuple[str, Optional[Acknowledgement], int]] = {}
+
+        # Published commands waiting for the device to report the expected value
+        self._pending: dict[str, PendingCommand] = {}
+
+        # The payloads of the commands the device never acknowledged, until a new command for the same setting is queued
+        self._failed: dict[str, str] = {}
+
+        self._flush_scheduled: bool = False
+        self._timeout_unsub: Optional[Callable[[], None]] = None
+
+    @property
+    def pending(self) -> Mapping[str, PendingCommand]:
+        """Return the published commands that have not been acknowledged yet."""
+        return self._pending
+
+    @property
+    def failed(self) -> Mapping[str, str]:
+        """Return the payloads of the commands that were not acknowledged after all retries."""
+        return self._failed
+
+    @callback
+    def async_enqueue(self, payload: str, key: Optional[str] = None, acknowledgement: Optional[Acknowledgement] = None) -> None:
+        """Queue a command, it is published together with all other commands queued within the same loop iteration."""
+        key = key or payload
+        self._failed.pop(key, None)
+
+        self._async_queue(key, payload, acknowledgement, 1)
+
+    @callback
+    def _async_queue(self, key: str, payload: str, acknowledgement: Optional[Acknowledgement], attempts: int) -> None:
+        if key in self._queued:
+            _LOGGER.debug("Coalescing MQTT command '%s' into '%s'.", self._queued[key][0], payload)
+
+            # Move it to the end of the queue, so it keeps its order relative to the commands that followed it
+            del self._queued[key]
+
+        self._queued[key] = (payload, acknowledgement, attempts)
+
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._hass.loop.call_soon(self._async_schedule_flush)
+
+    @callback
+    def async_acknowledge(self, data: Mapping[str, Any]) -> None:
+        """Confirm the pending commands for which the device reports the expected value."""
+        for key, command in list(self._pending.items()):
+            if command.acknowledgement.key in data and command.acknowledgement.matches(data[command.acknowledgement.key]):
+                _LOGGER.debug("MQTT command '%s' acknowledged after %.1f seconds.", command.payload, monotonic() - command.published_at)
+                del self._pending[key]
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop all queued, pending and failed commands."""
+        self._queued.clear()
+        self._pending.clear()
+        self._failed.clear()
+
+        if self._timeout_unsub is not None:
+            self._timeout_unsub()
+            self._timeout_unsub = None
+
+    async def async_flush(self) -> None:
+        """Publish all queued commands in order, without waiting for the device in between."""
+        self._flush_scheduled = False
+
+        queued, self._queued = self._queued, {}
+        for key, (payload, acknowledgement, attempts) in queued.items():
+            await self._publish(payload)
+
+            if acknowledgement is not None:
+                self._pending[key] = PendingCommand(payload=payload, published_at=monotonic(), acknowledgement=acknowledgement, attempts=attempts)
+
+        # Devices usually only report changes, so a command for the current value is confirmed right away
+        self.async_acknowledge(self._data())
+
+        if self._pending and self._timeout_unsub is None:
+            self._timeout_unsub = async_call_later(self._hass, self._timeout, HassJob(self._async_check_timeouts))
+
+    @callback
+    def _async_schedule_flush(self) -> None:
+        self._hass.async_create_task(self.async_flush())
+
+    @callback
+    def _async_check_timeouts(self, _time=None) -> None:
+        self._timeout_unsub = None
+        now = monotonic()
+
+        for key, command in list(self._pending.items()):
+            if now - command.published_at < self._timeout:
+                continue
+
+            del self._pending[key]
+
+            # A newer command for the same setting is about to be published
+            if key in self._queued:
+                continue
+
+            if command.attempts <= self._retries:
+                _LOGGER.info("MQTT command '%s' was not acknowledged within %d seconds, publishing it again.", command.payload, self._timeout)
+                self._async_queue(key, command.payload, command.acknowledgement, command.attempts + 1)
+                continue
+
+            _LOGGER.warning("MQTT command '%s' was not acknowledged after %d attempts.", command.payload, command.attempts)
+            self._failed[key] = command.payload
+
+        if self._pending:
+            self._timeout_unsub = async_call_later(self._hass, self._timeout, HassJob(self._async_check_timeouts))
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Optional
+from typing import Any, Mapping, Optional
+
+from homeassistant.core import HomeAssistant
 
 from . import SatMqttCoordinator
+from .commands import Acknowledgement
 from ..coordinator import DeviceState
-from ..helpers import float_value
+from ..schema import Field, FieldSchema, percentage, temperature
 
 DATA_ON = "on"
 DATA_OFF = "off"
@@ -26,12 +29,74 @@ DATA_BOILER_CAPACITY = "nompower"
 DATA_REL_MIN_MOD_LEVEL = "burnminpower"
 DATA_MAX_REL_MOD_LEVEL_SETTING = "burnmaxpower"
 
+# The fields we use, everything else EMS-ESP publishes is ignored
+BOILER_FIELDS: tuple[str, ...] = (
+    DATA_FLAME_ACTIVE,
+    DATA_DHW_SETPOINT,
+    DATA_CONTROL_SETPOINT,
+    DATA_REL_MOD_LEVEL,
+    DATA_BOILER_TEMPERATURE,
+    DATA_RETURN_TEMPERATURE,
+    DATA_DHW_ENABLE,
+    DATA_CENTRAL_HEATING,
+    DATA_BOILER_CAPACITY,
+    DATA_REL_MIN_MOD_LEVEL,
+    DATA_MAX_REL_MOD_LEVEL_SETTING,
+)
+
+# Nested payloads use an object per level, e.g. {"dhw": {"seltemp": 52}}
+BOILER_FIELD_PATHS: dict[str, tuple[str, ...]] = {field: tuple(field.split("/")) for field in BOILER_FIELDS if "/" in field}
+
+SCHEMA = FieldSchema([
+    temperature(DATA_DHW_SETPOINT),
+    temperature(DATA_CONTROL_SETPOINT),
+    temperature(DATA_BOILER_TEMPERATURE),
+    temperature(DATA_RETURN_TEMPERATURE),
+    percentage(DATA_REL_MOD_LEVEL),
+    percentage(DATA_REL_MIN_MOD_LEVEL),
+    percentage(DATA_MAX_REL_MOD_LEVEL_SETTING),
+    Field(DATA_BOILER_CAPACITY, float, minimum=0),
+])
+
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
 
+def project_boiler_data(payload: Mapping[str, Any]) -> dict[str, Any]:
+    """Select the fields we use from a boiler_data payload, in either the flat or the nested format."""
+    projection = {}
+
+    for field in BOILER_FIELDS:
+        if field in payload:
+            projection[field] = payload[field]
+            continue
+
+        if (path := BOILER_FIELD_PATHS.get(field)) is None:
+            continue
+
+        value = payload
+        for part in path:
+            if not isinstance(value, Mapping) or part not in value:
+                break
+
+            value = value[part]
+        else:
+            projection[field] = value
+
+    return projection
+
+
 class SatEmsMqttCoordinator(SatMqttCoordinator):
     """Class to manage to fetch data from the OTGW Gateway using MQTT."""
 
+    schema = SCHEMA
+    priority_keys = frozenset([DATA_FLAME_ACTIVE, DATA_CENTRAL_HEATING, DATA_DHW_ENABLE])
+    timestamp_keys = {"flame_active": DATA_FLAME_ACTIVE, "boiler_temperature": DATA_BOILER_TEMPERATURE}
+
+    def __init__(self, hass: HomeAssistant, device_id: str, config_data: Mapping[str, Any], options: Mapping[str, Any] | None = None) -> None:
+        super().__init__(hass, device_id, config_data, options)
+
+        self._last_boiler_data: Optional[str] = None
+
     @property
     def device_type(self) -> str:
         return "Energy Management System (via mqtt)"
@@ -66,35 +131,35 @@ class SatEmsMqttCoordinator(SatMqttCoordinator):
 
     @property
     def setpoint(self) -> Optional[float]:
-        return float_value(self.data.get(DATA_CONTROL_SETPOINT))
+        return self.data.get(DATA_CONTROL_SETPOINT)
 
     @property
     def hot_water_setpoint(self) -> Optional[float]:
-        return float_value(self.data.get(DATA_DHW_SETPOINT))
+        return self.data.get(DATA_DHW_SETPOINT)
 
     @property
     def boiler_temperature(self) -> Optional[float]:
-        return float_value(self.data.get(DATA_BOILER_TEMPERATURE))
+        return self.data.get(DATA_BOILER_TEMPERATURE)
 
     @property
     def return_temperature(self) -> Optional[float]:
-        return float_value(self.data.get(DATA_RETURN_TEMPERATURE))
+        return self.data.get(DATA_RETURN_TEMPERATURE)
 
     @property
     def relative_modulation_value(self) -> Optional[float]:
-        return float_value(self.data.get(DATA_REL_MOD_LEVEL))
+        return self.data.get(DATA_REL_MOD_LEVEL)
 
     @property
     def boiler_capacity(self) -> Optional[float]:
-        return float_value(self.data.get(DATA_BOILER_CAPACITY))
+        return self.data.get(DATA_BOILER_CAPACITY)
 
     @property
     def minimum_relative_modulation_value(self) -> Optional[float]:
-        return float_value(self.data.get(DATA_REL_MIN_MOD_LEVEL))
+        return self.data.get(DATA_REL_MIN_MOD_LEVEL)
 
     @property
     def maximum_relative_modulation_value(self) -> Optional[float]:
-        return float_value(self.data.get(DATA_MAX_REL_MOD_LEVEL_SETTING))
+        return self.data.get(DATA_MAX_REL_MOD_LEVEL_SETTING)
 
     @property
     def member_id(self) -> Optional[int]:
@@ -106,15 +171,17 @@ class SatEmsMqttCoordinator(SatMqttCoordinator):
         pass
 
     def get_tracked_entities(self) -> list[str]:
-        return [DATA_BOILER_DATA]
+        # Either the single boiler_data payload, or a topic per entity when EMS-ESP publishes them separately
+        return [DATA_BOILER_DATA, *BOILER_FIELDS]
 
     async def async_set_control_setpoint(self, value: float) -> None:
-        await self._publish_command(f'{{"cmd": "selflowtemp", "value": {0 if value == 10 else value}}}')
+        setpoint = 0 if value == 10 else value
+        await self._publish_command(f'{{"cmd": "selflowtemp", "value": {setpoint}}}', "selflowtemp", Acknowledgement(DATA_CONTROL_SETPOINT, setpoint))
 
         await super().async_set_control_setpoint(value)
 
     async def async_set_control_hot_water_setpoint(self, value: float) -> None:
-        await self._publish_command(f'{{"cmd": "dhw/seltemp", "value": {value}}}')
+        await self._publish_command(f'{{"cmd": "dhw/seltemp", "value": {value}}}', "dhw/seltemp", Acknowledgement(DATA_DHW_SETPOINT, value))
 
         await super().async_set_control_hot_water_setpoint(value)
 
@@ -123,28 +190,47 @@ class SatEmsMqttCoordinator(SatMqttCoordinator):
         await super().async_set_control_thermostat_setpoint(value)
 
     async def async_set_heater_state(self, state: DeviceState) -> None:
-        await self._publish_command(f'{{"cmd": "heatingactivated", "value": "{DATA_ON if state == DeviceState.ON else DATA_OFF}"}}')
+        await self._publish_command(f'{{"cmd": "heatingactivated", "value": "{DATA_ON if state == DeviceState.ON else DATA_OFF}"}}', "heatingactivated")
 
         await super().async_set_heater_state(state)
 
     async def async_set_control_max_relative_modulation(self, value: int) -> None:
-        await self._publish_command(f'{{"cmd": "burnmaxpower", "value": {max(value, 20)}}}')
+        await self._publish_command(f'{{"cmd": "burnmaxpower", "value": {max(value, 20)}}}', "burnmaxpower", Acknowledgement(DATA_MAX_REL_MOD_LEVEL_SETTING, max(value, 20)))
 
         await super().async_set_control_max_relative_modulation(value)
 
     async def async_set_control_max_setpoint(self, value: float) -> None:
-        await self._publish_command(f'{{"cmd": "heatingtemp", "value": {value}}}')
+        await self._publish_command(f'{{"cmd": "heatingtemp", "value": {value}}}', "heatingtemp")
 
         await super().async_set_control_max_setpoint(value)
 
     def _get_topic_for_subscription(self, key: str) -> str:
-        return f"{self._topic}/{key}"
+        if key == DATA_BOILER_DATA:
+            return f"{self._topic}/{key}"
+
+        return f"{self._topic}/boiler/{key}"
+
+    def _get_wildcard_topics_for_subscription(self) -> list[str]:
+        # The boiler_data payload and the separate entity topics below the boiler topic, some entities have nested topics
+        return [f"{self._topic}/{DATA_BOILER_DATA}", f"{self._topic}/boiler/#"]
 
     def _get_topic_for_publishing(self) -> str:
         return f"{self._topic}/boiler"
 
     def _process_message_payload(self, key: str, value: str):
+        if key != DATA_BOILER_DATA:
+            super()._process_message_payload(key, value)
+            return
+
+        # EMS-ESP republishes the whole payload frequently, skip decoding it when nothing changed
+        if value == self._last_boiler_data:
+            return
+
         try:
-            self.async_set_updated_data(json.loads(value))
+            payload = json.loads(value)
         except json.JSONDecodeError as error:
             _LOGGER.error("Failed to decode JSON payload: %s. Error: %s", value, error)
+            return
+
+        self._last_boiler_data = value
+        self.async_ingest(self.schema.decode(project_boiler_data(payload)))
@@ -4,11 +4,13 @@ import logging
 from typing import Optional
 
 from . import SatMqttCoordinator
+from .commands import Acknowledgement
 from ..coordinator import DeviceState
 from ..manufacturers.ideal import Ideal
 from ..manufacturers.immergas import Immergas
 from ..manufacturers.intergas import Intergas
 from ..manufacturers.nefit import Nefit
+from ..schema import Field, FieldSchema, percentage, temperature
 
 STATE_ON = "ON"
 
@@ -29,12 +31,32 @@ DATA_MAX_REL_MOD_LEVEL_SETTING = "MaxRelModLevelSetting"
 DATA_DHW_SETPOINT_MINIMUM = "TdhwSetUBTdhwSetLB_value_lb"
 DATA_DHW_SETPOINT_MAXIMUM = "TdhwSetUBTdhwSetLB_value_hb"
 
+SCHEMA = FieldSchema([
+    temperature(DATA_DHW_SETPOINT),
+    temperature(DATA_CONTROL_SETPOINT),
+    temperature(DATA_MAXIMUM_CONTROL_SETPOINT),
+    temperature(DATA_BOILER_TEMPERATURE),
+    temperature(DATA_RETURN_TEMPERATURE),
+    temperature(DATA_DHW_SETPOINT_MINIMUM),
+    temperature(DATA_DHW_SETPOINT_MAXIMUM),
+    percentage(DATA_REL_MOD_LEVEL),
+    percentage(DATA_REL_MIN_MOD_LEVEL),
+    percentage(DATA_REL_MIN_MOD_LEVEL_LEGACY),
+    percentage(DATA_MAX_REL_MOD_LEVEL_SETTING),
+    Field(DATA_BOILER_CAPACITY, float, minimum=0, maximum=255),
+    Field(DATA_SLAVE_MEMBERID, int, minimum=0, maximum=255),
+])
+
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
 
 class SatOpenThermMqttCoordinator(SatMqttCoordinator):
     """Class to manage to fetch data from the OTGW Gateway using mqtt."""
 
+    schema = SCHEMA
+    priority_keys = frozenset([DATA_FLAME_ACTIVE, DATA_CENTRAL_HEATING, DATA_DHW_ENABLE])
+    timestamp_keys = {"flame_active": DATA_FLAME_ACTIVE, "boiler_temperature": DATA_BOILER_TEMPERATURE}
+
     @property
     def device_type(self) -> str:
         return "OpenThermGateway (via mqtt)"
@@ -70,88 +92,88 @@ class SatOpenThermMqttCoordinator(SatMqttCoordinator):
     @property
     def setpoint(self) -> Optional[float]:
         if (setpoint := self.data.get(DATA_CONTROL_SETPOINT)) is not None:
-            return float(setpoint)
+            return setpoint
 
         return None
 
     @property
     def maximum_setpoint_value(self) -> Optional[float]:
         if (setpoint := self.data.get(DATA_MAXIMUM_CONTROL_SETPOINT)) is not None:
-            return float(setpoint)
+            return setpoint
 
         return super().maximum_setpoint_value
 
     @property
     def hot_water_setpoint(self) -> Optional[float]:
         if (setpoint := self.data.get(DATA_DHW_SETPOINT)) is not None:
-            return float(setpoint)
+            return setpoint
 
         return super().hot_water_setpoint
 
     @property
     def minimum_hot_water_setpoint(self) -> float:
         if (setpoint := self.data.get(DATA_DHW_SETPOINT_MINIMUM)) is not None:
-            return float(setpoint)
+            return setpoint
 
         return super().minimum_hot_water_setpoint
 
     @property
     def maximum_hot_water_setpoint(self) -> float:
         if (setpoint := self.data.get(DATA_DHW_SETPOINT_MAXIMUM)) is not None:
-            return float(setpoint)
+            return setpoint
 
         return super().maximum_hot_water_setpoint
 
     @property
     def boiler_temperature(self) -> Optional[float]:
         if (value := self.data.get(DATA_BOILER_TEMPERATURE)) is not None:
-            return float(value)
+            return value
 
         return super().boiler_temperature
 
     @property
     def return_temperature(self) -> Optional[float]:
         if (value := self.data.get(DATA_RETURN_TEMPERATURE)) is not None:
-            return float(value)
+            return value
 
         return super().return_temperature
 
     @property
     def relative_modulation_value(self) -> Optional[float]:
         if (value := self.data.get(DATA_REL_MOD_LEVEL)) is not None:
-            return float(value)
+            return value
 
         return super().relative_modulation_value
 
     @property
     def boiler_capacity(self) -> Optional[float]:
         if (value := self.data.get(DATA_BOILER_CAPACITY)) is not None:
-            return float(value)
+            return value
 
         return super().boiler_capacity
 
     @property
     def minimum_relative_modulation_value(self) -> Optional[float]:
         if (value := self.data.get(DATA_REL_MIN_MOD_LEVEL)) is not None:
-            return float(value)
+            return value
 
         # Legacy
         if (value := self.data.get(DATA_REL_MIN_MOD_LEVEL_LEGACY)) is not None:
-            return float(value)
+            return value
 
         return super().minimum_relative_modulation_value
 
     @property
     def maximum_relative_modulation_value(self) -> Optional[float]:
         if (value := self.data.get(DATA_MAX_REL_MOD_LEVEL_SETTING)) is not None:
-            return float(value)
+            return value
 
         return super().maximum_relative_modulation_value
 
     @property
     def member_id(self) -> Optional[int]:
         if (value := self.data.get(DATA_SLAVE_MEMBERID)) is not None:
-            return int(value)
+            return value
 
         return None
 
@@ -171,6 +193,7 @@ class SatOpenThermMqttCoordinator(SatMqttCoordinator):
             DATA_DHW_ENABLE,
             DATA_DHW_SETPOINT,
             DATA_CONTROL_SETPOINT,
+            DATA_MAXIMUM_CONTROL_SETPOINT,
             DATA_REL_MOD_LEVEL,
             DATA_BOILER_TEMPERATURE,
             DATA_RETURN_TEMPERATURE,
@@ -183,41 +206,44 @@ class SatOpenThermMqttCoordinator(SatMqttCoordinator):
         ]
 
     async def async_set_control_setpoint(self, value: float) -> None:
-        await self._publish_command(f"CS={value}")
+        await self._publish_command(f"CS={value}", "CS", Acknowledgement(DATA_CONTROL_SETPOINT, value))
         await self._publish_command(f"PM=25")
 
         await super().async_set_control_setpoint(value)
 
     async def async_set_control_hot_water_setpoint(self, value: float) -> None:
-        await self._publish_command(f"SW={value}")
+        await self._publish_command(f"SW={value}", "SW", Acknowledgement(DATA_DHW_SETPOINT, value))
 
         await super().async_set_control_hot_water_setpoint(value)
 
     async def async_set_control_thermostat_setpoint(self, value: float) -> None:
-        await self._publish_command(f"TC={value}")
+        await self._publish_command(f"TC={value}", "TC")
 
         await super().async_set_control_thermostat_setpoint(value)
 
     async def async_set_heater_state(self, state: DeviceState) -> None:
-        await self._publish_command(f"CH={1 if state == DeviceState.ON else 0}")
+        await self._publish_command(f"CH={1 if state == DeviceState.ON else 0}", "CH")
 
         await super().async_set_heater_state(state)
 
     async def async_set_control_max_relative_modulation(self, value: int) -> None:
         if isinstance(self.manufacturer, Immergas):
-            await self._publish_command(f"TP=11:12={min(value, 80)}")
+            await self._publish_command(f"TP=11:12={min(value, 80)}", "TP=11:12")
 
-        await self._publish_command(f"MM={value}")
+        await self._publish_command(f"MM={value}", "MM", Acknowledgement(DATA_MAX_REL_MOD_LEVEL_SETTING, value))
 
         await super().async_set_control_max_relative_modulation(value)
 
     async def async_set_control_max_setpoint(self, value: float) -> None:
-        await self._publish_command(f"SH={value}")
+        await self._publish_command(f"SH={value}", "SH", Acknowledgement(DATA_MAXIMUM_CONTROL_SETPOINT, value))
 
         await super().async_set_control_max_setpoint(value)
 
     def _get_topic_for_subscription(self, key: str) -> str:
         return f"{self._topic}/value/{self._device_id}/{key}"
 
+    def _get_wildcard_topics_for_subscription(self) -> list[str]:
+        return [f"{self._topic}/value/{self._device_id}/+"]
+
     def _get_topic_for_publishing(self) -> str:
         return f"{self._topic}/set/{self._device_id}/command"
@@ -1,6 +1,11 @@
 import asyncio
 import logging
-import time
+from datetime import timedelta
+from enum import StrEnum
+from typing import Callable, Optional
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
 
 from .const import OVERSHOOT_PROTECTION_SETPOINT, MINIMUM_SETPOINT, DEADBAND, MAXIMUM_RELATIVE_MODULATION
 from .coordinator import DeviceState, SatDataUpdateCoordinator
@@ -11,11 +16,19 @@ _LOGGER = logging.getLogger(__name__)
 OVERSHOOT_PROTECTION_INITIAL_WAIT = 300  # Five minutes in seconds
 OVERSHOOT_PROTECTION_STABLE_WAIT = 900  # Fifteen minutes in seconds
 OVERSHOOT_PROTECTION_RELATIVE_MODULATION_WAIT = 300  # Five minutes in seconds
-SLEEP_INTERVAL = 15  # Sleep interval in seconds
+SLEEP_INTERVAL = 15  # Interval in seconds at which the heating cycle is kept alive
+
+
+class CalibrationPhase(StrEnum):
+    IDLE = "idle"
+    WAITING_FOR_FLAME = "waiting_for_flame"
+    STABILIZING = "stabilizing"
+    SETTLING_MODULATION = "settling_modulation"
+    DONE = "done"
 
 
 class OvershootProtection:
-    def __init__(self, coordinator: SatDataUpdateCoordinator, heating_system: str):
+    def __init__(self, coordinator: SatDataUpdateCoordinator, heating_system: str, on_progress: Optional[Callable[[CalibrationPhase], None]] = None):
         """Initialize OvershootProtection with a coordinator and heating system configuration."""
         self._alpha: float = 0.5
         self._stable_temperature: float | None = None
@@ -25,66 +38,117 @@ class OvershootProtection:
         if self._setpoint is None:
             raise ValueError(f"Invalid heating system: {heating_system}")
 
+        self._phase: CalibrationPhase = CalibrationPhase.IDLE
+        self._on_progress: Optional[Callable[[CalibrationPhase], None]] = on_progress
+
+        # The condition of the current phase, evaluated on every coordinator update and heating cycle
+        self._check: Optional[Callable[[], None]] = None
+        self._is_ready: bool = False
+
+        # Moving average of the boiler temperature while stabilizing, sampled once per keep-alive
+        self._starting_temperature: float | None = None
+        self._average_temperature: float | None = None
+        self._sample_due: bool = False
+
+    @property
+    def phase(self) -> CalibrationPhase:
+        return self._phase
+
     async def calculate(self) -> float | None:
         """Calculate the overshoot protection value."""
+        unsub = async_track_time_interval(self._coordinator.hass, self._async_keep_alive, timedelta(seconds=SLEEP_INTERVAL))
+
         try:
             _LOGGER.info("Starting overshoot protection calculation")
 
             # Sequentially ensure the system is ready
-            await asyncio.wait_for(self._wait_for_flame(), timeout=OVERSHOOT_PROTECTION_INITIAL_WAIT)
+            await self._async_run_phase(CalibrationPhase.WAITING_FOR_FLAME, lambda: self._coordinator.flame_active, OVERSHOOT_PROTECTION_INITIAL_WAIT)
+            _LOGGER.info("Heating system has started")
 
-            # Wait for a stable temperature
-            await asyncio.wait_for(self._wait_for_stable_temperature(), timeout=OVERSHOOT_PROTECTION_STABLE_WAIT)
+            # Wait for a stable temperature, starting from the temperature at the start of the phase
+            self._sample_due = True
+            await self._async_run_phase(CalibrationPhase.STABILIZING, self._is_temperature_stable, OVERSHOOT_PROTECTION_STABLE_WAIT)
 
             # Wait a bit before calculating the overshoot value, if required
             if self._coordinator.relative_modulation_value > 0:
-                await self._wait_a_moment(OVERSHOOT_PROTECTION_RELATIVE_MODULATION_WAIT)
+                await self._async_run_phase(CalibrationPhase.SETTLING_MODULATION, None, OVERSHOOT_PROTECTION_RELATIVE_MODULATION_WAIT)
+
+            self._set_phase(CalibrationPhase.DONE)
 
             return self._calculate_overshoot_value()
         except asyncio.CancelledError as exception:
-            await self._coordinator.async_set_heater_state(DeviceState.OFF)
-            await self._coordinator.async_set_control_setpoint(MINIMUM_SETPOINT)
+            await self._reset_heater_state()
 
             raise exception
+        finally:
+            unsub()
+            self._check = None
+
+    async def _async_run_phase(self, phase: CalibrationPhase, condition: Optional[Callable[[], bool]], timeout: float) -> None:
+        """Keep the heating cycle going until the condition holds, without a condition the phase lasts for the whole timeout."""
+        self._set_phase(phase)
+        self._is_ready = phase is not CalibrationPhase.WAITING_FOR_FLAME
 
-    async def _wait_for_flame(self) -> None:
-        """Wait until the heating system flame is active."""
-        while not self._coordinator.flame_active:
-            _LOGGER.warning("Waiting for heating system to start")
-            await self._trigger_heating_cycle(is_ready=False)
+        await self._trigger_heating_cycle()
 
-        _LOGGER.info("Heating system has started")
+        if condition is None:
+            await asyncio.sleep(timeout)
+            return
 
-    async def _wait_a_moment(self, wait_time: int) -> None:
-        """Wait until the relative modulation stabilizes."""
+        await asyncio.wait_for(self._async_wait_for(condition), timeout=timeout)
 
-        start_time = time.time()
-        while time.time() - start_time < wait_time:
-            await self._trigger_heating_cycle(True)
-            await asyncio.sleep(SLEEP_INTERVAL)
+    async def _async_wait_for(self, condition: Callable[[], bool]) -> None:
+        """Wait until the condition holds, it is evaluated on every coordinator update instead of polling."""
+        future = self._coordinator.hass.loop.create_future()
 
-    async def _wait_for_stable_temperature(self) -> None:
-        """Wait until the boiler temperature stabilizes, influenced by relative modulation."""
-        while not self._coordinator.boiler_temperature:
+        @callback
+        def check() -> None:
+            if not future.done() and condition():
+                future.set_result(None)
+
+        self._check = check
+        unsub = self._coordinator.async_add_listener(check)
+
+        try:
+            check()
+            await future
+        finally:
+            unsub()
+            self._check = None
+
+    def _is_temperature_stable(self) -> bool:
+        """Feed the latest boiler temperature into the moving average, and return whether it stabilized."""
+        if (current_temperature := self._coordinator.boiler_temperature) is None:
             _LOGGER.warning("Waiting for boiler temperature")
+            return False
+
+        # The deadband is a change per keep-alive interval, a reading in between is not a new sample
+        if not self._sample_due:
+            return False
+
+        self._sample_due = False
 
-        starting_temperature = self._coordinator.boiler_temperature
-        previous_average_temperature = self._coordinator.boiler_temperature
+        if self._starting_temperature is None:
+            self._starting_temperature = self._average_temperature = current_temperature
+            return False
 
-        while True:
-            current_temperature = float(self._coordinator.boiler_temperature)
-            average_temperature, error_value = self._calculate_exponential_moving_average(previous_average_temperature, current_temperature)
+        average_temperature, error_value = self._calculate_exponential_moving_average(self._average_temperature, current_temperature)
+        self._average_temperature = average_temperature
 
-            if current_temperature > starting_temperature and error_value <= DEADBAND:
-                self._stable_temperature = current_temperature
-                _LOGGER.info("Stable temperature reached: %.2f°C", current_temperature)
-                return
+        if current_temperature > self._starting_temperature and error_value <= DEADBAND:
+            self._stable_temperature = current_temperature
+            _LOGGER.info("Stable temperature reached: %.2f°C", current_temperature)
+            return True
 
-            await self._trigger_heating_cycle(is_ready=True)
+        _LOGGER.debug("Temperature: %s°C, Error: %s°C", current_temperature, error_value)
+        return False
 
-            previous_average_temperature = average_temperature
-            _LOGGER.warning("Waiting for a stable temperature")
-            _LOGGER.debug("Temperature: %s°C, Error: %s°C", current_temperature, error_value)
+    def _set_phase(self, phase: CalibrationPhase) -> None:
+        self._phase = phase
+        _LOGGER.debug("Overshoot protection calibration phase: %s", phase)
+
+        if self._on_progress is not None:
+            self._on_progress(phase)
 
     def _calculate_overshoot_value(self) -> float:
         """Calculate and log the overshoot value."""
@@ -99,18 +163,28 @@ class OvershootProtection:
         error_value = abs(current_value - previous_average)
         return average_value, error_value
 
-    async def _trigger_heating_cycle(self, is_ready: bool) -> None:
+    async def _async_keep_alive(self, _time=None) -> None:
+        """Repeat the heating cycle commands, for devices that fall back to their own control without them."""
+        await self._trigger_heating_cycle()
+
+        if self._check is not None:
+            self._sample_due = True
+            self._check()
+
+    async def _trigger_heating_cycle(self) -> None:
         """Trigger a heating cycle with the coordinator."""
         await self._coordinator.async_set_heater_state(DeviceState.ON)
-        await self._coordinator.async_set_control_setpoint(await self._get_setpoint(is_ready))
+        await self._coordinator.async_set_control_setpoint(await self._get_setpoint(self._is_ready))
         await self._coordinator.async_set_control_max_relative_modulation(MAXIMUM_RELATIVE_MODULATION)
 
-        await asyncio.sleep(SLEEP_INTERVAL)
         await self._coordinator.async_control_heating_loop()
 
     async def _get_setpoint(self, is_ready: bool) -> float:
         """Get the setpoint for the heating cycle."""
-        return self._setpoint if not is_ready or self._coordinator.relative_modulation_value > 0 else self._coordinator.boiler_temperature
+        if not is_ready or self._coordinator.relative_modulation_value > 0 or self._coordinator.boiler_temperature is None:
+            return self._setpoint
+
+        return self._coordinator.boiler_temperature
 
     async def _reset_heater_state(self) -> None:
         """Reset the heater state to default settings."""
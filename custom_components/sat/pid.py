@@ -1,13 +1,16 @@
 import logging
-from time import monotonic
-from typing import Optional
+from typing import Any, Mapping, Optional, TYPE_CHECKING
 
 from homeassistant.core import State
 
+from .clock import monotonic
 from .const import *
 from .errors import Error
 from .helpers import seconds_since
 
+if TYPE_CHECKING:
+    from .snapshot import RuntimeSnapshot
+
 _LOGGER = logging.getLogger(__name__)
 
 MAX_BOILER_TEMPERATURE_AGE = 300
@@ -57,6 +60,7 @@ class PID:
         self._derivative_time_weight: float = derivative_time_weight
         self._heating_curve_coefficient: float = heating_curve_coefficient
 
+        self._sample_pending: bool = False
         self._last_interval_updated: float = monotonic()
         self._integral_time_limit: float = max(integral_time_limit, 1)
         self._sample_time_limit: Optional[float] = (max(sample_time_limit, 1) if sample_time_limit is not None else None)
@@ -68,6 +72,7 @@ class PID:
         now = monotonic()
 
         self._time_elapsed: float = 0.0
+        self._sample_pending: bool = False
         self._last_updated: float = now
         self._last_derivative_time: float = now
         self._last_interval_updated: float = now
@@ -90,6 +95,7 @@ class PID:
         :param boiler_temperature: The current boiler temperature.
         """
         time_elapsed = seconds_since(self._last_updated)
+        self._sample_pending = False
 
         # If nothing changed, skip
         if error.value == self._last_error:
@@ -97,6 +103,7 @@ class PID:
 
         # Enforce minimum sample time if configured
         if self._sample_time_limit is not None and time_elapsed < self._sample_time_limit:
+            self._sample_pending = True
             return
 
         # Update integral and derivative based on the previously stored error
@@ -223,6 +230,32 @@ class PID:
         self._last_derivative_time = now
         self._last_interval_updated = now
 
+    def to_snapshot(self) -> dict[str, Any]:
+        """Return the unrounded controller state."""
+        return {
+            "last_error": self._last_error,
+            "previous_error": self._previous_error,
+            "integral": self._integral,
+            "raw_derivative": self._raw_derivative,
+            "last_heating_curve_value": self._last_heating_curve_value,
+            "last_boiler_temperature": self._last_boiler_temperature,
+        }
+
+    def restore_snapshot(self, _snapshot: "RuntimeSnapshot", data: Mapping[str, Any]) -> None:
+        """Restore the PID controller from a runtime snapshot, it takes precedence over the state attributes."""
+        self._last_error = float(data.get("last_error", self._last_error))
+        self._previous_error = float(data.get("previous_error", self._previous_error))
+        self._integral = float(data.get("integral", self._integral))
+        self._raw_derivative = float(data.get("raw_derivative", self._raw_derivative))
+        self._last_heating_curve_value = float(data.get("last_heating_curve_value", self._last_heating_curve_value))
+        self._last_boiler_temperature = data.get("last_boiler_temperature")
+
+        # The timing anchors start "now", like a restore from the state attributes
+        now = monotonic()
+        self._last_updated = now
+        self._last_derivative_time = now
+        self._last_interval_updated = now
+
     def _get_aggression_value(self) -> float:
         if self._version == 1:
             return 73 if self._heating_system == HEATING_SYSTEM_UNDERFLOOR else 99
@@ -250,6 +283,22 @@ class PID:
         """Return the timestamp of the last update to the PID controller."""
         return self._last_updated
 
+    @property
+    def next_sample(self) -> Optional[float]:
+        """Return the monotonic time at which an update skipped by the sample time limit can be applied."""
+        if not self._sample_pending or self._sample_time_limit is None:
+            return None
+
+        return self._last_updated + self._sample_time_limit
+
+    @property
+    def next_integral_update(self) -> Optional[float]:
+        """Return the monotonic time at which the integral time limit is reached, while the integral is enabled."""
+        if not self.integral_enabled:
+            return None
+
+        return self._last_interval_updated + self._integral_time_limit
+
     @property
     def kp(self) -> float | None:
         """Return the value of kp based on the current configuration."""
@@ -1,18 +1,20 @@
 import logging
 import math
 from dataclasses import dataclass
-from time import monotonic
-from typing import Optional, Tuple, TYPE_CHECKING
+from typing import Any, Mapping, Optional, Tuple, TYPE_CHECKING
 
 from homeassistant.core import State
 
+from .clock import monotonic
 from .const import HEATER_STARTUP_TIMEFRAME, MINIMUM_SETPOINT, BoilerStatus, PWMStatus
 from .heating_curve import HeatingCurve
 from .setpoint_adjuster import SetpointAdjuster
+from .snapshot import snapshot_age
 
 if TYPE_CHECKING:
     from .flame import FlameState
     from .boiler import BoilerState
+    from .snapshot import RuntimeSnapshot
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -88,6 +90,20 @@ class PWM:
         if enabled := state.attributes.get("pulse_width_modulation_enabled"):
             self._enabled = bool(enabled)
 
+    def to_snapshot(self) -> dict[str, Any]:
+        """Return the cycle counter, so the maximum amount of cycles per hour is still enforced after a restart."""
+        return {
+            "current_cycle": self._current_cycle,
+            "first_duty_cycle_age": snapshot_age(self._first_duty_cycle_start, monotonic()),
+            "last_boiler_temperature": self._last_boiler_temperature,
+        }
+
+    def restore_snapshot(self, snapshot: "RuntimeSnapshot", data: Mapping[str, Any]) -> None:
+        """Restore the cycle counter from a runtime snapshot."""
+        self._current_cycle = int(data.get("current_cycle", 0))
+        self._first_duty_cycle_start = snapshot.restore_timestamp(data.get("first_duty_cycle_age"))
+        self._last_boiler_temperature = data.get("last_boiler_temperature")
+
     def enable(self) -> None:
         """Enable the PWM control."""
         self._enabled = True
@@ -260,6 +276,20 @@ class PWM:
         _LOGGER.debug("Maximum duty cycle exceeded. Setting on_time: %d seconds, off_time: %d seconds.", on_time, off_time)
         return int(on_time), int(off_time)
 
+    @property
+    def next_transition(self) -> Optional[float]:
+        """Return the monotonic time at which the current phase of the duty cycle ends, if a transition is expected."""
+        if self._duty_cycle is None or self._status == PWMStatus.IDLE:
+            return None
+
+        if self._status == PWMStatus.ON:
+            return self._last_update + self._duty_cycle[0]
+
+        if self._current_cycle >= self._cycles.maximum_count:
+            return None
+
+        return self._last_update + self._duty_cycle[1]
+
     @property
     def enabled(self) -> bool:
         return self._enabled
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from collections import deque
+from heapq import heappop, heappush
+from typing import Deque, Iterator, Optional, Tuple
+
+
+class RollingSum:
+    """Keeps the sum and count of the values added within a sliding time window."""
+
+    def __init__(self, window: float) -> None:
+        self._window: float = window
+        self._sum: float = 0.0
+        self._samples: Deque[Tuple[float, float]] = deque()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        """Iterate over the timestamps and values within the window, from the oldest to the newest."""
+        return iter(self._samples)
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def add(self, timestamp: float, value: float = 1.0) -> None:
+        self._samples.append((timestamp, value))
+        self._sum += value
+
+    def prune(self, now: float) -> None:
+        """Remove the values that were added before the window."""
+        cutoff = now - self._window
+        while self._samples and self._samples[0][0] < cutoff:
+            self._sum -= self._samples.popleft()[1]
+
+        # Reset to avoid accumulating floating point drift
+        if not self._samples:
+            self._sum = 0.0
+
+
+class RollingMedian:
+    """Keeps the median of the values added within a sliding time window, using two heaps with lazy deletion."""
+
+    def __init__(self, window: float) -> None:
+        self._window: float = window
+        self._samples: Deque[Tuple[float, float]] = deque()
+
+        # The lower half is stored negated in a max-heap, the upper half in a min-heap
+        self._lower: list[float] = []
+        self._upper: list[float] = []
+
+        # The amount of valid values per heap, and the values waiting to be removed once they reach the top
+        self._lower_size: int = 0
+        self._upper_size: int = 0
+        self._delayed: dict[float, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        """Iterate over the timestamps and values within the window, from the oldest to the newest."""
+        return iter(self._samples)
+
+    @property
+    def median(self) -> Optional[float]:
+        if not self._samples:
+            return None
+
+        if self._lower_size > self._upper_size:
+            return -self._lower[0]
+
+        return (-self._lower[0] + self._upper[0]) / 2
+
+    def add(self, timestamp: float, value: float) -> None:
+        self._samples.append((timestamp, value))
+
+        if not self._lower or value <= -self._lower[0]:
+            heappush(self._lower, -value)
+            self._lower_size += 1
+        else:
+            heappush(self._upper, value)
+            self._upper_size += 1
+
+        self._rebalance()
+
+    def prune(self, now: float) -> None:
+        """Remove the values that were added before the window."""
+        cutoff = now - self._window
+        if not self._samples or self._samples[0][0] >= cutoff:
+            return
+
+        while self._samples and self._samples[0][0] < cutoff:
+            self._discard(self._samples.popleft()[1])
+
+        # Rebuild when the heaps are mostly made up of values that are waiting to be removed
+        if len(self._lower) + len(self._upper) > 2 * len(self._samples) + 16:
+            self._rebuild()
+
+    def _discard(self, value: float) -> None:
+        self._delayed[value] = self._delayed.get(value, 0) + 1
+
+        if self._lower and value <= -self._lower[0]:
+            self._lower_size -= 1
+        else:
+            self._upper_size -= 1
+
+        self._rebalance()
+
+    def _rebalance(self) -> None:
+        self._clean()
+
+        while self._lower_size > self._upper_size + 1:
+            heappush(self._upper, -heappop(self._lower))
+            self._lower_size -= 1
+            self._upper_size += 1
+            self._clean()
+
+        while self._lower_size < self._upper_size:
+            heappush(self._lower, -heappop(self._upper))
+            self._lower_size += 1
+            self._upper_size -= 1
+            self._clean()
+
+    def _clean(self) -> None:
+        """Pop the values that are waiting to be removed from the top of both heaps."""
+        while self._lower and self._delayed.get(-self._lower[0]):
+            self._forget(-heappop(self._lower))
+
+        while self._upper and self._delayed.get(self._upper[0]):
+            self._forget(heappop(self._upper))
+
+    def _forget(self, value: float) -> None:
+        if self._delayed[value] == 1:
+            del self._delayed[value]
+        else:
+            self._delayed[value] -= 1
+
+    def _rebuild(self) -> None:
+        samples = list(self._samples)
+
+        self._samples.clear()
+        self._lower.clear()
+        self._upper.clear()
+        self._delayed.clear()
+        self._lower_size = self._upper_size = 0
+
+        for timestamp, value in samples:
+            self.add(timestamp, value)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import logging
+from enum import IntEnum
+from typing import Awaitable, Callable, Iterable, Optional
+
+from homeassistant.core import HomeAssistant, HassJob, callback
+from homeassistant.helpers.event import async_call_later
+
+from .clock import monotonic
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SchedulePriority(IntEnum):
+    """The priority of a request to run the control loop, requests with a higher priority run sooner."""
+    NORMAL = 0
+    HIGH = 1
+    IMMEDIATE = 2
+
+
+PRIORITY_DELAYS: dict[SchedulePriority, float] = {
+    SchedulePriority.NORMAL: 10,
+    SchedulePriority.HIGH: 1,
+    SchedulePriority.IMMEDIATE: 0,
+}
+
+
+class ControlLoopScheduler:
+    """Runs the control loop at the earliest moment any event or controller needs it, coalescing all requests into a single pending run."""
+
+    def __init__(self, hass: HomeAssistant, action: Callable[[], Awaitable[None]], minimum_interval: float = 1, maximum_interval: float = 60) -> None:
+        """
+        Initialize the scheduler.
+
+        :param hass: The Home Assistant instance.
+        :param action: The control loop to run.
+        :param minimum_interval: The minimum time in seconds between planned runs.
+        :param maximum_interval: The maximum time in seconds between runs when no controller needs an earlier one.
+        """
+        self._hass: HomeAssistant = hass
+        self._action: Callable[[], Awaitable[None]] = action
+        self._minimum_interval: float = minimum_interval
+        self._maximum_interval: float = maximum_interval
+
+        self._scheduled_at: Optional[float] = None
+        self._unsub: Optional[Callable[[], None]] = None
+        self._job: HassJob = HassJob(self._async_run)
+
+    @property
+    def scheduled_at(self) -> Optional[float]:
+        """Return the monotonic time of the pending run, if any."""
+        return self._scheduled_at
+
+    @callback
+    def async_request(self, priority: SchedulePriority = SchedulePriority.NORMAL) -> None:
+        """Request a run of the control loop, the delay depends on the priority of the request."""
+        if priority == SchedulePriority.IMMEDIATE:
+            self.async_cancel()
+            self._hass.async_create_task(self._async_run())
+            return
+
+        self.async_schedule_at(monotonic() + PRIORITY_DELAYS[priority])
+
+    @callback
+    def async_plan(self, deadlines: Iterable[Optional[float]]) -> None:
+        """Schedule the next run at the earliest of the given deadlines, bounded by the minimum and maximum interval."""
+        now = monotonic()
+        deadline = min((deadline for deadline in deadlines if deadline is not None), default=now + self._maximum_interval)
+
+        self.async_schedule_at(min(max(deadline, now + self._minimum_interval), now + self._maximum_interval))
+
+    @callback
+    def async_schedule_at(self, deadline: float) -> None:
+        """Schedule a run at the given monotonic time, unless an earlier run is already pending."""
+        if self._scheduled_at is not None and self._scheduled_at <= deadline:
+            return
+
+        self.async_cancel()
+
+        self._scheduled_at = deadline
+        self._unsub = async_call_later(self._hass, max(0.0, deadline - monotonic()), self._job)
+
+        _LOGGER.debug("Scheduled the control loop in %.1f seconds.", deadline - monotonic())
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel the pending run, if any."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+        self._scheduled_at = None
+
+    async def _async_run(self, _time=None) -> None:
+        self._unsub = None
+        self._scheduled_at = None
+
+        await self._action()
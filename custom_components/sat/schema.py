@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping, Optional
+
+from .helpers import float_value
+
+_LOGGER = logging.getLogger(__name__)
+
+# The OpenTherm range of a signed fixed point temperature
+MINIMUM_TEMPERATURE = -40
+MAXIMUM_TEMPERATURE = 127
+
+
+@dataclass(frozen=True, slots=True)
+class Field:
+    """Describes how a value reported by a device is decoded, and which values are plausible."""
+    key: str
+    type: type = float
+    scale: float = 1.0
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+
+    def decode(self, value: Any) -> Any:
+        """Decode a raw value, raises a ValueError when it can not be decoded or is out of range."""
+        if value is None or self.type is str:
+            return value
+
+        if (number := float_value(value)) is None:
+            raise ValueError(f"'{value}' is not a number")
+
+        number *= self.scale
+
+        if (self.minimum is not None and number < self.minimum) or (self.maximum is not None and number > self.maximum):
+            raise ValueError(f"{number} is outside of [{self.minimum}, {self.maximum}]")
+
+        return int(number) if self.type is int else number
+
+
+def temperature(key: str) -> Field:
+    return Field(key, float, minimum=MINIMUM_TEMPERATURE, maximum=MAXIMUM_TEMPERATURE)
+
+
+def percentage(key: str) -> Field:
+    return Field(key, float, minimum=0, maximum=100)
+
+
+class FieldSchema:
+    """Decodes the raw values of a backend once when they arrive, so the coordinator only stores typed and plausible values."""
+
+    def __init__(self, fields: Iterable[Field]) -> None:
+        self._fields: dict[str, Field] = {field.key: field for field in fields}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._fields
+
+    def decode(self, data: Mapping[str, Any]) -> dict[str, Any]:
+        """Decode the values of the known keys, invalid values are dropped and unknown keys are kept as they are."""
+        decoded = {}
+
+        for key, value in data.items():
+            if (field := self._fields.get(key)) is None:
+                decoded[key] = value
+                continue
+
+            try:
+                decoded[key] = field.decode(value)
+            except ValueError as error:
+                _LOGGER.debug("Ignoring the value of '%s': %s.", key, error)
+
+        return decoded
+
+    def decode_value(self, key: str, value: Any) -> Any:
+        """Decode a single value, returns None when it is invalid."""
+        if (field := self._fields.get(key)) is None:
+            return value
+
+        try:
+            return field.decode(value)
+        except ValueError as error:
+            _LOGGER.debug("Ignoring the value of '%s': %s.", key, error)
+            return None
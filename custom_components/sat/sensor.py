@@ -2,14 +2,16 @@ from __future__ import annotations
 
 import logging
 import typing
+from typing import Any, Callable, Optional
 
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfPower, UnitOfTemperature, UnitOfVolume
+from homeassistant.const import UnitOfPower, UnitOfTemperature, UnitOfVolume, UnitOfTime, EntityCategory, PERCENTAGE
 from homeassistant.core import HomeAssistant, Event, EventStateChangedData
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.event import async_track_state_change_event
 
+from .clock import monotonic
 from .const import CONF_MODE, MODE_SERIAL, CONF_NAME, DOMAIN, COORDINATOR, CLIMATE, MODE_SIMULATOR, CONF_MINIMUM_CONSUMPTION, CONF_MAXIMUM_CONSUMPTION
 from .coordinator import SatDataUpdateCoordinator
 from .entity import SatEntity, SatClimateEntity
@@ -17,10 +19,12 @@ from .serial import sensor as serial_sensor
 from .simulator import sensor as simulator_sensor
 
 if typing.TYPE_CHECKING:
-    pass
+    from .climate import SatClimate
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
+LATENCY_WRITE_INTERVAL = 300  # Five minutes in seconds
+
 
 async def async_setup_entry(_hass: HomeAssistant, _config_entry: ConfigEntry, _async_add_entities: AddEntitiesCallback):
     """
@@ -43,10 +47,13 @@ async def async_setup_entry(_hass: HomeAssistant, _config_entry: ConfigEntry, _a
 
     _async_add_entities([
         SatFlameSensor(coordinator, _config_entry),
+        SatFlameOnTimeSensor(coordinator, _config_entry),
         SatBoilerSensor(coordinator, _config_entry),
         SatManufacturerSensor(coordinator, _config_entry),
         SatErrorValueSensor(coordinator, _config_entry, climate),
         SatHeatingCurveSensor(coordinator, _config_entry, climate),
+        SatControlLoopLatencySensor(coordinator, _config_entry, climate),
+        *[SatClimateValueSensor(coordinator, _config_entry, climate, key) for key in CLIMATE_SENSOR_INFO],
     ])
 
     if coordinator.supports_relative_modulation_management:
@@ -142,10 +149,30 @@ class SatCurrentConsumptionSensor(SatEntity, SensorEntity):
         return f"{self._config_entry.data.get(CONF_NAME).lower()}-boiler-current-consumption"
 
 
-class SatHeatingCurveSensor(SatClimateEntity, SensorEntity):
+class SatClimateMeasurementSensor(SatClimateEntity, SensorEntity):
+    """A measurement derived from the climate, it is only written when its own value changes."""
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    # The minimum number of seconds between two writes of a changed value
+    _write_interval: float = 0
+
+    def __init__(self, coordinator: SatDataUpdateCoordinator, config_entry: ConfigEntry, climate: SatClimate):
+        super().__init__(coordinator, config_entry, climate)
+
+        self._last_written_at: Optional[float] = None
+        self._last_written_value: Any = None
 
     async def async_added_to_hass(self) -> None:
         async def on_state_change(_event: Event[EventStateChangedData]):
+            if (value := self._written_value) == self._last_written_value:
+                return
+
+            now = monotonic()
+            if self._last_written_at is not None and now - self._last_written_at < self._write_interval:
+                return
+
+            self._last_written_at = now
+            self._last_written_value = value
             self.async_write_ha_state()
 
         self.async_on_remove(
@@ -154,6 +181,19 @@ class SatHeatingCurveSensor(SatClimateEntity, SensorEntity):
             )
         )
 
+    @property
+    def available(self):
+        """Return availability of the sensor."""
+        return self.native_value is not None
+
+    @property
+    def _written_value(self) -> Any:
+        """Return the value that decides whether the state has to be written."""
+        return self.native_value
+
+
+class SatHeatingCurveSensor(SatClimateMeasurementSensor):
+
     @property
     def name(self) -> str:
         return f"Heating Curve {self._config_entry.data.get(CONF_NAME)}"
@@ -168,18 +208,13 @@ class SatHeatingCurveSensor(SatClimateEntity, SensorEntity):
         """Return the unit of measurement."""
         return UnitOfTemperature.CELSIUS
 
-    @property
-    def available(self):
-        """Return availability of the sensor."""
-        return self._climate.extra_state_attributes.get("heating_curve") is not None
-
     @property
     def native_value(self) -> float:
         """Return the state of the device in native units.
 
         In this case, the state represents the current heating curve value.
         """
-        return self._climate.extra_state_attributes.get("heating_curve")
+        return self._climate.heating_curve.value
 
     @property
     def unique_id(self) -> str:
@@ -187,17 +222,7 @@ class SatHeatingCurveSensor(SatClimateEntity, SensorEntity):
         return f"{self._config_entry.data.get(CONF_NAME).lower()}-heating-curve"
 
 
-class SatErrorValueSensor(SatClimateEntity, SensorEntity):
-
-    async def async_added_to_hass(self) -> None:
-        async def on_state_change(_event: Event[EventStateChangedData]):
-            self.async_write_ha_state()
-
-        self.async_on_remove(
-            async_track_state_change_event(
-                self.hass, [self._climate.entity_id], on_state_change
-            )
-        )
+class SatErrorValueSensor(SatClimateMeasurementSensor):
 
     @property
     def name(self) -> str:
@@ -213,18 +238,13 @@ class SatErrorValueSensor(SatClimateEntity, SensorEntity):
         """Return the unit of measurement."""
         return UnitOfTemperature.CELSIUS
 
-    @property
-    def available(self):
-        """Return availability of the sensor."""
-        return self._climate.extra_state_attributes.get("error") is not None
-
     @property
     def native_value(self) -> float:
         """Return the state of the device in native units.
 
         In this case, the state represents the current error value.
         """
-        return self._climate.extra_state_attributes.get("error")
+        return self._climate.max_error.value
 
     @property
     def unique_id(self) -> str:
@@ -232,6 +252,103 @@ class SatErrorValueSensor(SatClimateEntity, SensorEntity):
         return f"{self._config_entry.data.get(CONF_NAME).lower()}-error-value"
 
 
+class SatClimateSensorInfo:
+    def __init__(self, device_class: Optional[str], unit: Optional[str], friendly_name_format: str, value: Callable[[SatClimate], Optional[float]], enabled_by_default: bool = True):
+        self.unit = unit
+        self.value = value
+        self.device_class = device_class
+        self.enabled_by_default = enabled_by_default
+        self.friendly_name_format = friendly_name_format
+
+
+CLIMATE_SENSOR_INFO: dict[str, SatClimateSensorInfo] = {
+    "control-setpoint": SatClimateSensorInfo(SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS, "Control Setpoint {}", lambda climate: climate.setpoint),
+    "requested-setpoint": SatClimateSensorInfo(SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS, "Requested Setpoint {}", lambda climate: climate.requested_setpoint),
+    "minimum-setpoint": SatClimateSensorInfo(SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS, "Minimum Setpoint {}", lambda climate: climate.minimum_setpoint_value),
+    "relative-modulation": SatClimateSensorInfo(None, PERCENTAGE, "Maximum Relative Modulation {}", lambda climate: climate.relative_modulation_value),
+    "duty-cycle": SatClimateSensorInfo(None, PERCENTAGE, "Duty Cycle {}", lambda climate: climate.pwm.last_duty_cycle_percentage),
+    "pid-proportional": SatClimateSensorInfo(None, UnitOfTemperature.CELSIUS, "PID Proportional {}", lambda climate: climate.pid.proportional, False),
+    "pid-integral": SatClimateSensorInfo(None, UnitOfTemperature.CELSIUS, "PID Integral {}", lambda climate: climate.pid.integral, False),
+    "pid-derivative": SatClimateSensorInfo(None, UnitOfTemperature.CELSIUS, "PID Derivative {}", lambda climate: climate.pid.derivative, False),
+}
+
+
+class SatClimateValueSensor(SatClimateMeasurementSensor):
+
+    def __init__(self, coordinator: SatDataUpdateCoordinator, config_entry: ConfigEntry, climate: SatClimate, key: str):
+        super().__init__(coordinator, config_entry, climate)
+
+        self._key = key
+        self._info = CLIMATE_SENSOR_INFO[key]
+        self._attr_entity_registry_enabled_default = self._info.enabled_by_default
+
+    @property
+    def name(self) -> str:
+        return self._info.friendly_name_format.format(self._config_entry.data.get(CONF_NAME))
+
+    @property
+    def device_class(self):
+        """Return the device class."""
+        return self._info.device_class
+
+    @property
+    def native_unit_of_measurement(self):
+        """Return the unit of measurement."""
+        return self._info.unit
+
+    @property
+    def native_value(self) -> Optional[float]:
+        return self._info.value(self._climate)
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique ID to use for this entity."""
+        return f"{self._config_entry.data.get(CONF_NAME).lower()}-{self._key}"
+
+
+class SatControlLoopLatencySensor(SatClimateMeasurementSensor):
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _unrecorded_attributes = frozenset({"stages"})
+    _write_interval = LATENCY_WRITE_INTERVAL
+
+    @property
+    def name(self) -> str:
+        return f"Control Loop Latency {self._config_entry.data.get(CONF_NAME)}"
+
+    @property
+    def device_class(self):
+        """Return the device class."""
+        return SensorDeviceClass.DURATION
+
+    @property
+    def native_unit_of_measurement(self):
+        """Return the unit of measurement."""
+        return UnitOfTime.MILLISECONDS
+
+    @property
+    def native_value(self) -> float:
+        """Return the state of the device in native units.
+
+        In this case, the state represents the 95th percentile of the duration of the control loop.
+        """
+        return self._climate.timings.loop.summary()["p95"]
+
+    @property
+    def extra_state_attributes(self):
+        """Return the p50, p95 and maximum duration of every stage of the control loop."""
+        return {"stages": self._climate.timings.summary()}
+
+    @property
+    def _written_value(self) -> Any:
+        # The p95 of the loop is a coarse bucket bound, so compare the p95 of the stages as well to keep them up to date
+        return self._climate.timings.percentiles(95)
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique ID to use for this entity."""
+        return f"{self._config_entry.data.get(CONF_NAME).lower()}-control-loop-latency"
+
+
 class SatManufacturerSensor(SatEntity, SensorEntity):
     @property
     def name(self) -> str:
@@ -269,6 +386,36 @@ class SatFlameSensor(SatEntity, SensorEntity):
         return f"{self._config_entry.data.get(CONF_NAME).lower()}-flame-status"
 
 
+class SatFlameOnTimeSensor(SatEntity, SensorEntity):
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def name(self) -> str:
+        return "Average Flame On Time"
+
+    @property
+    def device_class(self):
+        """Return the device class."""
+        return SensorDeviceClass.DURATION
+
+    @property
+    def native_unit_of_measurement(self):
+        """Return the unit of measurement."""
+        return UnitOfTime.SECONDS
+
+    @property
+    def native_value(self) -> Optional[float]:
+        return self._coordinator.flame.average_on_time_seconds
+
+    @property
+    def available(self) -> bool:
+        return self._coordinator.flame.average_on_time_seconds is not None
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._config_entry.data.get(CONF_NAME).lower()}-flame-on-time"
+
+
 class SatBoilerSensor(SatEntity, SensorEntity):
     @property
     def name(self) -> str:
@@ -11,6 +11,7 @@ from pyotgw.vars import *
 from serial import SerialException
 
 from ..coordinator import DeviceState, SatDataUpdateCoordinator
+from ..schema import Field, FieldSchema, percentage, temperature
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
@@ -22,6 +23,23 @@ TRANSLATE_SOURCE = {
 }
 
 
+SCHEMA = FieldSchema([
+    temperature(DATA_CONTROL_SETPOINT),
+    temperature(DATA_DHW_SETPOINT),
+    temperature(DATA_CH_WATER_TEMP),
+    temperature(DATA_RETURN_WATER_TEMP),
+    temperature(DATA_SLAVE_DHW_MIN_SETP),
+    temperature(DATA_SLAVE_DHW_MAX_SETP),
+    percentage(DATA_REL_MOD_LEVEL),
+    percentage(DATA_SLAVE_MIN_MOD_LEVEL),
+    percentage(DATA_SLAVE_MAX_RELATIVE_MOD),
+    Field(DATA_SLAVE_MAX_CAPACITY, float, minimum=0, maximum=255),
+    Field(DATA_SLAVE_MEMBERID, int, minimum=0, maximum=255),
+])
+
+BOILER_PRIORITY_KEYS = (DATA_SLAVE_FLAME_ON, DATA_MASTER_CH_ENABLED, DATA_SLAVE_DHW_ACTIVE)
+
+
 class SatSerialCoordinator(SatDataUpdateCoordinator):
     """Class to manage to fetch data from the OTGW Gateway using pyotgw."""
 
@@ -31,11 +49,17 @@ class SatSerialCoordinator(SatDataUpdateCoordinator):
         self.async_set_updated_data(DEFAULT_STATUS)
 
         self._port: str = port
-        self._hass_loop = hass.loop
         self._api: OpenThermGateway = OpenThermGateway()
+        self._boiler_values: dict[str, Any] = {}
 
         async def _publish(data: dict) -> None:
-            self._hass_loop.call_soon_threadsafe(self.async_set_updated_data, data)
+            # Decode the boiler values here, so the event loop only receives typed values
+            if BOILER in data:
+                # The gateway pushes the whole boiler status, so a rejected value keeps its last valid value
+                self._boiler_values = {**self._boiler_values, **SCHEMA.decode(data[BOILER])}
+                data = {**data, BOILER: self._boiler_values}
+
+            self._ingestion.add_threadsafe(data)
 
         self._publish_callback = _publish
         self._api.subscribe(self._publish_callback)
@@ -75,77 +99,77 @@ class SatSerialCoordinator(SatDataUpdateCoordinator):
     @property
     def setpoint(self) -> Optional[float]:
         if (setpoint := self.get(DATA_CONTROL_SETPOINT)) is not None:
-            return float(setpoint)
+            return setpoint
 
         return None
 
     @property
     def hot_water_setpoint(self) -> Optional[float]:
         if (setpoint := self.get(DATA_DHW_SETPOINT)) is not None:
-            return float(setpoint)
+            return setpoint
 
         return super().hot_water_setpoint
 
     @property
     def boiler_temperature(self) -> Optional[float]:
         if (value := self.get(DATA_CH_WATER_TEMP)) is not None:
-            return float(value)
+            return value
 
         return super().boiler_temperature
 
     @property
     def return_temperature(self) -> Optional[float]:
         if (value := self.get(DATA_RETURN_WATER_TEMP)) is not None:
-            return float(value)
+            return value
 
         return super().return_temperature
 
     @property
     def minimum_hot_water_setpoint(self) -> float:
         if (setpoint := self.get(DATA_SLAVE_DHW_MIN_SETP)) is not None:
-            return float(setpoint)
+            return setpoint
 
         return super().minimum_hot_water_setpoint
 
     @property
     def maximum_hot_water_setpoint(self) -> float:
         if (setpoint := self.get(DATA_SLAVE_DHW_MAX_SETP)) is not None:
-            return float(setpoint)
+            return setpoint
 
         return super().maximum_hot_water_setpoint
 
     @property
     def relative_modulation_value(self) -> Optional[float]:
         if (value := self.get(DATA_REL_MOD_LEVEL)) is not None:
-            return float(value)
+            return value
 
         return super().relative_modulation_value
 
     @property
     def boiler_capacity(self) -> Optional[float]:
         if (value := self.get(DATA_SLAVE_MAX_CAPACITY)) is not None:
-            return float(value)
+            return value
 
         return super().boiler_capacity
 
     @property
     def minimum_relative_modulation_value(self) -> Optional[float]:
         if (value := self.get(DATA_SLAVE_MIN_MOD_LEVEL)) is not None:
-            return float(value)
+            return value
 
         return super().minimum_relative_modulation_value
 
     @property
     def maximum_relative_modulation_value(self) -> Optional[float]:
         if (value := self.get(DATA_SLAVE_MAX_RELATIVE_MOD)) is not None:
-            return float(value)
+            return value
 
         return super().maximum_relative_modulation_value
 
     @property
     def member_id(self) -> Optional[int]:
         if (value := self.get(DATA_SLAVE_MEMBERID)) is not None:
-            return int(value)
+            return value
 
         return None
 
@@ -157,6 +181,14 @@ class SatSerialCoordinator(SatDataUpdateCoordinator):
         """Get the value for the given `key` from the boiler data."""
         return self.data[BOILER].get(key)
 
+    def _is_priority_update(self, data: Mapping[str, Any]) -> bool:
+        # The gateway pushes its whole status, so compare the transitions within the boiler data
+        if (boiler := data.get(BOILER)) is None:
+            return False
+
+        current = self.data.get(BOILER) or {}
+        return any(key in boiler and current.get(key) != boiler[key] for key in BOILER_PRIORITY_KEYS)
+
     async def async_connect(self) -> SatSerialCoordinator:
         try:
             await self._api.connect(port=self._port, timeout=5)
@@ -1,6 +1,8 @@
 import logging
 from typing import Optional
 
+from .log import SatLogger
+
 _LOGGER = logging.getLogger(__name__)
 
 DECREASE_STEP = 1.0
@@ -11,6 +13,7 @@ class SetpointAdjuster:
     def __init__(self):
         """Initialize the SetpointAdjuster with no current setpoint."""
         self._current = None
+        self._log = SatLogger(_LOGGER)
 
     @property
     def current(self) -> Optional[float]:
@@ -39,7 +42,8 @@ class SetpointAdjuster:
         elif self._current > target_setpoint:
             self._current = max(self._current - DECREASE_STEP, target_setpoint)
 
-        _LOGGER.info(
+        self._log.changed(
+            "setpoint", (self._current, target_setpoint), logging.INFO,
             "Setpoint updated: %.1f°C -> %.1f°C (Target: %.1f°C)",
             previous_setpoint, self._current, target_setpoint
         )
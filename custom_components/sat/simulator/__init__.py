@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from time import monotonic
 from typing import Optional, TYPE_CHECKING, Mapping, Any
 
 from homeassistant.core import HomeAssistant
 
+from ..clock import monotonic
 from ..const import CONF_SIMULATED_HEATING, CONF_SIMULATED_COOLING, MINIMUM_SETPOINT, CONF_SIMULATED_WARMING_UP, CONF_MAXIMUM_SETPOINT, PWMStatus
 from ..coordinator import DeviceState, SatDataUpdateCoordinator
 from ..helpers import convert_time_str_to_seconds
@@ -108,6 +108,7 @@ class SatSimulatorCoordinator(SatDataUpdateCoordinator):
                 self.logger.debug(f"Decreasing boiler temperature with {self._cooling}")
 
         # Notify listeners to ensure the entities are updated
+        self.async_invalidate_snapshots()
         self.hass.async_create_task(self.async_notify_listeners())
 
     @property
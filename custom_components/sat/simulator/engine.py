@@ -0,0 +1,429 @@
+"""Headless, accelerated-time simulation of the SAT control stack against a thermal house and boiler model."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Any, Callable, Mapping, Optional, Tuple
+
+from ..clock import VirtualClock, monotonic, use_clock
+from ..const import *
+from ..control import HeatingControl
+from ..coordinator import DeviceState, SatDataUpdateCoordinator
+from ..errors import Error
+from ..helpers import convert_time_str_to_seconds
+from ..relative_modulation import RelativeModulation
+from ..timing import LoopTimings
+from ..util import create_pid_controller, create_heating_curve_controller, create_pwm_controller, create_minimum_setpoint_controller
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+SPECIFIC_HEAT_WATER = 4186.0
+RADIATOR_NOMINAL_DELTA = 50.0
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class HouseModel:
+    """
+    Lumped thermal model of a house heated by radiators.
+    """
+    heat_loss: float = 180.0
+    thermal_mass: float = 3.0e7
+    radiator_output: float = 9000.0
+    radiator_exponent: float = 1.3
+    initial_temperature: float = 18.0
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class BoilerModel:
+    """
+    Simplified modulating gas boiler with its own flame control and anti-cycling.
+    """
+    capacity: float = 24000.0
+    minimum_modulation: float = 20.0
+    water_heat_capacity: float = 2.5e5
+    flow_rate: float = 0.2
+    anti_cycling_seconds: float = 180.0
+    switch_off_margin: float = 5.0
+    switch_on_margin: float = 2.0
+    modulation_gain: float = 8.0
+    initial_temperature: float = 20.0
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class SimulationStep:
+    """
+    Snapshot of the control stack after a single control loop.
+    """
+    time: float
+    outside_temperature: float
+    room_temperature: float
+    target_temperature: float
+
+    requested_setpoint: float
+    setpoint: Optional[float]
+    flow_temperature: float
+    return_temperature: float
+
+    flame_active: bool
+    relative_modulation: float
+    pwm_status: PWMStatus
+    pwm_duty_cycle: Optional[Tuple[int, int]]
+    burner_starts: int
+
+
+@dataclass(slots=True)
+class SimulationResult:
+    """
+    The recorded trace of a simulation together with a few aggregated values.
+    """
+    steps: list[SimulationStep] = field(default_factory=list)
+    burner_starts: int = 0
+    flame_seconds: float = 0.0
+    heat_delivered_kwh: float = 0.0
+    underheating_degree_hours: float = 0.0
+
+    @property
+    def flame_hours(self) -> float:
+        return self.flame_seconds / 3600
+
+
+class SimulatedHouse:
+    def __init__(self, model: HouseModel):
+        self._model: HouseModel = model
+        self.temperature: float = model.initial_temperature
+
+    def emitted_power(self, mean_water_temperature: float) -> float:
+        """Return the heat in W that the radiators emit into the house."""
+        delta = mean_water_temperature - self.temperature
+        if delta <= 0:
+            return 0.0
+
+        return self._model.radiator_output * (delta / RADIATOR_NOMINAL_DELTA) ** self._model.radiator_exponent
+
+    def step(self, seconds: float, emitted_power: float, outside_temperature: float) -> None:
+        loss = self._model.heat_loss * (self.temperature - outside_temperature)
+        self.temperature += (emitted_power - loss) * seconds / self._model.thermal_mass
+
+
+class SimulatedBoiler:
+    def __init__(self, model: BoilerModel):
+        self._model: BoilerModel = model
+
+        self.flame: bool = False
+        self.burner_starts: int = 0
+        self.modulation: float = 0.0
+        self.central_heating: bool = False
+        self.setpoint: float = MINIMUM_SETPOINT
+        self.maximum_setpoint: float = MAXIMUM_SETPOINT
+        self.maximum_relative_modulation: float = MAXIMUM_RELATIVE_MODULATION
+
+        self.flow_temperature: float = model.initial_temperature
+        self.return_temperature: float = model.initial_temperature
+
+        self._flame_off_since: Optional[float] = None
+
+    @property
+    def mean_water_temperature(self) -> float:
+        return (self.flow_temperature + self.return_temperature) / 2
+
+    @property
+    def power(self) -> float:
+        return self._model.capacity * (self.modulation / 100) if self.flame else 0.0
+
+    def step(self, now: float, seconds: float, emitted_power: float) -> None:
+        setpoint = min(self.setpoint, self.maximum_setpoint)
+        demand = self.central_heating and setpoint > MINIMUM_SETPOINT
+
+        if self.flame and (not demand or self.flow_temperature > setpoint + self._model.switch_off_margin):
+            self.flame = False
+            self._flame_off_since = now
+        elif not self.flame and demand and self.flow_temperature < setpoint - self._model.switch_on_margin:
+            if self._flame_off_since is None or now - self._flame_off_since >= self._model.anti_cycling_seconds:
+                self.flame = True
+                self.burner_starts += 1
+
+        if self.flame:
+            maximum_modulation = max(self._model.minimum_modulation, self.maximum_relative_modulation)
+            modulation = self._model.minimum_modulation + (setpoint - self.flow_temperature) * self._model.modulation_gain
+            self.modulation = min(max(modulation, self._model.minimum_modulation), maximum_modulation)
+        else:
+            self.modulation = 0.0
+
+        self.flow_temperature += (self.power - emitted_power) * seconds / self._model.water_heat_capacity
+        self.return_temperature = self.flow_temperature - emitted_power / (self._model.flow_rate * SPECIFIC_HEAT_WATER)
+
+
+class SatSimulationCoordinator(SatDataUpdateCoordinator):
+    """Coordinator that talks to a simulated boiler instead of a device, usable without a running Home Assistant."""
+
+    def __init__(self, boiler: SimulatedBoiler, config_data: Mapping[str, Any], options: Mapping[str, Any] | None = None) -> None:
+        self._boiler: SimulatedBoiler = boiler
+
+        super().__init__(None, config_data, options)
+
+    @property
+    def device_id(self) -> str:
+        return "Simulation"
+
+    @property
+    def device_type(self) -> str:
+        return "Simulation"
+
+    @property
+    def member_id(self) -> int | None:
+        return -1
+
+    @property
+    def supports_setpoint_management(self) -> bool:
+        return True
+
+    @property
+    def supports_maximum_setpoint_management(self) -> bool:
+        return True
+
+    @property
+    def supports_relative_modulation(self) -> bool:
+        return True
+
+    @property
+    def device_active(self) -> bool:
+        return self._boiler.central_heating
+
+    @property
+    def flame_active(self) -> bool:
+        return self._boiler.flame
+
+    @property
+    def setpoint(self) -> float | None:
+        return self._boiler.setpoint
+
+    @property
+    def boiler_temperature(self) -> float | None:
+        return round(self._boiler.flow_temperature, 2)
+
+    @property
+    def return_temperature(self) -> float | None:
+        return round(self._boiler.return_temperature, 2)
+
+    @property
+    def relative_modulation_value(self) -> float | None:
+        return round(self._boiler.modulation, 1)
+
+    @property
+    def maximum_relative_modulation_value(self) -> float | None:
+        return self._boiler.maximum_relative_modulation
+
+    async def async_set_heater_state(self, state: DeviceState) -> None:
+        self._boiler.central_heating = state == DeviceState.ON
+
+        await super().async_set_heater_state(state)
+
+    async def async_set_control_setpoint(self, value: float) -> None:
+        self._boiler.setpoint = value
+
+        await super().async_set_control_setpoint(value)
+
+    async def async_set_control_max_setpoint(self, value: float) -> None:
+        self._boiler.maximum_setpoint = value
+
+        await super().async_set_control_max_setpoint(value)
+
+    async def async_set_control_max_relative_modulation(self, value: int) -> None:
+        self._boiler.maximum_relative_modulation = value
+
+        await super().async_set_control_max_relative_modulation(value)
+
+
+def daily_weather(mean: float = 5.0, amplitude: float = 4.0) -> Callable[[float], float]:
+    """Return an outside temperature profile with a daily sine wave, coldest at 04:00."""
+
+    def outside_temperature(seconds: float) -> float:
+        return mean - amplitude * math.cos(2 * math.pi * ((seconds / 86400) - (4 / 24)))
+
+    return outside_temperature
+
+
+class SeasonSimulator:
+    """
+    Replays the control loop of SatClimate against a simulated house and boiler under virtual time.
+
+    The same controllers as the climate entity are used (heating curve, PID, PWM, Flame, boiler temperature tracking,
+    minimum setpoint and relative modulation), and they are driven by the same `HeatingControl` as the climate entity.
+    """
+
+    def __init__(
+            self,
+            config_data: Mapping[str, Any],
+            config_options: Mapping[str, Any] | None = None,
+            house: HouseModel = HouseModel(),
+            boiler: BoilerModel = BoilerModel(),
+            weather: Callable[[float], float] = daily_weather(),
+            target_temperature: Callable[[float], float] = lambda _seconds: 20.0,
+            control_interval: float = 30.0,
+            physics_interval: float = 10.0,
+            sensor_resolution: float = 0.1,
+            record_interval: Optional[float] = None,
+    ):
+        if physics_interval <= 0 or control_interval < physics_interval:
+            raise ValueError("The control interval must be a positive multiple of the physics interval.")
+
+        self._weather = weather
+        self._target_temperature = target_temperature
+        self._control_interval: float = control_interval
+        self._physics_interval: float = physics_interval
+        self._sensor_resolution: float = sensor_resolution
+        self._record_interval: float = record_interval or control_interval
+
+        config_data = {CONF_HEATING_SYSTEM: HEATING_SYSTEM_RADIATORS, CONF_MINIMUM_SETPOINT: OPTIONS_DEFAULTS[CONF_MINIMUM_SETPOINT], **config_data}
+        options = {**OPTIONS_DEFAULTS, **(config_options or {})}
+
+        self._clock = VirtualClock()
+        self._house = SimulatedHouse(house)
+        self._boiler = SimulatedBoiler(boiler)
+
+        self._room_temperature: Optional[float] = None
+        self._current_target_temperature: Optional[float] = None
+
+        self._heating_system: str = str(config_data.get(CONF_HEATING_SYSTEM))
+        self._sensor_max_value_age: int = convert_time_str_to_seconds(options.get(CONF_SENSOR_MAX_VALUE_AGE))
+        self.timings: LoopTimings = LoopTimings()
+
+        # Controllers keep monotonic timestamps, so they have to be created while the virtual clock is active
+        with use_clock(self._clock):
+            self.coordinator = SatSimulationCoordinator(self._boiler, config_data, options)
+
+            self.pid = create_pid_controller(options)
+            self.heating_curve = create_heating_curve_controller(config_data, options)
+            self.minimum_setpoint = create_minimum_setpoint_controller(config_data, options)
+            self.relative_modulation = RelativeModulation(self.coordinator, self._heating_system)
+            self.pwm = create_pwm_controller(self.heating_curve, self.coordinator.supports_relative_modulation_management, config_data, options)
+
+            self.control = HeatingControl(self.coordinator, self.pid, self.heating_curve, self.pwm, self.minimum_setpoint, self.relative_modulation, config_data, options)
+
+    @property
+    def clock(self) -> VirtualClock:
+        """Return the virtual clock, controllers can be driven outside of a run while it is active."""
+        return self._clock
+
+    @property
+    def error(self) -> Error:
+        return Error("simulation", round(self._current_target_temperature - self._room_temperature, 2))
+
+    @property
+    def requested_setpoint(self) -> float:
+        return self.control.requested_setpoint
+
+    @property
+    def pulse_width_modulation_enabled(self) -> bool:
+        return self.control.pulse_width_modulation_enabled
+
+    @property
+    def minimum_setpoint_value(self) -> float:
+        return self.control.minimum_setpoint_value
+
+    def run(self, duration: float) -> SimulationResult:
+        """Simulate the given amount of seconds and return the recorded trace."""
+        return asyncio.run(self.async_run(duration))
+
+    async def async_run(self, duration: float) -> SimulationResult:
+        """Simulate the given amount of seconds and return the recorded trace."""
+        result = SimulationResult()
+        next_record = self._clock.monotonic() + self._record_interval
+        end = self._clock.monotonic() + duration
+        substeps = max(1, round(self._control_interval / self._physics_interval))
+
+        with use_clock(self._clock):
+            await self.coordinator.async_set_control_max_setpoint(self.coordinator.maximum_setpoint)
+
+            while self._clock.monotonic() < end:
+                outside_temperature = self._weather(self._clock.monotonic())
+
+                for _ in range(substeps):
+                    self._step_physics(result, outside_temperature)
+
+                await self._async_control_pid(outside_temperature)
+                await self._async_control_heating_loop()
+
+                target_temperature = self._current_target_temperature
+                if self._house.temperature < target_temperature:
+                    result.underheating_degree_hours += (target_temperature - self._house.temperature) * self._control_interval / 3600
+
+                if self._clock.monotonic() >= next_record:
+                    next_record += self._record_interval
+                    result.steps.append(self._snapshot(outside_temperature))
+
+        result.burner_starts = self._boiler.burner_starts
+
+        return result
+
+    def _step_physics(self, result: SimulationResult, outside_temperature: float) -> None:
+        seconds = self._physics_interval
+        emitted_power = self._house.emitted_power(self._boiler.mean_water_temperature)
+
+        self._boiler.step(self._clock.monotonic(), seconds, emitted_power)
+        self._house.step(seconds, emitted_power, outside_temperature)
+        self._clock.advance(seconds)
+
+        if self._boiler.flame:
+            result.flame_seconds += seconds
+            result.heat_delivered_kwh += self._boiler.power * seconds / 3.6e6
+
+        # The devices push their state, so let the listeners (flame tracking) know about it
+        self.coordinator.async_update_listeners()
+
+    async def _async_control_pid(self, outside_temperature: float) -> None:
+        """Feed the PID controller like `SatClimate._async_control_pid`, triggered by sensor and target changes."""
+        target_temperature = self._target_temperature(self._clock.monotonic())
+        room_temperature = round(round(self._house.temperature / self._sensor_resolution) * self._sensor_resolution, 2)
+
+        reset = target_temperature != self._current_target_temperature
+        if not reset and room_temperature == self._room_temperature:
+            return
+
+        self._room_temperature = room_temperature
+        self._current_target_temperature = target_temperature
+
+        if self._sensor_max_value_age != 0 and monotonic() - self.pid.last_updated > self._sensor_max_value_age:
+            self.pid.reset()
+
+        self.heating_curve.update(target_temperature, outside_temperature)
+        self.control.update_pid(self.error, target_temperature, outside_temperature, reset)
+
+        # A new target temperature resets the control state, just like the climate does
+        if reset:
+            self.control.reset()
+
+    async def _async_control_heating_loop(self) -> None:
+        await self.control.async_control_heating_loop(error=self.error, timings=self.timings, set_heater_state=self._async_set_heater_state)
+
+    async def _async_set_heater_state(self, state: DeviceState) -> None:
+        if state == DeviceState.ON and self.coordinator.device_active:
+            return
+
+        if state == DeviceState.OFF and not self.coordinator.device_active:
+            return
+
+        await self.coordinator.async_set_heater_state(state)
+
+    def _snapshot(self, outside_temperature: float) -> SimulationStep:
+        pwm_state = self.pwm.state
+
+        return SimulationStep(
+            time=self._clock.monotonic(),
+            outside_temperature=round(outside_temperature, 2),
+            room_temperature=round(self._house.temperature, 2),
+            target_temperature=self._current_target_temperature,
+
+            requested_setpoint=self.requested_setpoint,
+            setpoint=self.control.setpoint,
+            flow_temperature=round(self._boiler.flow_temperature, 2),
+            return_temperature=round(self._boiler.return_temperature, 2),
+
+            flame_active=self._boiler.flame,
+            relative_modulation=round(self._boiler.modulation, 1),
+            pwm_status=pwm_state.status,
+            pwm_duty_cycle=pwm_state.duty_cycle,
+            burner_starts=self._boiler.burner_starts,
+        )
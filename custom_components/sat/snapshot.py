@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .clock import monotonic, utcnow
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# The delay in seconds before a scheduled snapshot is written, so frequent updates result in a single write
+SNAPSHOT_SAVE_DELAY = 60
+
+# Snapshots older than this are discarded, it matches the longest window of the flame statistics
+MAX_SNAPSHOT_AGE = 4 * 60 * 60
+
+
+@dataclass(frozen=True, slots=True)
+class RuntimeSnapshot:
+    """The runtime state saved before a restart, with the seconds that passed since it was saved."""
+    elapsed: float
+    data: dict[str, Any]
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        return self.data.get(key)
+
+    def restore_timestamp(self, age: Optional[float]) -> Optional[float]:
+        """Convert an age stored in the snapshot back to a monotonic timestamp."""
+        if age is None:
+            return None
+
+        return monotonic() - age - self.elapsed
+
+
+def snapshot_age(timestamp: Optional[float], now: float) -> Optional[float]:
+    """Convert a monotonic timestamp to an age, since monotonic timestamps do not survive a restart."""
+    if timestamp is None:
+        return None
+
+    return now - timestamp
+
+
+class RuntimeStore:
+    """Persists the runtime state of the controllers and the coordinator, so they resume where they left off after a restart."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, max_age: float = MAX_SNAPSHOT_AGE) -> None:
+        """
+        Initialize the runtime store.
+
+        :param hass: The Home Assistant instance.
+        :param entry_id: The config entry the runtime state belongs to.
+        :param max_age: The maximum age in seconds of a snapshot to still be restored.
+        """
+        self._max_age: float = max_age
+        self._store: Store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.runtime.{entry_id}")
+
+    async def async_load(self) -> Optional[RuntimeSnapshot]:
+        """Load the snapshot, if there is one that is recent enough."""
+        if not (stored := await self._store.async_load()):
+            return None
+
+        try:
+            elapsed = utcnow().timestamp() - float(stored["saved_at"])
+        except (KeyError, TypeError, ValueError):
+            _LOGGER.warning("Ignoring an invalid runtime snapshot.")
+            return None
+
+        if elapsed < 0 or elapsed > self._max_age:
+            _LOGGER.debug("Ignoring a runtime snapshot of %.0f seconds old.", elapsed)
+            return None
+
+        _LOGGER.debug("Loaded a runtime snapshot of %.0f seconds old.", elapsed)
+
+        return RuntimeSnapshot(elapsed=elapsed, data=stored.get("data", {}))
+
+    @callback
+    def async_schedule_save(self, data: Callable[[], dict[str, Any]]) -> None:
+        """Schedule a snapshot to be written, the data is only collected once it is written."""
+        self._store.async_delay_save(lambda: self._serialize(data), SNAPSHOT_SAVE_DELAY)
+
+    async def async_save(self, data: Callable[[], dict[str, Any]]) -> None:
+        """Write a snapshot right away, replacing any scheduled write."""
+        await self._store.async_save(self._serialize(data))
+
+    async def async_remove(self) -> None:
+        """Remove the stored snapshot, when the config entry is deleted."""
+        await self._store.async_remove()
+
+    @staticmethod
+    def _serialize(data: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+        return {"saved_at": utcnow().timestamp(), "data": data()}
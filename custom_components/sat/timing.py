@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import math
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Iterator, Optional
+
+# The bucket bounds in seconds, logarithmic from 10 microseconds to 100 seconds with 8 buckets per decade
+BUCKET_BOUNDS: tuple[float, ...] = tuple(10 ** (exponent / 8) for exponent in range(-40, 17))
+
+STAGE_PID = "pid"
+STAGE_COORDINATOR = "coordinator"
+STAGE_SETPOINT_FILTER = "setpoint_filter"
+STAGE_PWM = "pwm"
+STAGE_CONTROL_SETPOINT = "control_setpoint"
+STAGE_RELATIVE_MODULATION = "relative_modulation"
+STAGE_INTEGRAL = "integral"
+STAGE_AREAS = "areas"
+STAGE_MINIMUM_SETPOINT = "minimum_setpoint"
+STAGE_HEATER_STATE = "heater_state"
+
+STAGES = (
+    STAGE_PID,
+    STAGE_COORDINATOR,
+    STAGE_SETPOINT_FILTER,
+    STAGE_PWM,
+    STAGE_CONTROL_SETPOINT,
+    STAGE_RELATIVE_MODULATION,
+    STAGE_INTEGRAL,
+    STAGE_AREAS,
+    STAGE_MINIMUM_SETPOINT,
+    STAGE_HEATER_STATE,
+)
+
+
+class Histogram:
+    """Counts durations in fixed logarithmic buckets, so percentiles cost no memory per sample."""
+
+    def __init__(self) -> None:
+        self._counts: array = array("Q", [0]) * (len(BUCKET_BOUNDS) + 1)
+        self._count: int = 0
+        self._total: float = 0.0
+        self._maximum: float = 0.0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def maximum(self) -> float:
+        return self._maximum
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self._total / self._count if self._count else None
+
+    def add(self, seconds: float) -> None:
+        self._counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self._count += 1
+        self._total += seconds
+        self._maximum = max(self._maximum, seconds)
+
+    def percentile(self, percentage: float) -> Optional[float]:
+        """Return the upper bound of the bucket that holds the percentile, limited to the largest duration seen."""
+        if not self._count:
+            return None
+
+        rank = max(1, math.ceil(self._count * percentage / 100))
+        seen = 0
+
+        for index, count in enumerate(self._counts):
+            seen += count
+
+            if seen >= rank:
+                return min(BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else math.inf, self._maximum)
+
+        return self._maximum
+
+    def reset(self) -> None:
+        for index in range(len(self._counts)):
+            self._counts[index] = 0
+
+        self._count = 0
+        self._total = 0.0
+        self._maximum = 0.0
+
+    def summary(self) -> dict[str, Optional[float]]:
+        """Return the count and the p50, p95 and maximum in milliseconds."""
+        return {
+            "count": self._count,
+            "p50": _milliseconds(self.percentile(50)),
+            "p95": _milliseconds(self.percentile(95)),
+            "max": _milliseconds(self._maximum if self._count else None),
+        }
+
+
+class LoopTimings:
+    """Aggregates the durations of the stages of the control loop, and of the loop as a whole."""
+
+    def __init__(self) -> None:
+        self._loop: Histogram = Histogram()
+        self._stages: dict[str, Histogram] = {stage: Histogram() for stage in STAGES}
+
+    @property
+    def loop(self) -> Histogram:
+        return self._loop
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as the given stage, including anything it awaits."""
+        start = perf_counter()
+
+        try:
+            yield
+        finally:
+            self._stages[name].add(perf_counter() - start)
+
+    def reset(self) -> None:
+        self._loop.reset()
+
+        for histogram in self._stages.values():
+            histogram.reset()
+
+    def percentiles(self, percentage: float) -> tuple[Optional[float], ...]:
+        """Return the percentile in milliseconds of the loop and of every stage, without building a summary."""
+        return (
+            _milliseconds(self._loop.percentile(percentage)),
+            *(_milliseconds(histogram.percentile(percentage)) for histogram in self._stages.values()),
+        )
+
+    def summary(self) -> dict[str, dict[str, Optional[float]]]:
+        """Return the summary of the loop and of every stage that ran at least once."""
+        return {
+            "loop": self._loop.summary(),
+            **{name: histogram.summary() for name, histogram in self._stages.items() if histogram.count},
+        }
+
+
+def _milliseconds(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 3)
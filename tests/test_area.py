@@ -0,0 +1,37 @@
+"""The tests for the areas."""
+from homeassistant.core import HomeAssistant
+
+from custom_components.sat.area import SENSOR_TEMPERATURE_ID, Areas
+from custom_components.sat.const import CONF_HEATING_SYSTEM, CONF_ROOMS, HEATING_SYSTEM_RADIATORS, OPTIONS_DEFAULTS
+
+
+async def test_zone_errors_follow_state_changes(hass: HomeAssistant) -> None:
+    hass.states.async_set("climate.living", "heat", {"temperature": 21.0, "current_temperature": 19.5})
+    hass.states.async_set("climate.bedroom", "heat", {"temperature": 18.0, "current_temperature": 18.0, SENSOR_TEMPERATURE_ID: "sensor.bedroom"})
+    hass.states.async_set("sensor.bedroom", "17.0")
+
+    options = {**OPTIONS_DEFAULTS, CONF_HEATING_SYSTEM: HEATING_SYSTEM_RADIATORS}
+    areas = Areas({CONF_ROOMS: ["climate.living", "climate.bedroom"], CONF_HEATING_SYSTEM: HEATING_SYSTEM_RADIATORS}, options)
+    await areas.async_added_to_hass(hass)
+
+    assert [error.value for error in areas.errors] == [1.5, 1.0]
+    assert areas.demand == 1.05
+
+    hass.states.async_set("sensor.bedroom", "19.0")
+    areas.async_update("sensor.bedroom")
+
+    assert areas.errors.max().value == 1.5
+    assert [error.value for error in areas.errors] == [1.5, -1.0]
+
+
+async def test_zones_are_refreshed_from_the_settled_states(hass: HomeAssistant) -> None:
+    options = {**OPTIONS_DEFAULTS, CONF_HEATING_SYSTEM: HEATING_SYSTEM_RADIATORS}
+    areas = Areas({CONF_ROOMS: ["climate.living"], CONF_HEATING_SYSTEM: HEATING_SYSTEM_RADIATORS}, options)
+    await areas.async_added_to_hass(hass)
+
+    assert list(areas.errors) == []
+
+    hass.states.async_set("climate.living", "heat", {"temperature": 21.0, "current_temperature": 20.0})
+    areas.async_refresh()
+
+    assert [error.value for error in areas.errors] == [1.0]
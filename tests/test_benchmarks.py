@@ -0,0 +1,18 @@
+"""The tests for the benchmark suite."""
+import inspect
+
+from benchmarks import cases  # noqa: F401
+from benchmarks.runner import BENCHMARKS, BenchmarkResult
+
+
+async def test_every_benchmark_runs() -> None:
+    for case in BENCHMARKS.values():
+        async with case.factory() as subject:
+            if inspect.isawaitable(result := subject()):
+                await result
+
+
+def test_regressions_use_the_threshold_of_the_benchmark() -> None:
+    assert not BenchmarkResult("pid.update", 14.0, 1.5, baseline=10.0).regressed
+    assert BenchmarkResult("pid.update", 16.0, 1.5, baseline=10.0).regressed
+    assert not BenchmarkResult("pid.update", 16.0, 1.5).regressed
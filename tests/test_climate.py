@@ -57,6 +57,9 @@ async def test_scenario_1(hass: HomeAssistant, entry: MockConfigEntry, climate:
     assert climate.pwm.last_duty_cycle_percentage == 23.83
     assert climate.pwm.duty_cycle == (285, 914)
 
+    assert list(climate.flight_recorder)[-1].setpoint == 57
+    assert list(climate.flight_recorder)[-1].heater_on
+
 
 @pytest.mark.parametrize(*[
     "domains, data, options, config",
@@ -0,0 +1,54 @@
+"""The tests for the injectable clock."""
+from datetime import timedelta
+
+import pytest
+
+from custom_components.sat.clock import VirtualClock, monotonic, use_clock, utcnow
+from custom_components.sat.const import HEATING_SYSTEM_RADIATORS
+from custom_components.sat.errors import Error
+from custom_components.sat.pid import PID
+from custom_components.sat.state import State, update_state
+
+
+def test_virtual_clock_advances_both_times() -> None:
+    clock = VirtualClock(start=100.0)
+    start_utc = clock.utcnow()
+
+    with use_clock(clock):
+        clock.advance(3600)
+
+        assert monotonic() == 3700.0
+        assert utcnow() - start_utc == timedelta(hours=1)
+
+    with pytest.raises(ValueError):
+        clock.advance(-1)
+
+
+def test_pid_integral_time_limit_fast_forward() -> None:
+    clock = VirtualClock()
+
+    with use_clock(clock):
+        pid = PID(HEATING_SYSTEM_RADIATORS, 1.0, 1.0, 1.0, kp=1.0, ki=0.01, kd=0.0, integral_time_limit=300)
+        error = Error(entity_id="climate.test", value=0.05)
+
+        clock.advance(299)
+        pid.update_integral(error, 40)
+        assert pid.integral == 0.0
+
+        clock.advance(1)
+        pid.update_integral(error, 40)
+        assert pid.integral == 0.15
+
+
+def test_update_state_uses_clock() -> None:
+    clock = VirtualClock()
+
+    with use_clock(clock):
+        state = update_state(State(), 1.0)
+
+        clock.advance(60)
+        assert update_state(state, 1.0).last_changed == state.last_changed
+
+        changed = update_state(state, 2.0)
+        assert changed.last_changed - state.last_changed == timedelta(seconds=60)
+        assert isinstance(changed, State)
@@ -0,0 +1,100 @@
+"""The tests for the coordinator."""
+import logging
+from types import SimpleNamespace
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.sat.clock import VirtualClock, use_clock
+from custom_components.sat.const import CONF_MQTT_TOPIC, MAX_BOILER_TEMPERATURE_AGE
+from custom_components.sat.coordinator import COMMAND_REFRESH_INTERVAL, SatEntityCoordinator
+from custom_components.sat.mqtt.opentherm import SatOpenThermMqttCoordinator
+from custom_components.sat.simulator.engine import BoilerModel, SatSimulationCoordinator, SimulatedBoiler
+
+
+async def test_redundant_commands_are_skipped() -> None:
+    clock = VirtualClock()
+
+    with use_clock(clock):
+        boiler = SimulatedBoiler(BoilerModel())
+        coordinator = SatSimulationCoordinator(boiler, {})
+
+        await coordinator.async_set_control_setpoint(45)
+        assert coordinator.is_redundant_command("async_set_control_setpoint", 45)
+        assert not coordinator.is_redundant_command("async_set_control_setpoint", 50)
+
+        # The boiler no longer reports the value that was sent
+        boiler.setpoint = 10
+        assert not coordinator.is_redundant_command("async_set_control_setpoint", 45)
+
+        await coordinator.async_set_control_setpoint(45)
+        assert boiler.setpoint == 45
+
+        clock.advance(COMMAND_REFRESH_INTERVAL)
+        assert not coordinator.is_redundant_command("async_set_control_setpoint", 45)
+
+
+async def test_selective_listeners_only_run_for_their_changes(hass: HomeAssistant) -> None:
+    coordinator = SatOpenThermMqttCoordinator(hass, "otgw", {CONF_MQTT_TOPIC: "OTGW"})
+
+    key_calls = []
+    property_calls = []
+    coordinator.async_add_selective_listener(lambda: key_calls.append(True), keys=["Tboiler"])
+    coordinator.async_add_selective_listener(lambda: property_calls.append(True), properties=["boiler_temperature"])
+
+    coordinator.data.update({"Tboiler": "45.0"})
+    coordinator.async_update_listeners()
+    assert len(key_calls) == 1 and len(property_calls) == 1
+
+    # An unrelated change wakes neither listener
+    coordinator.data.update({"TdhwSet": "55.0"})
+    coordinator.async_update_listeners()
+    assert len(key_calls) == 1 and len(property_calls) == 1
+
+    # When the changes are unknown only the property listener can skip the update
+    coordinator.async_update_listeners()
+    assert len(key_calls) == 2 and len(property_calls) == 1
+
+
+async def test_steady_boiler_temperature_keeps_its_history(hass: HomeAssistant) -> None:
+    clock = VirtualClock()
+
+    with use_clock(clock):
+        coordinator = SatOpenThermMqttCoordinator(hass, "otgw", {CONF_MQTT_TOPIC: "OTGW"})
+
+        # A rising temperature, dated at the time it was reported
+        for temperature in ("40.0", "41.0", "42.0"):
+            coordinator.data.update({"Tboiler": temperature})
+            await coordinator.async_control_heating_loop()
+            clock.advance(10)
+
+        assert coordinator.boiler_temperature_derivative == 0.1
+
+        # The temperature holds for longer than the history keeps its samples
+        for _ in range(2 * MAX_BOILER_TEMPERATURE_AGE // 10):
+            await coordinator.async_control_heating_loop()
+            clock.advance(10)
+
+        assert coordinator.boiler_temperature_derivative == 0
+        assert len(list(coordinator._boiler_temperatures)) > 1
+
+
+class _EntityCoordinator(SatEntityCoordinator):
+    def _get_entity_id(self, domain: str, key: str):
+        return f"{domain}.{key}"
+
+
+async def test_entity_changed_at_is_cached_per_state_change(hass: HomeAssistant) -> None:
+    coordinator = _EntityCoordinator(hass, logging.getLogger(__name__), name="entities")
+    coordinator.async_enable_entity_cache()
+    assert coordinator.get_changed_at("sensor", "boiler_temperature") is None
+
+    hass.states.async_set("sensor.boiler_temperature", "45.0")
+    assert coordinator.get_changed_at("sensor", "boiler_temperature") is None
+
+    # The time of a state change is converted once, when the change is passed to the cache
+    state = hass.states.get("sensor.boiler_temperature")
+    coordinator.async_cache_state_change(SimpleNamespace(data={"entity_id": state.entity_id, "new_state": state}))
+    changed_at = coordinator.get_changed_at("sensor", "boiler_temperature")
+
+    assert changed_at is not None
+    assert coordinator.get_changed_at("sensor", "boiler_temperature") == changed_at
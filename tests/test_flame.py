@@ -0,0 +1,38 @@
+"""The tests for the flame tracking."""
+from custom_components.sat.boiler import BoilerState
+from custom_components.sat.clock import VirtualClock, use_clock
+from custom_components.sat.const import BoilerStatus
+from custom_components.sat.flame import Flame
+
+
+def _boiler_state(flame_active: bool) -> BoilerState:
+    return BoilerState(
+        is_active=True,
+        is_inactive=False,
+        status=BoilerStatus.HEATING_UP,
+        flame_active=flame_active,
+        hot_water_active=False,
+        setpoint=50.0,
+        flow_temperature=45.0,
+        return_temperature=35.0,
+        relative_modulation_level=50.0,
+    )
+
+
+def test_transitions_use_the_reported_time() -> None:
+    clock = VirtualClock()
+
+    with use_clock(clock):
+        flame = Flame()
+        flame.update(_boiler_state(False))
+
+        # The flame turned on at 100 seconds, but was only processed 5 seconds later
+        clock.advance(105)
+        flame.update(_boiler_state(True), timestamp=100)
+        assert flame.on_since == 100
+
+        clock.advance(300)
+        flame.update(_boiler_state(False), timestamp=400)
+
+        assert flame.last_cycle_duration_seconds == 300
+        assert flame.off_since == 400
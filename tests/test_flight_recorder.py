@@ -0,0 +1,37 @@
+"""The tests for the flight recorder of the control decisions."""
+from custom_components.sat.const import PWMStatus
+from custom_components.sat.flight_recorder import ControlDecision, FlightRecorder
+
+
+def _decision(timestamp: float, setpoint: float | None) -> ControlDecision:
+    return ControlDecision(
+        timestamp=timestamp,
+        error=0.25,
+        outside_temperature=None,
+        flow_temperature=41.5,
+        flame_active=True,
+        requested_setpoint=45.0,
+        calculated_setpoint=44.5,
+        setpoint=setpoint,
+        pwm_status=PWMStatus.ON,
+        duty_cycle_on=300,
+        duty_cycle_off=600,
+        relative_modulation=100,
+        heater_on=True,
+    )
+
+
+def test_flight_recorder_keeps_the_latest_decisions() -> None:
+    recorder = FlightRecorder(capacity=3)
+
+    for timestamp in range(5):
+        recorder.record(_decision(timestamp, 40.0 + timestamp))
+
+    decisions = list(recorder)
+    assert len(recorder) == 3
+    assert [decision.timestamp for decision in decisions] == [2, 3, 4]
+    assert decisions[-1] == _decision(4, 44.0)
+
+    recorder.record(_decision(5, None))
+    assert list(recorder)[-1].setpoint is None
+    assert recorder.as_dicts()[-1]["pwm_status"] == "on"
@@ -0,0 +1,55 @@
+"""The tests for the time series ring buffer."""
+import random
+
+import pytest
+
+from custom_components.sat.history import TimeSeries
+
+
+def test_time_series_matches_full_scan() -> None:
+    generator = random.Random(42)
+    series = TimeSeries(max_age=60, capacity=8)
+    samples: list[tuple[float, float]] = []
+
+    now = 0.0
+    for _ in range(500):
+        now += generator.choice([0, 5, 10, 30])
+        value = round(generator.uniform(20, 80), 1)
+        cutoff = generator.choice([None, now - 20, now - 45])
+
+        if not samples or samples[-1][0] != now:
+            samples.append((now, value))
+
+        samples = [sample for sample in samples[-8:] if now - sample[0] <= 60]
+
+        series.append(now, value)
+        series.evict(now)
+
+        values = [value for _, value in samples]
+        before = [value for timestamp, value in samples if cutoff is None or timestamp < cutoff]
+
+        assert len(series) == len(samples)
+        assert series.latest == samples[-1]
+        assert series.maximum == max(values)
+        assert series.minimum == min(values)
+        assert series.maximum_before(cutoff) == (max(before) if before else None)
+
+        if len(samples) > 1:
+            differences = [abs(j[1] - i[1]) for i, j in zip(samples, samples[1:])]
+            assert series.previous == samples[-2]
+            assert series.mean_absolute_difference == pytest.approx(sum(differences) / len(differences))
+        else:
+            assert series.previous is None
+            assert series.mean_absolute_difference is None
+
+
+def test_time_series_clear() -> None:
+    series = TimeSeries(max_age=60)
+    series.append(0, 40)
+    series.append(10, 45)
+    series.clear()
+
+    assert len(series) == 0
+    assert series.latest is None
+    assert series.maximum is None
+    assert series.maximum_before(None) is None
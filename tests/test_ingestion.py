@@ -0,0 +1,19 @@
+"""The tests for the ingestion buffer."""
+from homeassistant.core import HomeAssistant
+
+from custom_components.sat.ingestion import IngestionBuffer
+
+
+async def test_updates_are_applied_as_a_single_batch(hass: HomeAssistant) -> None:
+    batches = []
+    buffer = IngestionBuffer(hass, lambda data, _timestamps: batches.append(data))
+
+    buffer.async_add({"Tboiler": 40.0})
+    buffer.async_add({"Tret": 30.0})
+    buffer.async_add({"Tboiler": 41.0})
+    assert batches == []
+
+    await hass.async_block_till_done()
+
+    assert batches == [{"Tboiler": 41.0, "Tret": 30.0}]
+    assert buffer.updates == 3 and buffer.batches == 1
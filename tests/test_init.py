@@ -5,6 +5,7 @@ from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.sat import async_reload_entry
 from custom_components.sat.const import DOMAIN
+from custom_components.sat.snapshot import RuntimeStore
 from tests.const import DEFAULT_USER_DATA
 
 
@@ -24,3 +25,19 @@ async def test_setup_update_unload_entry(hass):
 
     # Reload the entry without errors
     assert await async_reload_entry(hass, sat_entry) is None
+
+
+async def test_remove_entry_removes_the_runtime_snapshot(hass):
+    """Test that deleting the entry also deletes its runtime snapshot."""
+    sat_entry = MockConfigEntry(domain=DOMAIN, data=DEFAULT_USER_DATA)
+    await hass.config_entries.async_add(sat_entry)
+    await hass.async_block_till_done()
+
+    store = RuntimeStore(hass, sat_entry.entry_id)
+    await store.async_save(lambda: {})
+    assert await store.async_load() is not None
+
+    await hass.config_entries.async_remove(sat_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert await RuntimeStore(hass, sat_entry.entry_id).async_load() is None
@@ -0,0 +1,32 @@
+"""The tests for the logging helpers."""
+import logging
+
+from _pytest.logging import LogCaptureFixture
+
+from custom_components.sat.clock import VirtualClock, use_clock
+from custom_components.sat.log import SatLogger
+
+
+def test_changed_only_emits_new_values(caplog: LogCaptureFixture) -> None:
+    log = SatLogger(logging.getLogger("custom_components.sat.test"))
+
+    with caplog.at_level(logging.INFO):
+        for value in (45, 45, 50, 50, 45):
+            log.changed("setpoint", value, logging.INFO, "Setpoint %d", value)
+
+    assert [record.getMessage() for record in caplog.records] == ["Setpoint 45", "Setpoint 50", "Setpoint 45"]
+
+
+def test_throttled_reports_suppressed_messages(caplog: LogCaptureFixture) -> None:
+    clock = VirtualClock()
+    log = SatLogger(logging.getLogger("custom_components.sat.test"))
+
+    with use_clock(clock), caplog.at_level(logging.INFO):
+        for _ in range(3):
+            log.throttled("overshoot", 60, logging.INFO, "Overshoot")
+            clock.advance(20)
+
+        clock.advance(20)
+        log.throttled("overshoot", 60, logging.INFO, "Overshoot")
+
+    assert [record.getMessage() for record in caplog.records] == ["Overshoot", "Overshoot (2 similar messages suppressed)"]
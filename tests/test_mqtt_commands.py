@@ -0,0 +1,61 @@
+"""The tests for the MQTT command queue."""
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.sat.mqtt.commands import Acknowledgement, MqttCommandQueue
+
+
+async def test_command_queue_coalesces_and_acknowledges(hass: HomeAssistant) -> None:
+    data = {"TSet": "40.00"}
+    published = []
+
+    async def publish(payload: str) -> None:
+        published.append(payload)
+
+    queue = MqttCommandQueue(hass, publish, lambda: data)
+    queue.async_enqueue("CS=45.0", "CS", Acknowledgement("TSet", 45.0))
+    queue.async_enqueue("PM=25")
+    queue.async_enqueue("MM=40", "MM", Acknowledgement("MaxRelModLevelSetting", 40))
+    queue.async_enqueue("CS=50.0", "CS", Acknowledgement("TSet", 50.0))
+    queue.async_enqueue("PM=25")
+
+    assert published == []
+    await hass.async_block_till_done()
+
+    assert published == ["MM=40", "CS=50.0", "PM=25"]
+    assert set(queue.pending) == {"CS", "MM"}
+
+    data["TSet"] = "50.00"
+    queue.async_acknowledge(data)
+    assert set(queue.pending) == {"MM"}
+
+    queue.async_cancel()
+    assert not queue.pending
+
+
+async def test_unacknowledged_command_is_retried_and_then_failed(hass: HomeAssistant) -> None:
+    data = {"TSet": "40.00"}
+    published = []
+
+    async def publish(payload: str) -> None:
+        published.append(payload)
+
+    queue = MqttCommandQueue(hass, publish, lambda: data, timeout=0, retries=2)
+    queue.async_enqueue("CS=45.0", "CS", Acknowledgement("TSet", 45.0))
+    await hass.async_block_till_done()
+
+    # The device never reports the requested value, so the command is published again until the retries run out
+    for _ in range(3):
+        async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+
+    assert published == ["CS=45.0", "CS=45.0", "CS=45.0"]
+    assert not queue.pending
+    assert queue.failed == {"CS": "CS=45.0"}
+
+    # A new command for the same setting starts over
+    queue.async_enqueue("CS=50.0", "CS", Acknowledgement("TSet", 50.0))
+    assert not queue.failed
@@ -0,0 +1,83 @@
+"""The tests for the MQTT message dispatching."""
+from types import SimpleNamespace
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.sat.const import CONF_MQTT_TOPIC
+from custom_components.sat.mqtt.ems import SatEmsMqttCoordinator
+from custom_components.sat.mqtt.opentherm import SatOpenThermMqttCoordinator
+
+
+async def test_messages_are_dispatched_by_topic(hass: HomeAssistant) -> None:
+    coordinator = SatOpenThermMqttCoordinator(hass, "otgw", {CONF_MQTT_TOPIC: "OTGW"})
+    assert coordinator._get_wildcard_topics_for_subscription() == ["OTGW/value/otgw/+"]
+
+    coordinator._async_message_received(SimpleNamespace(topic="OTGW/value/otgw/Tboiler", payload="45.50"))
+    coordinator._async_message_received(SimpleNamespace(topic="OTGW/value/otgw/Untracked", payload="1"))
+    coordinator.async_flush_ingestion()
+
+    assert coordinator.boiler_temperature == 45.5
+    assert "Untracked" not in coordinator.data
+
+    await coordinator.async_will_remove_from_hass()
+
+
+async def test_maximum_setpoint_is_acknowledged(hass: HomeAssistant) -> None:
+    coordinator = SatOpenThermMqttCoordinator(hass, "otgw", {CONF_MQTT_TOPIC: "OTGW"})
+
+    await coordinator.async_set_control_max_setpoint(65.0)
+    await hass.async_block_till_done()
+    assert "SH" in coordinator._commands.pending
+
+    coordinator._async_message_received(SimpleNamespace(topic="OTGW/value/otgw/MaxTSet", payload="65.00"))
+    coordinator.async_flush_ingestion()
+
+    assert coordinator.maximum_setpoint_value == 65.0
+    assert "SH" not in coordinator._commands.pending
+
+    await coordinator.async_will_remove_from_hass()
+
+
+async def test_ems_boiler_data_is_projected(hass: HomeAssistant) -> None:
+    coordinator = SatEmsMqttCoordinator(hass, "ems", {CONF_MQTT_TOPIC: "ems-esp"})
+    assert coordinator._get_wildcard_topics_for_subscription() == ["ems-esp/boiler_data", "ems-esp/boiler/#"]
+
+    payload = '{"curflowtemp": 45.5, "burngas": "on", "dhw": {"seltemp": 52}, "ubauptime": 123456}'
+    coordinator._async_message_received(SimpleNamespace(topic="ems-esp/boiler_data", payload=payload))
+    coordinator._async_message_received(SimpleNamespace(topic="ems-esp/boiler/rettemp", payload="35.0"))
+    coordinator.async_flush_ingestion()
+
+    assert coordinator.boiler_temperature == 45.5
+    assert coordinator.return_temperature == 35.0
+    assert coordinator.hot_water_setpoint == 52
+    assert coordinator.flame_active
+    assert "ubauptime" not in coordinator.data
+
+    await coordinator.async_will_remove_from_hass()
+
+
+async def test_out_of_range_values_are_ignored(hass: HomeAssistant) -> None:
+    coordinator = SatOpenThermMqttCoordinator(hass, "otgw", {CONF_MQTT_TOPIC: "OTGW"})
+
+    coordinator._async_message_received(SimpleNamespace(topic="OTGW/value/otgw/RelModLevel", payload="40.00"))
+    coordinator._async_message_received(SimpleNamespace(topic="OTGW/value/otgw/RelModLevel", payload="255.00"))
+    coordinator._async_message_received(SimpleNamespace(topic="OTGW/value/otgw/RelModLevel", payload="garbage"))
+    coordinator.async_flush_ingestion()
+
+    assert coordinator.data["RelModLevel"] == 40.0
+
+    await coordinator.async_will_remove_from_hass()
+
+
+async def test_flame_transitions_notify_right_away(hass: HomeAssistant) -> None:
+    coordinator = SatOpenThermMqttCoordinator(hass, "otgw", {CONF_MQTT_TOPIC: "OTGW"})
+
+    calls = []
+    coordinator.async_add_listener(lambda: calls.append(coordinator.flame_active))
+
+    coordinator._async_message_received(SimpleNamespace(topic="OTGW/value/otgw/Tboiler", payload="45.00"))
+    coordinator._async_message_received(SimpleNamespace(topic="OTGW/value/otgw/flame", payload="ON"))
+
+    assert calls == [True]
+
+    await coordinator.async_will_remove_from_hass()
@@ -0,0 +1,65 @@
+"""The tests for the overshoot protection calibration."""
+import asyncio
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.sat.const import HEATING_SYSTEM_RADIATORS
+from custom_components.sat.overshoot_protection import CalibrationPhase, OvershootProtection
+from custom_components.sat.simulator.engine import BoilerModel, SatSimulationCoordinator, SimulatedBoiler
+
+
+async def test_calibration_advances_on_coordinator_updates(hass: HomeAssistant) -> None:
+    boiler = SimulatedBoiler(BoilerModel())
+    coordinator = SatSimulationCoordinator(boiler, {})
+    coordinator.hass = hass
+
+    phases = []
+    overshoot_protection = OvershootProtection(coordinator, HEATING_SYSTEM_RADIATORS, phases.append)
+    calibration = hass.async_create_task(overshoot_protection.calculate())
+    await asyncio.sleep(0)
+
+    assert overshoot_protection.phase == CalibrationPhase.WAITING_FOR_FLAME
+    assert boiler.central_heating
+
+    # The flame is noticed as soon as the coordinator reports it, without waiting for the next heating cycle
+    boiler.flame = True
+    coordinator.async_update_listeners()
+    await asyncio.sleep(0)
+
+    assert phases == [CalibrationPhase.WAITING_FOR_FLAME, CalibrationPhase.STABILIZING]
+
+    calibration.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await calibration
+
+    assert not boiler.central_heating
+
+
+async def test_readings_between_keep_alives_are_not_new_samples(hass: HomeAssistant) -> None:
+    boiler = SimulatedBoiler(BoilerModel(initial_temperature=40.0))
+    coordinator = SatSimulationCoordinator(boiler, {})
+    coordinator.hass = hass
+
+    overshoot_protection = OvershootProtection(coordinator, HEATING_SYSTEM_RADIATORS)
+    overshoot_protection._sample_due = True
+    assert not overshoot_protection._is_temperature_stable()
+
+    # A slow rise, reported in steps of 0.05°C, is still rising by 0.5°C per keep-alive
+    for _ in range(5):
+        for _ in range(10):
+            boiler.flow_temperature = round(boiler.flow_temperature + 0.05, 2)
+            assert not overshoot_protection._is_temperature_stable()
+
+        overshoot_protection._sample_due = True
+        assert not overshoot_protection._is_temperature_stable()
+
+    # Once the temperature levels off, it is stable within a few keep-alives
+    for _ in range(10):
+        overshoot_protection._sample_due = True
+        if overshoot_protection._is_temperature_stable():
+            break
+    else:
+        pytest.fail("The temperature never stabilized")
+
+    assert overshoot_protection._stable_temperature == 42.5
@@ -0,0 +1,44 @@
+"""The tests for the rolling window statistics."""
+import random
+from statistics import median
+
+import pytest
+
+from custom_components.sat.rolling import RollingMedian, RollingSum
+
+
+def test_rolling_median_matches_full_sort() -> None:
+    generator = random.Random(7)
+    rolling = RollingMedian(window=100)
+    samples: list[tuple[float, float]] = []
+
+    now = 0.0
+    for _ in range(2000):
+        now += generator.choice([1, 5, 20])
+        value = float(generator.randint(0, 30))
+
+        rolling.prune(now)
+        rolling.add(now, value)
+        samples = [sample for sample in samples if sample[0] >= now - 100] + [(now, value)]
+
+        assert len(rolling) == len(samples)
+        assert rolling.median == median(value for _, value in samples)
+
+    rolling.prune(now + 1000)
+    assert len(rolling) == 0
+    assert rolling.median is None
+
+
+def test_rolling_sum() -> None:
+    rolling = RollingSum(window=60)
+    rolling.add(0, 10.5)
+    rolling.add(30, 20.0)
+    rolling.add(70)
+
+    rolling.prune(70)
+    assert len(rolling) == 2
+    assert rolling.sum == pytest.approx(21.0)
+
+    rolling.prune(200)
+    assert len(rolling) == 0
+    assert rolling.sum == 0.0
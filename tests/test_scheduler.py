@@ -0,0 +1,41 @@
+"""The tests for the control loop scheduler."""
+from homeassistant.core import HomeAssistant
+
+from custom_components.sat.clock import VirtualClock, use_clock
+from custom_components.sat.scheduler import ControlLoopScheduler, SchedulePriority
+
+
+async def test_scheduler_coalesces_requests(hass: HomeAssistant) -> None:
+    runs = []
+
+    async def action() -> None:
+        runs.append(True)
+
+    with use_clock(VirtualClock(start=1000)):
+        scheduler = ControlLoopScheduler(hass, action, minimum_interval=1, maximum_interval=60)
+
+        scheduler.async_plan([None, 1300, 1020])
+        assert scheduler.scheduled_at == 1020
+
+        scheduler.async_request(SchedulePriority.NORMAL)
+        assert scheduler.scheduled_at == 1010
+
+        scheduler.async_request(SchedulePriority.HIGH)
+        assert scheduler.scheduled_at == 1001
+
+        scheduler.async_plan([1500])
+        assert scheduler.scheduled_at == 1001
+
+        scheduler.async_request(SchedulePriority.IMMEDIATE)
+        await hass.async_block_till_done()
+
+        assert runs == [True]
+        assert scheduler.scheduled_at is None
+
+        scheduler.async_plan([])
+        assert scheduler.scheduled_at == 1060
+
+        scheduler.async_plan([900])
+        assert scheduler.scheduled_at == 1001
+
+        scheduler.async_cancel()
@@ -0,0 +1,173 @@
+"""The tests for the sensors derived from the climate."""
+
+import pytest
+from homeassistant.components.climate import HVACMode
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.components.template import DOMAIN as TEMPLATE_DOMAIN
+from homeassistant.const import STATE_UNAVAILABLE, EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.sat.climate import SatClimate
+from custom_components.sat.const import *
+from custom_components.sat.fake import SatFakeCoordinator
+from custom_components.sat.sensor import CLIMATE_SENSOR_INFO
+
+TEMPLATE_CONFIG = {
+    TEMPLATE_DOMAIN: [
+        {
+            SENSOR_DOMAIN: [
+                {
+                    "name": "test_inside_sensor",
+                    "state": "{{ 20.9 | float }}",
+                },
+                {
+                    "name": "test_outside_sensor",
+                    "state": "{{ 9.9 | float }}",
+                }
+            ]
+        },
+    ],
+}
+
+
+def _entity_id(hass: HomeAssistant, unique_id: str) -> str:
+    return er.async_get(hass).async_get_entity_id(SENSOR_DOMAIN, DOMAIN, unique_id)
+
+
+def _track_writes(hass: HomeAssistant, entity_id: str) -> list:
+    writes = []
+    hass.bus.async_listen(EVENT_STATE_CHANGED, lambda event: writes.append(event) if event.data["entity_id"] == entity_id else None)
+
+    return writes
+
+
+@pytest.mark.parametrize(*[
+    "domains, data, options, config",
+    [(
+            [(TEMPLATE_DOMAIN, 1)],
+            {
+                CONF_MODE: MODE_FAKE,
+                CONF_HEATING_SYSTEM: HEATING_SYSTEM_RADIATORS,
+                CONF_MINIMUM_SETPOINT: 57,
+                CONF_MAXIMUM_SETPOINT: 75,
+            },
+            {
+                CONF_HEATING_CURVE_COEFFICIENT: 1.8,
+            },
+            TEMPLATE_CONFIG,
+    )],
+])
+async def test_climate_sensors_are_registered(hass: HomeAssistant, entry: MockConfigEntry, climate: SatClimate) -> None:
+    for key in [*CLIMATE_SENSOR_INFO, "heating-curve", "error-value", "control-loop-latency"]:
+        assert _entity_id(hass, f"test-{key}") is not None
+
+
+@pytest.mark.parametrize(*[
+    "domains, data, options, config",
+    [(
+            [(TEMPLATE_DOMAIN, 1)],
+            {
+                CONF_MODE: MODE_SIMULATOR,
+                CONF_HEATING_SYSTEM: HEATING_SYSTEM_RADIATORS,
+                CONF_MINIMUM_SETPOINT: 57,
+                CONF_MAXIMUM_SETPOINT: 75,
+                CONF_SIMULATED_HEATING: 20,
+                CONF_SIMULATED_COOLING: 5,
+                CONF_SIMULATED_WARMING_UP: "00:00:15",
+            },
+            {
+                CONF_HEATING_CURVE_COEFFICIENT: 1.8,
+            },
+            TEMPLATE_CONFIG,
+    )],
+])
+async def test_climate_sensors_do_not_clash_with_the_simulator(hass: HomeAssistant, entry: MockConfigEntry, climate: SatClimate) -> None:
+    control_setpoint = _entity_id(hass, "test-control-setpoint")
+    boiler_setpoint = _entity_id(hass, "test-setpoint")
+
+    assert control_setpoint is not None
+    assert boiler_setpoint is not None
+    assert control_setpoint != boiler_setpoint
+
+
+@pytest.mark.parametrize(*[
+    "domains, data, options, config",
+    [(
+            [(TEMPLATE_DOMAIN, 1)],
+            {
+                CONF_MODE: MODE_FAKE,
+                CONF_HEATING_SYSTEM: HEATING_SYSTEM_RADIATORS,
+                CONF_MINIMUM_SETPOINT: 57,
+                CONF_MAXIMUM_SETPOINT: 75,
+            },
+            {
+                CONF_HEATING_CURVE_COEFFICIENT: 1.8,
+                CONF_FORCE_PULSE_WIDTH_MODULATION: True,
+            },
+            TEMPLATE_CONFIG,
+    )],
+])
+async def test_climate_sensors_are_available_once_the_loop_ran(hass: HomeAssistant, entry: MockConfigEntry, climate: SatClimate, coordinator: SatFakeCoordinator) -> None:
+    control_setpoint = _entity_id(hass, "test-control-setpoint")
+    assert hass.states.get(control_setpoint).state == STATE_UNAVAILABLE
+
+    await coordinator.async_set_boiler_temperature(57)
+    await climate.async_set_target_temperature(21.0)
+    await climate.async_set_hvac_mode(HVACMode.HEAT)
+    climate.schedule_control_heating_loop(force=True)
+    await hass.async_block_till_done()
+
+    assert float(hass.states.get(control_setpoint).state) == 57
+    assert float(hass.states.get(_entity_id(hass, "test-duty-cycle")).state) == 23.83
+
+
+@pytest.mark.parametrize(*[
+    "domains, data, options, config",
+    [(
+            [(TEMPLATE_DOMAIN, 1)],
+            {
+                CONF_MODE: MODE_FAKE,
+                CONF_HEATING_SYSTEM: HEATING_SYSTEM_RADIATORS,
+                CONF_MINIMUM_SETPOINT: 57,
+                CONF_MAXIMUM_SETPOINT: 75,
+            },
+            {
+                CONF_HEATING_CURVE_COEFFICIENT: 1.8,
+                CONF_FORCE_PULSE_WIDTH_MODULATION: True,
+            },
+            TEMPLATE_CONFIG,
+    )],
+])
+async def test_climate_sensors_are_written_when_their_value_changes(hass: HomeAssistant, entry: MockConfigEntry, climate: SatClimate, coordinator: SatFakeCoordinator) -> None:
+    await coordinator.async_set_boiler_temperature(57)
+    await climate.async_set_target_temperature(21.0)
+    await climate.async_set_hvac_mode(HVACMode.HEAT)
+    climate.schedule_control_heating_loop(force=True)
+    await hass.async_block_till_done()
+
+    error_value = _track_writes(hass, _entity_id(hass, "test-error-value"))
+    latency = _track_writes(hass, _entity_id(hass, "test-control-loop-latency"))
+
+    # A climate change that leaves the error and the timings alone
+    state = hass.states.get(climate.entity_id)
+    hass.states.async_set(climate.entity_id, state.state, {**state.attributes, "unrelated": True})
+    await hass.async_block_till_done()
+
+    assert error_value == []
+    assert latency == []
+
+    # More runs of the loop count towards the timings, the latency is not written on every iteration
+    for _ in range(5):
+        climate.schedule_control_heating_loop(force=True)
+        await hass.async_block_till_done()
+
+    assert error_value == []
+    assert latency == []
+
+    await climate.async_set_target_temperature(22.0)
+    await hass.async_block_till_done()
+
+    assert len(error_value) == 1
+    assert float(hass.states.get(error_value[0].data["entity_id"]).state) == climate.max_error.value
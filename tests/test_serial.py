@@ -0,0 +1,20 @@
+"""The tests for the serial coordinator."""
+from homeassistant.core import HomeAssistant
+from pyotgw.vars import BOILER, DATA_CH_WATER_TEMP, DATA_REL_MOD_LEVEL
+
+from custom_components.sat.serial import SatSerialCoordinator
+
+
+async def test_rejected_values_keep_their_last_valid_value(hass: HomeAssistant) -> None:
+    coordinator = SatSerialCoordinator(hass, "socket://otgw:25238", {})
+
+    await coordinator._publish_callback({BOILER: {DATA_CH_WATER_TEMP: 45.5, DATA_REL_MOD_LEVEL: 40.0}})
+    await hass.async_block_till_done()
+    coordinator.async_flush_ingestion()
+
+    await coordinator._publish_callback({BOILER: {DATA_CH_WATER_TEMP: 255.0, DATA_REL_MOD_LEVEL: 50.0}})
+    await hass.async_block_till_done()
+    coordinator.async_flush_ingestion()
+
+    assert coordinator.boiler_temperature == 45.5
+    assert coordinator.relative_modulation_value == 50.0
@@ -0,0 +1,30 @@
+"""The tests for the season simulator."""
+
+from custom_components.sat.const import *
+from custom_components.sat.simulator.engine import SeasonSimulator, daily_weather
+
+
+async def test_simulator_heats_the_house() -> None:
+    simulator = SeasonSimulator(
+        config_data={CONF_MINIMUM_SETPOINT: 40, CONF_OVERSHOOT_PROTECTION: True},
+        weather=daily_weather(mean=2.0, amplitude=3.0),
+        record_interval=600,
+    )
+
+    result = await simulator.async_run(24 * 3600)
+
+    assert len(result.steps) == 144
+    assert result.burner_starts > 0
+    assert result.heat_delivered_kwh > 0
+
+    last_step = result.steps[-1]
+    assert last_step.time == 24 * 3600
+    assert abs(last_step.room_temperature - last_step.target_temperature) < 0.5
+
+
+async def test_simulator_is_deterministic() -> None:
+    first = await SeasonSimulator(config_data={CONF_MINIMUM_SETPOINT: 40}).async_run(6 * 3600)
+    second = await SeasonSimulator(config_data={CONF_MINIMUM_SETPOINT: 40}).async_run(6 * 3600)
+
+    assert first.steps == second.steps
+    assert first.burner_starts == second.burner_starts
@@ -0,0 +1,51 @@
+"""The tests for the runtime snapshots."""
+from homeassistant.core import HomeAssistant
+
+from custom_components.sat.boiler import BoilerState
+from custom_components.sat.clock import VirtualClock, use_clock
+from custom_components.sat.const import BoilerStatus
+from custom_components.sat.flame import Flame
+from custom_components.sat.snapshot import MAX_SNAPSHOT_AGE, RuntimeStore
+
+
+def _boiler_state(flame_active: bool) -> BoilerState:
+    return BoilerState(
+        is_active=True,
+        is_inactive=False,
+        status=BoilerStatus.HEATING_UP,
+        flame_active=flame_active,
+        hot_water_active=False,
+        setpoint=50.0,
+        flow_temperature=45.0,
+        return_temperature=35.0,
+        relative_modulation_level=50.0,
+    )
+
+
+async def test_flame_history_survives_a_restart(hass: HomeAssistant) -> None:
+    clock = VirtualClock()
+
+    with use_clock(clock):
+        flame = Flame()
+        for _ in range(3):
+            flame.update(_boiler_state(True))
+            clock.advance(600)
+            flame.update(_boiler_state(False))
+            clock.advance(300)
+
+        store = RuntimeStore(hass, "entry")
+        await store.async_save(lambda: {"flame": flame.to_snapshot()})
+
+        clock.advance(60)
+        snapshot = await store.async_load()
+        assert snapshot is not None and snapshot.elapsed == 60
+
+        restored = Flame()
+        restored.restore_snapshot(snapshot, snapshot.get("flame"))
+
+        assert restored.sample_count_4h == 3
+        assert restored.median_on_duration_seconds_4h == 600
+        assert restored.cycles_last_hour == flame.cycles_last_hour
+
+        clock.advance(MAX_SNAPSHOT_AGE)
+        assert await store.async_load() is None
@@ -0,0 +1,43 @@
+"""The tests for the control loop timings."""
+from custom_components.sat.timing import Histogram, LoopTimings, STAGE_PWM
+
+
+def test_histogram_percentiles() -> None:
+    histogram = Histogram()
+    assert histogram.percentile(50) is None
+
+    for _ in range(95):
+        histogram.add(0.001)
+
+    for _ in range(5):
+        histogram.add(2.5)
+
+    summary = histogram.summary()
+    assert summary["count"] == 100
+    assert 1.0 <= summary["p50"] < 1.4
+    assert 1.0 <= summary["p95"] < 1.4
+    assert summary["max"] == 2500.0
+
+
+def test_loop_timings_only_report_stages_that_ran() -> None:
+    timings = LoopTimings()
+
+    with timings.stage(STAGE_PWM):
+        pass
+
+    summary = timings.summary()
+    assert set(summary) == {"loop", STAGE_PWM}
+    assert summary[STAGE_PWM]["count"] == 1
+    assert summary["loop"]["count"] == 0
+
+
+def test_loop_timings_percentiles_ignore_the_count() -> None:
+    timings = LoopTimings()
+    assert timings.percentiles(95)[0] is None
+
+    timings.loop.add(0.001)
+    percentiles = timings.percentiles(95)
+
+    timings.loop.add(0.001)
+    assert timings.percentiles(95) == percentiles
+    assert timings.summary()["loop"]["count"] == 2